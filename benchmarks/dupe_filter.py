@@ -0,0 +1,79 @@
+"""
+Time DupeFilter on a few thousand synthetic release names, the way a long running show searched on a busy tracker looks.
+
+    python -m benchmarks.dupe_filter --names 5000 --rounds 20
+
+Names mix seasons, episodes, season packs, resolutions, sources, HDR flavours, remux/uhd
+and repacks. Every round filters the full list against a TV episode, a TV season pack and
+a movie upload. The exclusion reasons of the last round are summarised per rule.
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from src.dupefilter import DupeFilter
+
+RESOLUTIONS = ['2160p', '1080p', '1080i', '720p', '576p', '480p']
+SOURCES = ['BluRay', 'UHD BluRay', 'WEB-DL', 'WEBRip', 'HDTV', 'BluRay REMUX', 'UHD BluRay REMUX', 'DVDRip']
+HDR = ['', '', '', 'HDR', 'HDR10+', 'DV', 'DV HDR', 'DoVi HDR10']
+CODECS = ['x264', 'x265', 'H.264', 'H.265', 'HEVC', 'AVC']
+AUDIO = ['DD5.1', 'DDP5.1', 'DTS-HD MA 5.1', 'TrueHD 7.1 Atmos', 'AAC2.0', 'FLAC 2.0']
+GROUPS = ['NTb', 'FLUX', 'CtrlHD', 'FraMeSToR', 'EbP', 'playWEB', 'SiGMA', 'NOGRP']
+
+
+def release_name(title):
+    season = random.randint(1, 12)
+    if random.random() < 0.3:
+        number = f"S{season:02}"
+    else:
+        number = f"S{season:02}E{random.randint(1, 24):02}"
+    if random.random() < 0.1:
+        title = f"{title} {random.randint(1990, 2024)}"
+    repack = " REPACK" if random.random() < 0.05 else ""
+    parts = [title, number + repack, random.choice(RESOLUTIONS), random.choice(SOURCES), random.choice(HDR), random.choice(AUDIO), random.choice(CODECS)]
+    return " ".join(part for part in parts if part) + f"-{random.choice(GROUPS)}"
+
+
+def scenarios():
+    base = {
+        'debug': False, 'is_disc': '', 'sd': 0, 'uuid': 'Show.S05E03.1080p.WEB-DL.DDP5.1.H.264-NTb.mkv',
+        'mediainfo': {'media': {'track': [{'FileSize': '2147483648'}]}},
+    }
+    episode = dict(base, category='TV', name='Show S05E03 1080p WEB-DL DDP5.1 H.264-NTb', tag='-NTb', type='WEBDL',
+                   resolution='1080p', source='Web', hdr='', season='S05', episode='E03')
+    season_pack = dict(base, category='TV', name='Show S05 2160p UHD BluRay REMUX DV HDR TrueHD 7.1 Atmos HEVC-FraMeSToR',
+                       tag='-FraMeSToR', type='REMUX', resolution='2160p', source='BluRay', hdr='DV HDR', season='S05', episode='',
+                       uuid='Show.S05.2160p.UHD.BluRay.REMUX.DV.HDR.TrueHD.7.1.Atmos.HEVC-FraMeSToR')
+    movie = dict(base, category='MOVIE', name='Show 2019 1080p BluRay DD5.1 x264-CtrlHD', tag='-CtrlHD', type='ENCODE',
+                 resolution='1080p', source='BluRay', hdr='', season='', episode='', uuid='Show.2019.REPACK.1080p.BluRay.DD5.1.x264-CtrlHD.mkv')
+    return {'episode': episode, 'season pack': season_pack, 'movie': movie}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--names', type=int, default=5000, help="Synthetic search results per tracker")
+    parser.add_argument('--rounds', type=int, default=20, help="Times every scenario is filtered")
+    args = parser.parse_args()
+
+    random.seed(0)
+    names = [release_name("Show") for _ in range(args.names)]
+    # AITHER and SHRI return dicts with sizes, the rest plain names
+    sized = [{'name': name, 'size': random.randint(10 ** 9, 10 ** 10)} for name in names]
+
+    print(f"{args.names} names, {args.rounds} rounds")
+    for label, meta in scenarios().items():
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            dupe_filter = DupeFilter(meta)
+            kept, excluded = dupe_filter.filter(names, "BLU")
+            dupe_filter.filter(sized, "AITHER")
+        elapsed = (time.perf_counter() - start) / (args.rounds * 2)
+        reasons = Counter(reason.split(':')[0] for _, reason in excluded)
+        print(f"{label:12} {elapsed * 1000:7.2f} ms per tracker  {elapsed / args.names * 1e6:5.2f} us per name  {len(kept):5} dupes")
+        for reason, count in reasons.most_common():
+            print(f"    {count:6}  {reason}")
+
+
+if __name__ == "__main__":
+    main()
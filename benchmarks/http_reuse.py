@@ -0,0 +1,106 @@
+"""
+Compare opening an httpx.AsyncClient per request against the shared per-host pools in src.httpclients.
+
+    python -m benchmarks.http_reuse --requests 200 --concurrency 10 --handshake-ms 30
+
+A local HTTP/1.1 server answers every request with a small JSON body and counts the
+connections it accepts. --handshake-ms delays each new connection to stand in for
+the DNS, TCP and TLS setup a real tracker costs.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from src.httpclients import HttpClients
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, handshake):
+        super().__init__(('127.0.0.1', 0), MockHandler)
+        self.handshake = handshake
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def per_request_clients(url, count, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(url)
+                response.json()
+
+    await asyncio.gather(*(one() for _ in range(count)))
+
+
+async def shared_clients(url, count, concurrency):
+    http = HttpClients(max_connections=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await http.get(url, timeout=5.0)
+            response.json()
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    await http.close_all()
+
+
+def run(server, url, count, concurrency, method):
+    server.connections = 0
+    start = time.perf_counter()
+    asyncio.run(method(url, count, concurrency))
+    return time.perf_counter() - start, server.connections
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200, help="Requests sent per mode")
+    parser.add_argument('--concurrency', type=int, default=10, help="Requests in flight at once")
+    parser.add_argument('--handshake-ms', type=float, default=30, help="Delay added to every new connection")
+    args = parser.parse_args()
+
+    server = MockServer(args.handshake_ms / 1000)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/torrents/filter"
+    try:
+        fresh_time, fresh_connections = run(server, url, args.requests, args.concurrency, per_request_clients)
+        shared_time, shared_connections = run(server, url, args.requests, args.concurrency, shared_clients)
+    finally:
+        server.shutdown()
+
+    print(f"{args.requests} requests, {args.concurrency} at once, {args.handshake_ms:g} ms per new connection")
+    print(f"client per request: {fresh_time:6.2f}s  {fresh_connections:4} connections")
+    print(f"shared pools:       {shared_time:6.2f}s  {shared_connections:4} connections")
+
+
+if __name__ == "__main__":
+    main()
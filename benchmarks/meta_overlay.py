@@ -0,0 +1,122 @@
+"""
+Compare deep copying meta per tracker against MetaOverlay on a synthetic multi-playlist BDMV meta.
+
+    python -m benchmarks.meta_overlay --trackers 20 --playlists 12
+
+Each tracker view reads and writes the keys a dupe check and a UNIT3D upload touch,
+including the MediaInfo tracks DupeFilter reads and the BDInfo and disc summaries of the upload.
+Time and peak allocations (tracemalloc) are reported for all trackers together.
+"""
+import argparse
+import copy
+import random
+import string
+import time
+import tracemalloc
+
+from src.metaoverlay import MetaOverlay
+
+
+def text(length):
+    return ''.join(random.choices(string.ascii_letters + string.digits + ' \n', k=length))
+
+
+def mediainfo_tracks(count):
+    tracks = [{'@type': 'General', 'Format': 'BDAV', 'FileSize': '66571993088', 'Duration': '7260.000', 'extra': {'Title': text(40)}}]
+    for i in range(count):
+        tracks.append({
+            '@type': 'Audio' if i else 'Video',
+            'StreamOrder': str(i),
+            'Format': 'DTS' if i else 'HEVC',
+            'Language': random.choice(['en', 'de', 'fr', 'ja']),
+            'BitRate': str(random.randint(10 ** 5, 10 ** 8)),
+            'extra': {f"field_{n}": text(24) for n in range(20)}
+        })
+    return {'media': {'@ref': '/discs/Movie/BDMV/STREAM/00800.m2ts', 'track': tracks}}
+
+
+def build_meta(playlists, tracks, mediainfo_tracks_count):
+    discs = []
+    for p in range(playlists):
+        discs.append({
+            'type': 'BDMV',
+            'name': f"DISC{p}",
+            'path': f"/discs/Movie/DISC{p}",
+            'summary': text(40000),
+            'bdinfo': {
+                'playlist': f"{800 + p:05}.MPLS",
+                'files': [{'file': f"{n:05}.M2TS", 'length': '1:01:01.000', 'size': random.randint(10 ** 9, 10 ** 10)} for n in range(60)],
+                'video': [{'codec': 'HEVC', 'bitrate': '60000 kbps', 'res': '2160p'}],
+                'audio': [{'codec': 'DTS-HD MA', 'language': 'English', 'bitrate': '4000 kbps'} for _ in range(tracks)],
+                'subtitles': ['English'] * 30
+            },
+            'playlists': {f"{n:05}.MPLS": [{'file': f"{m:05}.M2TS"} for m in range(40)] for n in range(20)}
+        })
+    return {
+        'name': 'Movie 2020 2160p UHD Blu-ray HEVC DTS-HD MA 5.1-GRP',
+        'tag': '-GRP', 'tmdb': 12345, 'imdb_id': '1234567', 'category': 'MOVIE', 'type': 'DISC',
+        'resolution': '2160p', 'is_disc': 'BDMV', 'debug': False, 'unattended': True,
+        'keywords': ['action', 'drama'], 'image_list': [{'img_url': f"https://img/{n}.png"} for n in range(6)],
+        'discs': discs,
+        'bdinfo': discs[0]['bdinfo'],
+        'mediainfo': mediainfo_tracks(mediainfo_tracks_count),
+        'overview': text(2000),
+        'description': text(20000),
+    }
+
+
+def tracker_work(local_meta):
+    # Roughly what a dupe check reads and changes
+    _ = (local_meta['name'], local_meta['tag'], local_meta['tmdb'], local_meta['resolution'], local_meta.get('skipping'))
+    _ = [keyword.lower() for keyword in local_meta['keywords']]
+    local_meta['skipping'] = None
+    local_meta['we_asked'] = False
+    if local_meta['name'].endswith('DUPE?'):
+        local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
+    # DupeFilter: size of the release from the first MediaInfo track
+    tracks = (local_meta.get('mediainfo') or {}).get('media', {}).get('track', [])
+    _ = tracks[0].get('FileSize', '') if tracks else None
+    # Audio languages of the MediaInfo tracks, as LT's edit_name reads them
+    _ = [track.get('Language') for track in local_meta['mediainfo']['media']['track'][2:]]
+    # UNIT3D upload: BDInfo of the main playlist and every disc summary for the description
+    if local_meta['bdinfo'] is not None:
+        _ = (local_meta['bdinfo']['playlist'], local_meta['bdinfo']['video'][0]['res'])
+    for disc in local_meta['discs']:
+        _ = (disc['type'], disc['name'], disc['summary'])
+
+
+def measure(meta, trackers, make_view):
+    tracemalloc.start()
+    start = time.perf_counter()
+    views = []
+    for _ in range(trackers):
+        view = make_view(meta)
+        tracker_work(view)
+        views.append(view)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--trackers', type=int, default=20, help="Number of trackers processed")
+    parser.add_argument('--playlists', type=int, default=12, help="Number of discs/playlists in meta")
+    parser.add_argument('--tracks', type=int, default=24, help="Audio tracks per playlist")
+    parser.add_argument('--mediainfo-tracks', type=int, default=200, help="Tracks in the MediaInfo JSON")
+    args = parser.parse_args()
+
+    random.seed(0)
+    meta = build_meta(args.playlists, args.tracks, args.mediainfo_tracks)
+
+    deepcopy_time, deepcopy_peak = measure(meta, args.trackers, copy.deepcopy)
+    overlay_time, overlay_peak = measure(meta, args.trackers, MetaOverlay)
+
+    print(f"Meta: {args.playlists} playlists, {args.tracks} audio tracks each, {args.mediainfo_tracks} MediaInfo tracks, {args.trackers} trackers")
+    print(f"deepcopy:    {deepcopy_time * 1000:9.1f} ms  {deepcopy_peak / 1024 ** 2:8.1f} MiB peak")
+    print(f"MetaOverlay: {overlay_time * 1000:9.1f} ms  {overlay_peak / 1024 ** 2:8.1f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
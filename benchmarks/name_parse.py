@@ -0,0 +1,100 @@
+"""
+Time the guessit/anitopy calls made while preparing one upload, uncached and through src.nameparse.
+
+    python -m benchmarks.name_parse --rounds 3
+
+For every release name the calls prep, getseasonep, region and tmdb make for one item are
+replayed (the same name with and without excludes, the parent folder, anitopy for anime).
+Uncached runs call guessit directly, cached runs go through the memoizing parser with a
+cleared cache per round, so the first call of every name still pays the full parse.
+"""
+import argparse
+import os
+import time
+
+import anitopy
+from guessit import guessit as raw_guessit
+
+from src import nameparse
+
+NAMES = [
+    "The.Last.of.Us.S01E03.Long.Long.Time.2160p.HMAX.WEB-DL.DDP5.1.Atmos.DV.HDR.H.265-FLUX.mkv",
+    "Severance.S02E01.Hello.Ms.Cobel.1080p.ATVP.WEB-DL.DDP5.1.Atmos.H.264-FLUX.mkv",
+    "Shogun.2024.S01E01.Anjin.1080p.DSNP.WEB-DL.DDP5.1.H.264-NTb.mkv",
+    "The.Bear.S03.1080p.DSNP.WEB-DL.DDP5.1.H.264-NTb",
+    "Blade.Runner.2049.2017.2160p.UHD.BluRay.REMUX.DV.HDR.HEVC.TrueHD.7.1.Atmos-FraMeSToR.mkv",
+    "Dune.Part.Two.2024.1080p.BluRay.DD5.1.x264-CtrlHD.mkv",
+    "Oppenheimer.2023.IMAX.2160p.UHD.BluRay.x265.10bit.HDR.DTS-HD.MA.5.1-SWTYBLZ.mkv",
+    "Spirited.Away.2001.JAPANESE.1080p.BluRay.x264.FLAC.2.0-EbP.mkv",
+    "The.Daily.Show.2024.03.14.Jon.Stewart.1080p.WEB.h264-EDITH.mkv",
+    "Doctor.Who.2005.S14E01.Space.Babies.REPACK.1080p.DSNP.WEB-DL.DDP5.1.H.264-NTb.mkv",
+    "[SubsPlease] Sousou no Frieren - 12 (1080p) [A1B2C3D4].mkv",
+    "[Erai-raws] Jujutsu Kaisen 2nd Season - 05 [1080p][Multiple Subtitle].mkv",
+    "Cowboy.Bebop.S01.1080p.BluRay.Remux.AVC.FLAC.2.0-EbP",
+    "Twin.Peaks.S03.Part.8.1080p.AMZN.WEB-DL.DD+5.1.H.264-NTb.mkv",
+    "Parasite.2019.KOREAN.2160p.UHD.BluRay.REMUX.HDR.HEVC.DTS-HD.MA.5.1-EPSiLON.mkv",
+    "The.Office.US.S05E14.Lecture.Circuit.Part.1.720p.NF.WEB-DL.DD5.1.x264-NTb.mkv",
+]
+
+EXCLUDES = {"excludes": ["country", "language"]}
+
+
+def item_calls(name, parse, parse_anime):
+    """The parses prep makes for one item, in roughly the order it makes them."""
+    path = os.path.join("/media", os.path.splitext(name)[0], name)
+    parse(name, EXCLUDES)
+    parse(name)
+    parse(name)  # resolution
+    parse(name)  # season and episode
+    parse(name)
+    parse(name)
+    parse(name, {"excludes": "part"})
+    parse(os.path.dirname(path))
+    parse(path)  # uhd
+    parse(path)  # source
+    parse(path)  # edition
+    parse(name)  # service
+    parse(name, EXCLUDES)
+    parse(path, EXCLUDES)  # tmdb_other_meta
+    if name.startswith("["):
+        parse_anime(name)
+        parse_anime(name)
+
+
+def run(parse, parse_anime, rounds, before_round=None):
+    timings = []
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        start = time.perf_counter()
+        for name in NAMES:
+            item_calls(name, parse, parse_anime)
+        timings.append(time.perf_counter() - start)
+    return min(timings) / len(NAMES)
+
+
+def clear():
+    nameparse._guess.cache_clear()
+    nameparse._anitopy.cache_clear()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=3, help="Passes over the release names, the fastest one is reported")
+    args = parser.parse_args()
+
+    # Build guessit's rebulk pipeline before timing anything
+    raw_guessit(NAMES[0])
+
+    uncached = run(raw_guessit, anitopy.parse, args.rounds)
+    cached = run(nameparse.guessit, nameparse.anitopy_parse, args.rounds, before_round=clear)
+    guess_info, anime_info = nameparse.cache_info()
+
+    print(f"{len(NAMES)} release names, best of {args.rounds} rounds")
+    print(f"uncached  {uncached * 1000:8.1f} ms per item")
+    print(f"memoized  {cached * 1000:8.1f} ms per item  ({uncached / cached:.1f}x)")
+    print(f"guessit cache {guess_info.hits} hits/{guess_info.misses} misses, anitopy {anime_info.hits} hits/{anime_info.misses} misses (last round)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Compare torf's hashing against the parallel piece hasher on a synthetic multi-file tree.
+
+    python -m benchmarks.piece_hashing --size 4 --files 12 --piece-size 16
+
+The tree is written once and read by both backends, so the numbers reflect hashing
+from the page cache unless the tree is larger than available memory.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import torf
+
+from src.piecehash import hash_pieces, default_workers
+
+
+def build_tree(root, total_gib, file_count):
+    os.makedirs(root, exist_ok=True)
+    total = int(total_gib * 1024 ** 3)
+    block = os.urandom(8 * 1024 * 1024)
+    for i in range(file_count):
+        # Uneven sizes so pieces straddle file boundaries
+        size = total // file_count + (i * 7919) % (1024 * 1024)
+        with open(os.path.join(root, f"part{i:03}.mkv"), 'wb') as f:
+            written = 0
+            while written < size:
+                chunk = block[:min(len(block), size - written)]
+                f.write(chunk)
+                written += len(chunk)
+
+
+def run_torf(root, piece_size):
+    torrent = torf.Torrent(path=root, private=True)
+    torrent.piece_size = piece_size
+    start = time.perf_counter()
+    torrent.generate()
+    return time.perf_counter() - start, torrent.metainfo['info']['pieces'], torrent
+
+
+def run_parallel(torrent, piece_size, workers):
+    filepaths = [str(p) for p in torrent.filepaths]
+    start = time.perf_counter()
+    pieces = hash_pieces(filepaths, piece_size, workers=workers)
+    return time.perf_counter() - start, pieces
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=float, default=2, help="Total size of the tree in GiB")
+    parser.add_argument('--files', type=int, default=8, help="Number of files in the tree")
+    parser.add_argument('--piece-size', type=int, default=16, help="Piece size in MiB")
+    parser.add_argument('--workers', type=int, default=default_workers(), help="Threads for the parallel hasher")
+    parser.add_argument('--keep', action='store_true', help="Do not delete the synthetic tree")
+    args = parser.parse_args()
+
+    piece_size = args.piece_size * 1024 * 1024
+    tmpdir = tempfile.mkdtemp(prefix="ua-hash-bench-")
+    root = os.path.join(tmpdir, "Synthetic.Release")
+    try:
+        build_tree(root, args.size, args.files)
+        total = sum(os.path.getsize(os.path.join(root, f)) for f in os.listdir(root))
+        gb = total / 1000 ** 3
+
+        torf_time, torf_pieces, torrent = run_torf(root, piece_size)
+        parallel_time, parallel_pieces = run_parallel(torrent, piece_size, args.workers)
+
+        print(f"Tree: {args.files} files, {gb:.2f} GB, piece size {args.piece_size} MiB")
+        print(f"torf:     {torf_time:7.2f}s  {gb / torf_time:6.2f} GB/s")
+        print(f"parallel: {parallel_time:7.2f}s  {gb / parallel_time:6.2f} GB/s  ({args.workers} threads)")
+        print(f"Pieces identical: {torf_pieces == parallel_pieces}")
+    finally:
+        if not args.keep:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
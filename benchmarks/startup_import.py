@@ -0,0 +1,72 @@
+"""
+Measure the cold import cost of the modules upload.py pulls in before any work starts.
+
+    python -m benchmarks.startup_import --budget-ms 400 --runs 5
+
+Each run imports the modules in a fresh interpreter with -X importtime and reports the
+median cumulative time, the slowest imports and which src.trackers modules were loaded.
+Exits with status 1 when the median is over --budget-ms, so it can guard cold start.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ['src.trackersetup', 'src.trackerhandle', 'src.trackerstatus']
+
+
+def importtime(modules):
+    code = "; ".join(f"import {module}" for module in modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+    timings = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # Column header
+            continue
+        name = fields[2][1:]
+        if not name.startswith(" "):
+            # Top level import, its cumulative time covers everything nested under it
+            total += cumulative_us
+        timings[name.strip()] = (self_us, cumulative_us)
+    return total, timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--modules', nargs='+', default=MODULES, help="Modules imported together")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list")
+    parser.add_argument('--budget-ms', type=float, default=None, help="Fail when the median total is above this")
+    args = parser.parse_args()
+
+    totals = []
+    for _ in range(args.runs):
+        total, timings = importtime(args.modules)
+        totals.append(total / 1000)
+    median = statistics.median(totals)
+
+    trackers = sorted(name.rsplit(".", 1)[1] for name in timings if name.startswith("src.trackers.") and name != "src.trackers.COMMON")
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+
+    print(f"Imported {', '.join(args.modules)} in {args.runs} fresh interpreters")
+    print(f"median {median:8.1f} ms  (min {min(totals):.1f}, max {max(totals):.1f})")
+    print(f"tracker modules loaded: {len(trackers)}" + (f" ({' '.join(trackers)})" if trackers else ""))
+    print("slowest imports (self time, last run):")
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {self_us / 1000:8.1f} ms  {cumulative_us / 1000:8.1f} ms cumulative  {name}")
+
+    if args.budget_ms is not None and median > args.budget_ms:
+        print(f"over budget: {median:.1f} ms > {args.budget_ms:g} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
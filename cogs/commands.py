@@ -2,6 +2,7 @@ from src.prep import Prep
 from src.args import Args
 from src.clients import Clients
 from src.search import Search
+from src.metastore import meta_store
 from src.trackers.BLU import BLU
 from src.trackers.BHD import BHD
 from src.trackers.AITHER import AITHER
@@ -15,7 +16,6 @@ from discord.ext import commands  # type: ignore
 import os
 from datetime import datetime
 import asyncio
-import json
 import multiprocessing
 from pathlib import Path
 from glob import glob
@@ -110,11 +110,8 @@ class Commands(commands.Cog):
             await ctx.send("Missing ID, please try again using the ID in the footer")
         parser = Args(config)
         base_dir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
-        try:
-            with open(f"{base_dir}/tmp/{uuid}/meta.json") as f:
-                meta = json.load(f)
-                f.close()
-        except FileNotFoundError:
+        meta = meta_store.load(os.path.join(base_dir, "tmp", uuid), sections=None)
+        if meta is None:
             await ctx.send("ID not found, please try again using the ID in the footer")
             return
         prep = Prep(screens=meta['screens'], img_host=meta['imghost'], config=config)
@@ -362,9 +359,7 @@ class Commands(commands.Cog):
         await message.add_reaction(config['DISCORD']['discord_emojis']['UPLOAD'])
 
         # Save meta to json
-        with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
-            json.dump(meta, f, indent=4)
-            f.close()
+        meta_store.save(meta)
 
         def check(reaction, user):
             if reaction.message.id == meta['embed_msg_id']:
@@ -55,6 +55,49 @@ config = {
         # defaults to os.cpu_count() // 2 if this value not set
         # "process_limit": "1",
 
+        # Screenshot capture limits, shared by all screenshot modes
+        # At most screenshot_capture_limit ffmpeg captures run at once, and at most
+        # screenshot_device_limit of them read from the same disk or network share
+        # capture limit defaults to process_limit, or os.cpu_count() // 2 if neither is set
+        # "screenshot_capture_limit": "4",
+        "screenshot_device_limit": "2",
+
+        # Capture up to 8 screenshots per ffmpeg process instead of one process per screenshot
+        # Only the process start up is shared, each frame is still opened, probed and decoded on its own
+        # Frames of a batch that fails are captured one at a time as usual
+        "screenshot_single_pass": False,
+
+        # Move screenshot times onto nearby keyframes (within 10 seconds), so each capture decodes one frame
+        # instead of up to several seconds of a long GOP. Only short windows around each time are probed
+        # with ffprobe, and the keyframes found are cached in the tmp folder for retakes and re-runs
+        "screenshot_keyframe_snap": False,
+
+        # Before capturing, check each frame with a small downscaled ffmpeg probe and pick another time
+        # for black or flat frames, instead of finding out after a full capture and optimization
+        # Costs one extra seek and decode per screenshot
+        "screenshot_precheck": False,
+
+        # Which tool to use when hashing the base .torrent
+        # torf = the torf python library (default)
+        # parallel = built-in hasher that reads in large sequential chunks and hashes pieces across threads
+        # mktorrent = the mktorrent binary (installed in the docker image), using torrent_hash_threads threads
+        # If the chosen tool fails, mktorrent falls back to parallel, and parallel falls back to torf
+        "torrent_creation": "torf",
+
+        # Number of threads used by the parallel hasher and mktorrent
+        # defaults to os.cpu_count() - 1 if this value not set
+        # "torrent_hash_threads": "4",
+
+        # Cache piece hashes in tmp/piece_cache.db, keyed by file path, size, modification time and inode.
+        # Re-creating a torrent for unchanged files with the same piece size (--rehash, cleaned tmp folder)
+        # then skips reading the content again.
+        "piece_cache": True,
+        # Maximum size of the cache in MiB, and maximum age of unused entries in days
+        "piece_cache_max_size": "50",
+        "piece_cache_max_age": "90",
+        # Rehash this many random pieces (plus the first and last) to verify a cache hit, 0 to trust the cache
+        "piece_cache_verify": "2",
+
         # Providing the option to change the size of the screenshot thumbnails where supported.
         # Default is 350, ie [img=350]
         "thumbnail_size": "350",
@@ -99,6 +142,51 @@ config = {
         # Play the bell sound effect when asking for confirmation
         "sfx_on_prompt": True,
 
+        # In unattended mode, upload to all trackers at the same time instead of one after the other
+        # At most concurrent_upload_limit uploads run at once. Each tracker's output is printed as one block when it finishes
+        "concurrent_uploads": False,
+        "concurrent_upload_limit": "4",
+
+        # Tracker and metadata API requests share one keep-alive connection pool per host
+        # http_timeout applies to searches and API calls, http_upload_timeout to torrent uploads (seconds)
+        # http_retries is how often a failed connection attempt is retried, a sent request is never repeated
+        # HTTP/2 is used automatically when the optional h2 package is installed
+        # "http_timeout": "30",
+        # "http_upload_timeout": "120",
+        # "http_retries": "2",
+        # "http_max_connections": "8",
+
+        # Dupe search results are kept in tmp/dupe_search_cache.json for this many seconds, so queue items
+        # and re-runs that search a tracker for the same release reuse them. Uploading to a tracker clears its entries. 0 disables
+        "dupe_cache_ttl": "600",
+
+        # Synchronous library calls (TMDb, Cinemagoer, torrent clients) run in a pool of blocking_workers threads
+        # With --debug, anything that blocks the event loop for longer than loop_stall_ms is printed with its stack
+        # "blocking_workers": "8",
+        # "loop_stall_ms": "200",
+
+        # TMDb, IMDb, TVmaze and AniList answers are kept in tmp/meta_cache.db so queue items of the same show
+        # don't ask the same questions again. --no-meta-cache skips it for one run, False turns it off
+        # Freshness per source in seconds (meta_cache_ttl_tmdb/imdb/tvmaze/anilist, 0 disables a source)
+        # The least recently used answers are dropped once the cache is over meta_cache_max_size MiB
+        "meta_cache": True,
+        # "meta_cache_ttl_tmdb": "86400",
+        # "meta_cache_ttl_imdb": "86400",
+        # "meta_cache_ttl_tvmaze": "86400",
+        # "meta_cache_ttl_anilist": "604800",
+        "meta_cache_max_size": "64",
+
+        # Requests to sites with a known limit (PTP, TMDb, TVmaze, AniList) are spread out by a token bucket per host
+        # and only wait when they would go over it. rate is requests per second, burst how many can be sent at once
+        # Add or override a host here, a rate of 0 removes its limit
+        # "rate_limits": {
+        #     "passthepopcorn.me": {"rate": "1", "burst": "1"},
+        # },
+
+        # Saved meta lives in tmp/<uuid>/meta/ as compact json, with orjson when it is installed
+        # Set to true to also write the indented tmp/<uuid>/meta.json older versions used (always written with --debug)
+        "meta_json_export": False,
+
         # How many trackers need to pass successfull checking to continue with the upload process
         # Default = 1. If 1 (or more) tracker/s pass banned_group, content and dupe checking, uploading will continue
         # If less than the number of trackers pass the checking, exit immediately.
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from data.config import config
+from src.console import console
+
+
+def _config_number(key, default):
+    try:
+        value = float(config['DEFAULT'].get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+_executor = None
+
+
+def executor():
+    """Bounded thread pool for the synchronous libraries (tmdbsimple, Cinemagoer, qbittorrent-api)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=int(_config_number('blocking_workers', 8)), thread_name_prefix='blocking')
+    return _executor
+
+
+def shutdown_blocking_pool(wait=True):
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait, cancel_futures=True)
+        _executor = None
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run a blocking call in the pool so the event loop keeps serving the other tasks."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor(), functools.partial(func, *args, **kwargs))
+
+
+class LoopStallDetector:
+    """
+    Debug helper that reports whatever keeps the event loop busy for longer than threshold_ms.
+
+    A callback on the loop records a heartbeat every interval, a watchdog thread checks it
+    and prints the stack of the loop thread once per stall, which points straight at the
+    synchronous call that should be awaited or moved to run_blocking().
+    """
+    def __init__(self, threshold_ms=None):
+        self.threshold = (threshold_ms or _config_number('loop_stall_ms', 200)) / 1000
+        self.interval = min(self.threshold / 4, 0.05)
+        self.loop = None
+        self.loop_thread = None
+        self.last_beat = 0.0
+        self.stalls = 0
+        self._handle = None
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def _beat(self):
+        self.last_beat = time.monotonic()
+        self._handle = self.loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        reported = None
+        while not self._stop.wait(self.interval):
+            beat = self.last_beat
+            stalled = time.monotonic() - beat
+            if stalled < self.threshold or reported == beat:
+                continue
+            reported = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self.loop_thread)
+            # The frames of the loop machinery itself are the same for every stall
+            frames = [entry for entry in traceback.extract_stack(frame) if ASYNCIO_DIR not in entry.filename] if frame else []
+            stack = "".join(traceback.format_list(frames)) or "stack unavailable\n"
+            console.print(f"[bold yellow]Event loop blocked for over {stalled * 1000:.0f} ms in:[/bold yellow]")
+            console.print(stack.rstrip(), markup=False, highlight=False, soft_wrap=True)
+
+    def start(self):
+        if self._watchdog is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._beat()
+        self._watchdog = threading.Thread(target=self._watch, name='loop-stall-detector', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        if self._watchdog is None:
+            return
+        self._stop.set()
+        self._watchdog.join()
+        self._watchdog = None
+        if self._handle:
+            self._handle.cancel()
+            self._handle = None
+        if self.stalls:
+            console.print(f"[yellow]Event loop stalled {self.stalls} times over {self.threshold * 1000:.0f} ms")
+
+
+stall_detector = LoopStallDetector()
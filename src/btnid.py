@@ -1,6 +1,6 @@
-import httpx
 import uuid
 from src.bbcode import BBCODE
+from src.httpclients import http_clients
 
 
 async def generate_guid():
@@ -23,9 +23,8 @@ async def get_btn_torrents(btn_api, btn_id, meta):
 
     headers = {"Content-Type": "application/json"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(post_query_url, headers=headers, json=post_data)
-        data = response.json()
+    response = await http_clients.post(post_query_url, headers=headers, json=post_data)
+    data = response.json()
 
     if "result" in data and "torrents" in data["result"]:
         torrents = data["result"]["torrents"]
@@ -52,9 +51,8 @@ async def get_bhd_torrents(bhd_api, bhd_rss_key, info_hash, meta, only_id=False)
 
     headers = {"Content-Type": "application/json"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(post_query_url, headers=headers, json=post_data)
-        data = response.json()
+    response = await http_clients.post(post_query_url, headers=headers, json=post_data)
+    data = response.json()
 
     if "results" in data and data["results"]:
         first_result = data["results"][0]
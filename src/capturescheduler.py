@@ -0,0 +1,74 @@
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from data.config import config
+
+
+class CaptureStats:
+    """Queue wait and ffmpeg run time of every capture in one screenshot run."""
+    def __init__(self):
+        self.waits = []
+        self.runs = []
+
+    def add(self, wait, run):
+        self.waits.append(wait)
+        self.runs.append(run)
+
+    def summary(self):
+        if not self.runs:
+            return "No captures were run"
+        return (
+            f"{len(self.runs)} capture(s): queue wait {sum(self.waits):.2f}s total, {max(self.waits):.2f}s max, "
+            f"decode {sum(self.runs):.2f}s total, {sum(self.runs) / len(self.runs):.2f}s average"
+        )
+
+
+class CaptureScheduler:
+    """
+    Limits how many ffmpeg captures run at once, both overall and per device,
+    so many seeks into the same disk or NAS share don't thrash it while
+    captures reading from different devices can still run side by side.
+    """
+    def __init__(self, max_captures, per_device):
+        self.max_captures = max_captures
+        self.per_device = per_device
+        # Created on first use so they belong to the running loop
+        self._global = None
+        self._devices = {}
+
+    def device_key(self, path):
+        try:
+            return os.stat(path).st_dev
+        except OSError:
+            return os.path.dirname(os.path.abspath(path))
+
+    @asynccontextmanager
+    async def slot(self, path, stats=None):
+        if self._global is None:
+            self._global = asyncio.Semaphore(self.max_captures)
+        device = self._devices.setdefault(self.device_key(path), asyncio.Semaphore(self.per_device))
+        queued = time.perf_counter()
+        # Always device first, then global, so waiters can't deadlock
+        async with device:
+            async with self._global:
+                started = time.perf_counter()
+                try:
+                    yield
+                finally:
+                    if stats is not None:
+                        stats.add(started - queued, time.perf_counter() - started)
+
+
+def _config_limit(key, default):
+    try:
+        value = int(config['DEFAULT'].get(key, 0))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+capture_scheduler = CaptureScheduler(
+    max_captures=_config_limit('screenshot_capture_limit', _config_limit('process_limit', max(1, (os.cpu_count() or 2) // 2))),
+    per_device=_config_limit('screenshot_device_limit', 2)
+)
@@ -14,6 +14,7 @@ import ssl
 import shutil
 import time
 from src.console import console
+from src.blocking import run_blocking
 import re
 
 
@@ -51,15 +52,15 @@ class Clients():
         if meta['debug']:
             console.print(f"[bold green]Adding to {torrent_client}")
         if torrent_client.lower() == "rtorrent":
-            self.rtorrent(meta['path'], torrent_path, torrent, meta, local_path, remote_path, client)
+            await run_blocking(self.rtorrent, meta['path'], torrent_path, torrent, meta, local_path, remote_path, client)
         elif torrent_client == "qbit":
             await self.qbittorrent(meta['path'], torrent, local_path, remote_path, client, meta['is_disc'], meta['filelist'], meta)
         elif torrent_client.lower() == "deluge":
             if meta['type'] == "DISC":
                 path = os.path.dirname(meta['path'])  # noqa F841
-            self.deluge(meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
+            await run_blocking(self.deluge, meta['path'], torrent_path, torrent, local_path, remote_path, client, meta)
         elif torrent_client.lower() == "transmission":
-            self.transmission(meta['path'], torrent, local_path, remote_path, client, meta)
+            await run_blocking(self.transmission, meta['path'], torrent, local_path, remote_path, client, meta)
         elif torrent_client.lower() == "watch":
             shutil.copy(torrent_path, client['watch_folder'])
         return
@@ -103,10 +104,10 @@ class Clients():
                             password=client['qbit_pass'],
                             VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
                         )
-                        qbt_client.auth_log_in()
+                        await run_blocking(qbt_client.auth_log_in)
 
                         # Retrieve the .torrent file
-                        torrent_file_content = qbt_client.torrents_export(torrent_hash=hash_value)
+                        torrent_file_content = await run_blocking(qbt_client.torrents_export, torrent_hash=hash_value)
                         if not torrent_file_content:
                             console.print(f"[bold red]qBittorrent returned an empty response for hash {hash_value}")
                             continue  # Skip to the next hash
@@ -309,7 +310,7 @@ class Clients():
                 password=client['qbit_pass'],
                 VERIFY_WEBUI_CERTIFICATE=client.get('VERIFY_WEBUI_CERTIFICATE', True)
             )
-            qbt_client.auth_log_in()
+            await run_blocking(qbt_client.auth_log_in)
 
         except qbittorrentapi.LoginFailed:
             console.print("[bold red]INCORRECT QBIT LOGIN CREDENTIALS")
@@ -325,14 +326,14 @@ class Clients():
         best_match = None
         matching_torrents = []
 
-        for torrent in qbt_client.torrents.info():
+        for torrent in await run_blocking(qbt_client.torrents_info):
             try:
                 torrent_path = torrent.name
             except AttributeError:
                 continue  # Ignore torrents with missing attributes
 
             if meta['is_disc'] in ("", None) and len(meta['filelist']) == 1:
-                if torrent_path != meta['uuid'] or len(torrent.files) != len(meta['filelist']):
+                if torrent_path != meta['uuid'] or len(await run_blocking(qbt_client.torrents_files, torrent_hash=torrent.hash)) != len(meta['filelist']):
                     continue
 
             elif meta['uuid'] != torrent_path:
@@ -376,7 +377,7 @@ class Clients():
                         console.print(f"[cyan]Exporting .torrent file for {torrent_hash}")
 
                     try:
-                        torrent_file_content = qbt_client.torrents_export(torrent_hash=torrent_hash)
+                        torrent_file_content = await run_blocking(qbt_client.torrents_export, torrent_hash=torrent_hash)
                         torrent_file_path = os.path.join(extracted_torrent_dir, f"{torrent_hash}.torrent")
 
                         with open(torrent_file_path, "wb") as f:
@@ -497,7 +498,7 @@ class Clients():
             console.print("[bold yellow]Adding and rechecking torrent")
 
         try:
-            qbt_client.auth_log_in()
+            await run_blocking(qbt_client.auth_log_in)
         except qbittorrentapi.LoginFailed:
             console.print("[bold red]INCORRECT QBIT LOGIN CREDENTIALS")
             return
@@ -520,7 +521,8 @@ class Clients():
 
         # Add the torrent
         try:
-            qbt_client.torrents_add(
+            await run_blocking(
+                qbt_client.torrents_add,
                 torrent_files=torrent.dump(),
                 save_path=path,
                 use_auto_torrent_management=auto_management,
@@ -535,7 +537,7 @@ class Clients():
         # Wait for torrent to be added
         timeout = 30
         for _ in range(timeout):
-            if len(qbt_client.torrents_info(torrent_hashes=torrent.infohash)) > 0:
+            if len(await run_blocking(qbt_client.torrents_info, torrent_hashes=torrent.infohash)) > 0:
                 break
             await asyncio.sleep(1)
         else:
@@ -543,11 +545,11 @@ class Clients():
             return
 
         # Resume and tag torrent
-        qbt_client.torrents_resume(torrent.infohash)
+        await run_blocking(qbt_client.torrents_resume, torrent.infohash)
         if client.get('qbit_tag'):
-            qbt_client.torrents_add_tags(tags=client['qbit_tag'], torrent_hashes=torrent.infohash)
+            await run_blocking(qbt_client.torrents_add_tags, tags=client['qbit_tag'], torrent_hashes=torrent.infohash)
         if meta.get('qbit_tag'):
-            qbt_client.torrents_add_tags(tags=meta['qbit_tag'], torrent_hashes=torrent.infohash)
+            await run_blocking(qbt_client.torrents_add_tags, tags=meta['qbit_tag'], torrent_hashes=torrent.infohash)
 
         if meta['debug']:
             console.print(f"Added to: {path}")
@@ -688,13 +690,13 @@ class Clients():
         )
 
         try:
-            qbt_client.auth_log_in()
+            await run_blocking(qbt_client.auth_log_in)
         except qbittorrentapi.LoginFailed as e:
             console.print(f"[bold red]Login failed while trying to get info hash: {e}")
             exit(1)
 
         info_hash_v1 = meta.get('infohash')
-        torrents = qbt_client.torrents_info()
+        torrents = await run_blocking(qbt_client.torrents_info)
         found = False
 
         for torrent in torrents:
@@ -1,2 +1,31 @@
+from contextvars import ContextVar
 from rich.console import Console
-console = Console()
+
+# Set to a list inside a task to hold back its output, see BufferedConsole.print_buffer
+output_buffer = ContextVar('output_buffer', default=None)
+
+
+class BufferedConsole(Console):
+    """Console that collects print/log calls into output_buffer when it is set for the current task."""
+    def print(self, *args, **kwargs):
+        buffer = output_buffer.get()
+        if buffer is None:
+            return super().print(*args, **kwargs)
+        buffer.append((super().print, args, kwargs))
+
+    def log(self, *args, **kwargs):
+        buffer = output_buffer.get()
+        if buffer is None:
+            return super().log(*args, **kwargs)
+        buffer.append((super().log, args, kwargs))
+
+    def print_buffer(self, buffer, title=None):
+        """Print everything collected in buffer as one block."""
+        if title:
+            self.rule(title)
+        for method, args, kwargs in buffer:
+            method(*args, **kwargs)
+        buffer.clear()
+
+
+console = BufferedConsole()
@@ -0,0 +1,113 @@
+import copy
+import json
+import os
+import tempfile
+import time
+
+from data.config import config
+from src.console import console
+
+
+def _ttl():
+    try:
+        ttl = float(config['DEFAULT'].get('dupe_cache_ttl', 600))
+    except (TypeError, ValueError):
+        return 600.0
+    return max(ttl, 0.0)
+
+
+class DupeCache:
+    """
+    Dupe search results kept on disk in tmp/dupe_search_cache.json, keyed by tracker and
+    the search parameters (tmdb, category, type, resolution and the season/edition name).
+    Queue items and re-runs that search the same thing within ttl seconds reuse the
+    result instead of asking the tracker again. A ttl of 0 turns the cache off.
+    """
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.path = None
+        self.entries = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tracker, params):
+        params = {name: value for name, value in params.items() if name not in ('api_token', 'api_key')}
+        return json.dumps([tracker, params], sort_keys=True, default=str)
+
+    def _load(self, meta):
+        path = os.path.join(meta['base_dir'], 'tmp', 'dupe_search_cache.json')
+        if self.entries is not None and path == self.path:
+            return
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        if isinstance(entries, dict):
+            self.entries = entries
+            self._prune()
+
+    def _prune(self):
+        now = time.time()
+        for key in [key for key, entry in self.entries.items() if now - entry.get('time', 0) >= self.ttl]:
+            del self.entries[key]
+
+    def _save(self):
+        self._prune()
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.dupe_search_cache', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            console.print(f"[yellow]Could not write the dupe search cache: {e}")
+
+    def get(self, meta, tracker, params):
+        """Cached dupes for this search, or None when there is no fresh entry."""
+        if self.ttl <= 0:
+            return None
+        self._load(meta)
+        entry = self.entries.get(self.key(tracker, params))
+        age = time.time() - entry['time'] if entry else None
+        if entry is None or age >= self.ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if meta['debug']:
+            console.print(f"[cyan]{tracker} dupe search answered from cache ({age:.0f}s old)")
+        # filter_dupes may change the entries it is given
+        return copy.deepcopy(entry['dupes'])
+
+    def set(self, meta, tracker, params, dupes):
+        if self.ttl <= 0:
+            return
+        self._load(meta)
+        self.entries[self.key(tracker, params)] = {
+            'time': time.time(),
+            'tracker': tracker,
+            'tmdb': meta.get('tmdb'),
+            'dupes': dupes,
+        }
+        self._save()
+
+    def invalidate(self, meta, tracker):
+        """Forget the searches for this release on tracker, called after uploading to it."""
+        if self.ttl <= 0:
+            return
+        self._load(meta)
+        stale = [key for key, entry in self.entries.items() if entry.get('tracker') == tracker and entry.get('tmdb') == meta.get('tmdb')]
+        if stale:
+            for key in stale:
+                del self.entries[key]
+            self._save()
+
+    def stats(self):
+        return f"Dupe search cache: {self.hits} hits, {self.misses} misses"
+
+
+dupe_cache = DupeCache(_ttl())
@@ -0,0 +1,162 @@
+import re
+
+from src.console import console
+
+DISC_FILE_EXTENSION = re.compile(r'\.\w{2,4}$')
+EPISODE_TAG = re.compile(r'[eE]\d{2}', re.IGNORECASE)
+HD_RESOLUTIONS = ('1080', '720', '2160')
+
+
+def normalize_name(name):
+    return name.lower().replace("-", " -").replace(".", " ")
+
+
+def hdr_terms(name):
+    """Reduce a release name or meta['hdr'] to the HDR/DV terms that matter for dupes."""
+    if not name:
+        return set()
+    name = name.upper()
+    terms = set()
+    if "DV" in name or "DOVI" in name:
+        terms.add("DV")
+    if "HDR" in name:
+        terms.add("HDR")
+    return terms
+
+
+class DupeFilter:
+    """
+    Dupe exclusion rules for one upload.
+
+    Everything about the upload (resolution, HDR, season/episode patterns, tag and the
+    remux/uhd/repack flags) is worked out once from meta, each candidate name is then
+    lowered and normalized once and run through plain synchronous checks.
+    Everything is a dupe until a rule excludes it.
+    """
+    def __init__(self, meta):
+        self.debug = meta.get('debug', False)
+        name = meta.get('name', '').lower()
+        self.is_disc = bool(meta.get('is_disc', False))
+        self.is_bdmv = meta.get('is_disc') == "BDMV"
+        self.is_dvd = meta.get('is_disc') == "DVD"
+        self.is_sd = meta.get('sd')
+        self.category = meta.get('category')
+        self.resolution = meta.get('resolution')
+        self.source = meta.get('source') or ""
+        self.framestor = "framestor" in meta.get('tag', '').lower()
+        self.tag = meta.get('tag', '').lower().replace("-", " ")
+        self.repack = "repack" in meta.get('uuid', '').lower()
+        self.remux = "remux" in name
+        self.uhd = "uhd" in name
+        self.skip_resolution_check = self.is_dvd or "DVD" in self.source or meta.get('type') == "DVDRIP"
+        self.hdr = self.simplify_hdr(hdr_terms(meta.get('hdr')))
+
+        self.file_size = None
+        if not self.is_bdmv:
+            tracks = (meta.get('mediainfo') or {}).get('media', {}).get('track', [])
+            if tracks:
+                self.file_size = tracks[0].get('FileSize', '')
+
+        self.season = None
+        self.episodes = []
+        if self.category == "TV":
+            season_match = re.search(r'[sS](\d+)', str(meta.get('season')))
+            if season_match:
+                self.season = re.compile(rf"[sS]{int(season_match.group(1)):02}", re.IGNORECASE)
+            if meta.get('episode'):
+                self.episodes = [re.compile(rf"[eE]{int(ep):02}", re.IGNORECASE) for ep in re.findall(r'\d+', str(meta.get('episode')))]
+
+    def simplify_hdr(self, terms):
+        simplified = set()
+        if "HDR" in terms:
+            simplified.add("HDR")
+        if "DV" in terms:
+            simplified.add("DV")
+            if self.framestor:
+                simplified.add("HDR")
+        return simplified
+
+    def hdr_matches(self, file_hdr):
+        file_hdr = self.simplify_hdr(file_hdr)
+        target_hdr = self.hdr
+        if file_hdr == {"DV", "HDR"}:
+            # A DV release with an HDR fallback layer counts as HDR
+            file_hdr = {"HDR"}
+            if target_hdr == {"DV", "HDR"}:
+                target_hdr = {"HDR"}
+        return file_hdr == target_hdr
+
+    def season_episode_matches(self, normalized):
+        is_season_pack = not EPISODE_TAG.search(normalized)
+        if not self.episodes:
+            # Only season packs match a season pack
+            return bool(self.season and self.season.search(normalized)) and is_season_pack
+        if self.season:
+            if is_season_pack:
+                return bool(self.season.search(normalized))
+            return bool(self.season.search(normalized)) and any(ep.search(normalized) for ep in self.episodes)
+        return False
+
+    def exclusion_reason(self, name, size, tracker_name, single_result):
+        """Why name is not a dupe, or None if it is one."""
+        lower = name.lower()
+        normalized = normalize_name(name)
+
+        if self.is_disc and lower.endswith(".m2ts"):
+            return None
+        if self.is_disc and DISC_FILE_EXTENSION.search(name):
+            return "file extension mismatch (is_disc=True)"
+
+        if self.is_sd == 1 and tracker_name == "BHD" and any(res in name for res in HD_RESOLUTIONS):
+            return None
+
+        if not self.skip_resolution_check:
+            if self.resolution and self.resolution not in name:
+                return f"resolution '{self.resolution}' mismatch"
+            file_hdr = hdr_terms(normalized)
+            if not self.hdr_matches(file_hdr):
+                return f"HDR mismatch: Expected {self.hdr}, got {self.simplify_hdr(file_hdr)}"
+
+            if single_result and not self.is_bdmv and tracker_name == "AITHER":
+                if self.file_size and "1080" in (self.resolution or "") and size is not None:
+                    target_size = int(self.file_size)
+                    size_difference = abs(size - target_size) / target_size
+                    if self.debug:
+                        console.print(f"Actual size: {size}, Target size: {target_size}, Size difference: {size_difference:.4f}")
+                    if size_difference < 0.20:
+                        return None
+
+        if self.is_dvd and tracker_name != "BHD" and any(res in name for res in HD_RESOLUTIONS):
+            return None
+
+        if self.repack and "repack" not in normalized and self.tag and self.tag in normalized:
+            return "missing 'repack'"
+        if self.remux != ("remux" in lower):
+            return "remux mismatch"
+        if self.uhd != ("uhd" in lower):
+            return "uhd mismatch"
+
+        if self.category == "TV" and not self.season_episode_matches(normalized):
+            return "season/episode mismatch"
+
+        return None
+
+    def filter(self, dupes, tracker_name):
+        """
+        Split the search results of tracker_name into dupes and exclusions.
+        Returns ([{'name', 'size'}, ...], [(name, reason), ...]).
+        """
+        entries = [
+            {'name': d, 'size': None} if isinstance(d, str) else {'name': d['name'], 'size': d['size']}
+            for d in dupes
+        ]
+        single_result = len(entries) == 1
+        kept = []
+        excluded = []
+        for entry in entries:
+            reason = self.exclusion_reason(entry['name'], entry['size'], tracker_name, single_result)
+            if reason is None:
+                kept.append(entry)
+            else:
+                excluded.append((entry['name'], reason))
+        return kept, excluded
@@ -36,3 +36,7 @@ class WeirdSystem(Exception):
 
 class ManualDateException(Exception):
     pass
+
+
+class HashingCancelled(Exception):
+    pass
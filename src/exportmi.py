@@ -1,7 +1,12 @@
 from src.console import console
 from pymediainfo import MediaInfo
+import hashlib
 import json
 import os
+import time
+
+# Reports kept in tmp/mediainfo_cache, the least recently used ones are removed past this
+MEDIAINFO_CACHE_ENTRIES = 500
 
 
 async def mi_resolution(res, guess, width, scan, height, actual_height):
@@ -51,7 +56,7 @@ async def mi_resolution(res, guess, width, scan, height, actual_height):
     return resolution
 
 
-async def exportInfo(video, isdir, folder_id, base_dir, export_text):
+async def exportInfo(video, isdir, folder_id, base_dir, export_text, debug=False):
     def filter_mediainfo(data):
         filtered = {
             "creatingLibrary": data.get("creatingLibrary"),
@@ -222,11 +227,14 @@ async def exportInfo(video, isdir, folder_id, base_dir, export_text):
                 })
         return filtered
 
-    if not os.path.exists(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt") and export_text:
+    export_text = export_text and not os.path.exists(f"{base_dir}/tmp/{folder_id}/MEDIAINFO.txt")
+    if export_text:
         console.print("[bold yellow]Exporting MediaInfo...")
         if not isdir:
             os.chdir(os.path.dirname(video))
-        media_info = MediaInfo.parse(video, output="STRING", full=False)
+    media_info, media_info_json = get_mediainfo(video, base_dir, export_text, debug)
+
+    if export_text:
         filtered_media_info = "\n".join(
             line for line in media_info.splitlines()
             if not line.strip().startswith("ReportBy") and not line.strip().startswith("Report created by ")
@@ -237,14 +245,115 @@ async def exportInfo(video, isdir, folder_id, base_dir, export_text):
             export_cleanpath.write(filtered_media_info.replace(video, os.path.basename(video)))
         console.print("[bold green]MediaInfo Exported.")
 
-    if not os.path.exists(f"{base_dir}/tmp/{folder_id}/MediaInfo.json.txt"):
-        media_info_json = MediaInfo.parse(video, output="JSON")
-        media_info_dict = json.loads(media_info_json)
-        filtered_info = filter_mediainfo(media_info_dict)
-        with open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", 'w', encoding='utf-8') as export:
-            json.dump(filtered_info, export, indent=4)
-
-    with open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", 'r', encoding='utf-8') as f:
-        mi = json.load(f)
+    mi = filter_mediainfo(json.loads(media_info_json))
+    with open(f"{base_dir}/tmp/{folder_id}/MediaInfo.json", 'w', encoding='utf-8') as export:
+        json.dump(mi, export, indent=4)
 
     return mi
+
+
+def get_mediainfo(video, base_dir, export_text, debug=False):
+    """
+    Return (text report, JSON report) for video, text being None unless export_text.
+    Reports are cached under tmp/mediainfo_cache keyed by path, size and mtime,
+    so re-runs on unchanged files never reopen them. --cleanup empties the cache with the rest of tmp.
+    """
+    cache_file = None
+    try:
+        stat = os.stat(video)
+        key = hashlib.sha1(json.dumps([os.path.abspath(video), stat.st_size, stat.st_mtime_ns]).encode('utf-8')).hexdigest()
+        cache_file = os.path.join(base_dir, "tmp", "mediainfo_cache", f"{key}.json")
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get('json') and (cached.get('text') or not export_text):
+            if debug:
+                console.print(f"Using cached MediaInfo for {os.path.basename(video)}")
+            os.utime(cache_file)
+            return cached.get('text'), cached['json']
+    except (OSError, ValueError):
+        pass
+
+    media_info, media_info_json = parse_mediainfo(video, export_text, debug)
+
+    if cache_file:
+        try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump({'text': media_info, 'json': media_info_json}, f)
+            prune_mediainfo_cache(os.path.dirname(cache_file))
+        except OSError as e:
+            console.print(f"[yellow]Unable to cache MediaInfo: {e}")
+    return media_info, media_info_json
+
+
+def prune_mediainfo_cache(cache_dir, keep=MEDIAINFO_CACHE_ENTRIES):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        try:
+            entries.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            continue
+    if len(entries) <= keep:
+        return
+    entries.sort()
+    for _, path in entries[:len(entries) - keep]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def parse_mediainfo(video, export_text, debug=False):
+    """
+    Open video once with libmediainfo and render the text report and the JSON from the same handle.
+    That relies on pymediainfo internals, if any part of it fails the file is parsed once per report
+    with MediaInfo.parse instead.
+    """
+    try:
+        return _parse_mediainfo_once(video, export_text, debug)
+    except Exception as e:
+        if debug:
+            console.print(f"[yellow]Single pass MediaInfo failed, parsing twice: {e}")
+    start_time = time.time()
+    media_info = None
+    if export_text:
+        media_info = MediaInfo.parse(video, output="STRING", full=False)
+        if debug:
+            console.print(f"MediaInfo text parsed in {time.time() - start_time:.2f} seconds")
+            start_time = time.time()
+    media_info_json = MediaInfo.parse(video, output="JSON")
+    if debug:
+        console.print(f"MediaInfo JSON parsed in {time.time() - start_time:.2f} seconds")
+    return media_info, media_info_json
+
+
+def _parse_mediainfo_once(video, export_text, debug=False):
+    start_time = time.time()
+    lib, handle, _, lib_version = MediaInfo._get_library()
+    try:
+        # Same options MediaInfo.parse sets, the output options are read again at each Inform
+        if lib_version >= (18, 3):
+            lib.MediaInfo_Option(handle, "Cover_Data", "")
+        lib.MediaInfo_Option(handle, "CharSet", "UTF-8")
+        lib.MediaInfo_Option(handle, "ParseSpeed", "0.5")
+        lib.MediaInfo_Option(handle, "LegacyStreamDisplay", "")
+        if lib.MediaInfo_Open(handle, MediaInfo._normalize_filename(video)) == 0:
+            if not os.path.exists(video):
+                raise FileNotFoundError(video)
+            raise RuntimeError(f"An error occured while opening {video} with libmediainfo")
+        if debug:
+            console.print(f"MediaInfo parsed {os.path.basename(video)} in {time.time() - start_time:.2f} seconds")
+        media_info = None
+        if export_text:
+            lib.MediaInfo_Option(handle, "Inform", "STRING")
+            lib.MediaInfo_Option(handle, "Complete", "")
+            media_info = lib.MediaInfo_Inform(handle, 0)
+        lib.MediaInfo_Option(handle, "Inform", "JSON")
+        lib.MediaInfo_Option(handle, "Complete", "1")
+        media_info_json = lib.MediaInfo_Inform(handle, 0)
+    finally:
+        lib.MediaInfo_Close(handle)
+        lib.MediaInfo_Delete(handle)
+    if debug:
+        console.print(f"MediaInfo reports rendered in {time.time() - start_time:.2f} seconds")
+    return media_info, media_info_json
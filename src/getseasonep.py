@@ -1,6 +1,5 @@
 from src.console import console
-from guessit import guessit
-import anitopy
+from src.nameparse import anitopy_parse, guessit
 from pathlib import Path
 import asyncio
 import requests
@@ -81,7 +80,7 @@ async def get_season_episode(video, meta):
 
         else:
             # If Anime
-            parsed = anitopy.parse(Path(video).name)
+            parsed = anitopy_parse(Path(video).name)
             romaji, mal_id, eng_title, seasonYear, anilist_episodes, meta['demographic'] = await get_romaji(parsed['anime_title'], meta.get('mal_id', 0))
             if mal_id:
                 meta['mal_id'] = mal_id
@@ -0,0 +1,109 @@
+import asyncio
+import importlib.util
+from urllib.parse import urlsplit
+
+import httpx
+from data.config import config
+from src.console import console
+from src.ratelimit import rate_limiter
+
+
+def _config_number(key, default):
+    try:
+        value = float(config['DEFAULT'].get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value >= 0 else default
+
+
+def form_data(data):
+    """Encode form or query values the way requests does: None is left out, everything else is sent as str()."""
+    if not isinstance(data, dict):
+        return data
+    encoded = {}
+    for key, value in data.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            encoded[key] = [item if isinstance(item, bytes) else str(item) for item in value if item is not None]
+        else:
+            encoded[key] = value if isinstance(value, bytes) else str(value)
+    return encoded
+
+
+class HttpClients:
+    """
+    Process wide httpx.AsyncClient registry with one keep-alive pool per host,
+    so repeated API calls to a tracker reuse the same connection instead of
+    redoing DNS, TCP and TLS every time.
+
+    Clients belong to the event loop that created them, close_all() closes
+    the ones of the running loop.
+    """
+    def __init__(self, timeout=30.0, connect_timeout=10.0, upload_timeout=120.0, retries=2, max_connections=8):
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        # Trackers can take a while to process an upload before they answer
+        self.upload_timeout = httpx.Timeout(upload_timeout, connect=connect_timeout)
+        self.retries = int(retries)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections, keepalive_expiry=60)
+        # HTTP/2 needs the optional h2 package
+        self.http2 = importlib.util.find_spec('h2') is not None
+        self._clients = {}
+        self.requests = 0
+        self.created = 0
+
+    def client(self, url):
+        """Shared client for the host of url, created on first use."""
+        parts = urlsplit(str(url))
+        key = (asyncio.get_running_loop(), parts.scheme, parts.netloc.lower())
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                # Only retries failed connection attempts, a sent request is never repeated
+                transport=httpx.AsyncHTTPTransport(retries=self.retries, limits=self.limits, http2=self.http2),
+                event_hooks={'request': [self._count, self._pace]}
+            )
+            self._clients[key] = client
+            self.created += 1
+        return client
+
+    async def _count(self, request):
+        self.requests += 1
+
+    async def _pace(self, request):
+        # Sites with a known request limit get their requests spread out here
+        await rate_limiter.wait(request.url.host)
+
+    async def request(self, method, url, data=None, **kwargs):
+        """requests style call on the shared client for url's host."""
+        if 'params' in kwargs:
+            # httpx would send key= for None and lowercase true/false for booleans
+            kwargs['params'] = form_data(kwargs['params'])
+        return await self.client(url).request(method, url, data=form_data(data), **kwargs)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def close_all(self, debug=False):
+        loop = asyncio.get_running_loop()
+        for key in [key for key in self._clients if key[0] is loop]:
+            client = self._clients.pop(key)
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+        if debug:
+            console.print(f"HTTP pools: {self.created} opened, {self.requests} requests sent")
+
+
+http_clients = HttpClients(
+    timeout=_config_number('http_timeout', 30.0),
+    upload_timeout=_config_number('http_upload_timeout', 120.0),
+    retries=_config_number('http_retries', 2),
+    max_connections=int(_config_number('http_max_connections', 8)) or 8,
+)
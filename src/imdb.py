@@ -1,11 +1,21 @@
-import requests
 from difflib import SequenceMatcher
 from imdb import Cinemagoer
 from src.console import console
+from src.blocking import run_blocking
+from src.httpclients import http_clients
+from src.metacache import meta_cache
 from datetime import datetime
 import json
 
 
+async def imdb_graphql(url, query, headers):
+    """JSON answer of the IMDb GraphQL API, None when the request failed."""
+    response = await http_clients.post(url, json=query, headers=headers)
+    if response.status_code != 200:
+        return None
+    return response.json()
+
+
 async def get_imdb_aka_api(imdb_id, meta):
     if imdb_id == 0:
         return "", None
@@ -38,8 +48,7 @@ async def get_imdb_aka_api(imdb_id, meta):
         "Content-Type": "application/json",
     }
 
-    response = requests.post(url, headers=headers, json=query)
-    data = response.json()
+    data = await meta_cache.fetch('imdb', 'aka', {'id': imdb_id}, lambda: imdb_graphql(url, query, headers)) or {}
 
     # Check if `data` and `title` exist
     title_data = data.get("data", {}).get("title")
@@ -189,10 +198,8 @@ async def get_imdb_info_api(imdbID, meta):
         url = "https://api.graphql.imdb.com/"
         headers = {"Content-Type": "application/json"}
 
-        response = requests.post(url, json=query, headers=headers)
-        data = response.json()
-
-        if response.status_code != 200:
+        data = await meta_cache.fetch('imdb', 'info', {'id': imdbIDtt}, lambda: imdb_graphql(url, query, headers))
+        if data is None:
             return imdb_info
 
         title_data = await safe_get(data, ["data", "title"], {})
@@ -287,11 +294,15 @@ async def get_imdb_info_api(imdbID, meta):
 
 
 async def search_imdb(filename, search_year):
-    imdbID = '0'
     ia = Cinemagoer()
-    search = ia.search_movie(filename)
+    # Cinemagoer results don't serialize, only the plain title/year/id fields are cached
+    search = await meta_cache.fetch(
+        'imdb', 'search', {'title': filename},
+        lambda: run_blocking(lambda: [{'title': movie.get('title', ''), 'year': movie.get('year'), 'id': movie.movieID} for movie in ia.search_movie(filename)])
+    )
+    imdbID = '0'
     for movie in search:
-        if filename in movie.get('title', ''):
-            if movie.get('year') == search_year:
-                imdbID = str(movie.movieID).replace('tt', '')
+        if filename in movie['title']:
+            if movie['year'] == search_year:
+                imdbID = str(movie['id']).replace('tt', '')
     return imdbID
@@ -0,0 +1,107 @@
+import os
+import json
+import bisect
+import asyncio
+import hashlib
+from src.console import console
+
+
+class KeyframeIndex:
+    """
+    Keyframe timestamps of the first video stream of a file, used to move screenshot times
+    onto keyframes so each input seek decodes a single frame instead of most of a GOP.
+
+    Only short windows around the requested times are probed (ffprobe -read_intervals),
+    so the whole file is never read. Probed windows are cached in tmp/<uuid> and reused
+    by retakes and later runs on the same unchanged file.
+    """
+    def __init__(self, path, cache_dir, window=10, debug=False):
+        self.path = path
+        self.window = window
+        self.debug = debug
+        stat = os.stat(path)
+        self.identity = [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+        name = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        self.cache_file = os.path.join(cache_dir, f"keyframes-{name}.json")
+        self.start_time = None
+        self.keyframes = []
+        self.covered = []
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('identity') == self.identity:
+                self.start_time = cached['start_time']
+                self.keyframes = cached['keyframes']
+                self.covered = cached['covered']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def is_covered(self, ss_time):
+        return any(start <= ss_time <= end for start, end in self.covered)
+
+    async def snap(self, ss_times):
+        """Return ss_times moved to the nearest keyframe within the probe window, unchanged if none is known."""
+        missing = [ss_time for ss_time in ss_times if not self.is_covered(ss_time)]
+        if missing:
+            try:
+                await self._probe(missing)
+                self._save()
+            except Exception as e:
+                console.print(f"[yellow]Keyframe probe failed, using the chosen times as is: {e}")
+                return list(ss_times)
+
+        snapped = []
+        for ss_time in ss_times:
+            position = bisect.bisect_left(self.keyframes, ss_time)
+            nearby = self.keyframes[max(0, position - 1):position + 1]
+            nearby = [keyframe for keyframe in nearby if abs(keyframe - ss_time) <= self.window]
+            if nearby:
+                # Just after the keyframe, so rounding can't make the seek land on the previous one
+                snapped.append(min(nearby, key=lambda keyframe: abs(keyframe - ss_time)) + 0.001)
+            else:
+                snapped.append(ss_time)
+        if self.debug:
+            console.print(f"Snapped screenshot times to keyframes: {[round(t, 3) for t in snapped]}")
+        return snapped
+
+    async def _ffprobe(self, *args):
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe", "-v", "error", *args, self.path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(stderr.decode(errors='replace').strip())
+        return json.loads(stdout)
+
+    async def _probe(self, ss_times):
+        if self.start_time is None:
+            data = await self._ffprobe("-show_entries", "format=start_time", "-of", "json")
+            self.start_time = float(data.get('format', {}).get('start_time') or 0)
+
+        # Interval positions are absolute, screenshot times are relative to the start of the file
+        windows = sorted((max(0.0, ss_time - self.window), ss_time + self.window) for ss_time in ss_times)
+        intervals = ",".join(f"{start + self.start_time:.3f}%{end + self.start_time:.3f}" for start, end in windows)
+        data = await self._ffprobe(
+            "-select_streams", "v:0", "-read_intervals", intervals,
+            "-show_entries", "packet=pts_time,flags", "-of", "json"
+        )
+        found = set(self.keyframes)
+        for packet in data.get('packets', []):
+            if 'K' in packet.get('flags', '') and packet.get('pts_time') not in (None, 'N/A'):
+                found.add(round(float(packet['pts_time']) - self.start_time, 6))
+        self.keyframes = sorted(found)
+        self.covered.extend([start, end] for start, end in windows)
+
+    def _save(self):
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'identity': self.identity,
+                    'start_time': self.start_time,
+                    'keyframes': self.keyframes,
+                    'covered': self.covered
+                }, f)
+        except OSError as e:
+            console.print(f"[yellow]Unable to cache keyframe index: {e}")
@@ -1,12 +1,13 @@
 import shutil
-import requests
 import os
-import json
 import urllib.parse
 import re
 from torf import Torrent
 import glob
 from src.console import console
+from src.blocking import run_blocking
+from src.httpclients import http_clients
+from src.metastore import meta_store
 from src.uploadscreens import upload_screens
 from data.config import config
 
@@ -36,20 +37,17 @@ async def package(meta):
         poster_img = f"{meta['base_dir']}/tmp/{meta['uuid']}/POSTER.png"
         if meta.get('poster', None) not in ['', None] and not os.path.exists(poster_img):
             if meta.get('rehosted_poster', None) is None:
-                r = requests.get(meta['poster'], stream=True)
+                r = await http_clients.get(meta['poster'])
                 if r.status_code == 200:
                     console.print("[bold yellow]Rehosting Poster")
-                    r.raw.decode_content = True
                     with open(poster_img, 'wb') as f:
-                        shutil.copyfileobj(r.raw, f)
+                        f.write(r.content)
                     if not meta.get('skip_imghost_upload', False):
                         poster, dummy = await upload_screens(meta, 1, 1, 0, 1, [poster_img], {})
                         poster = poster[0]
                         generic.write(f"TMDB Poster: {poster.get('raw_url', poster.get('img_url'))}\n")
                         meta['rehosted_poster'] = poster.get('raw_url', poster.get('img_url'))
-                    with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as metafile:
-                        json.dump(meta, metafile, indent=4)
-                        metafile.close()
+                    meta_store.save(meta)
                 else:
                     console.print("[bold yellow]Poster could not be retrieved")
         elif os.path.exists(poster_img) and meta.get('rehosted_poster') is not None:
@@ -75,15 +73,16 @@ async def package(meta):
             Torrent.copy(base_torrent).write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{manual_name}.torrent", overwrite=True)
             # shutil.copy(os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent"), os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['name'].replace(' ', '.')}.torrent").replace(' ', '.'))
         filebrowser = config['TRACKERS'].get('MANUAL', {}).get('filebrowser', None)
-        shutil.make_archive(archive, 'tar', f"{meta['base_dir']}/tmp/{meta['uuid']}")
+        await run_blocking(shutil.make_archive, archive, 'tar', f"{meta['base_dir']}/tmp/{meta['uuid']}")
         if filebrowser is not None:
             url = '/'.join(s.strip('/') for s in (filebrowser, f"/tmp/{meta['uuid']}"))
             url = urllib.parse.quote(url, safe="https://")
         else:
-            files = {
-                "files[]": (f"{meta['title']}.tar", open(f"{archive}.tar", 'rb'))
-            }
-            response = requests.post("https://uguu.se/upload.php", files=files).json()
+            with open(f"{archive}.tar", 'rb') as tar:
+                files = {
+                    "files[]": (f"{meta['title']}.tar", tar)
+                }
+                response = (await http_clients.post("https://uguu.se/upload.php", files=files, timeout=http_clients.upload_timeout)).json()
             if meta['debug']:
                 console.print(f"[cyan]{response}")
             url = response['files'][0]['url']
@@ -0,0 +1,145 @@
+import json
+import os
+import sqlite3
+import time
+from collections import Counter
+
+from data.config import config
+from src.console import console
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Seconds a response stays fresh, override with meta_cache_ttl_<source> in the config
+DEFAULT_TTLS = {
+    'tmdb': 86400,
+    'imdb': 86400,
+    'tvmaze': 86400,
+    'anilist': 7 * 86400,
+}
+
+
+def _config_number(key, default):
+    try:
+        value = float(config['DEFAULT'].get(key, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value >= 0 else default
+
+
+class MetaCache:
+    """
+    TMDb, IMDb, TVmaze and AniList responses kept in tmp/meta_cache.db, keyed by
+    source, endpoint and request parameters. Queue items of the same show ask the same
+    questions over and over, those are answered locally until the entry is older than
+    the TTL of its source. The file is kept under max_bytes by dropping the least
+    recently used entries.
+    """
+    def __init__(self, path, ttls, max_bytes, enabled=True):
+        self.path = path
+        self.ttls = ttls
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._db = None
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @staticmethod
+    def key(source, endpoint, params):
+        return json.dumps([source, endpoint, params], sort_keys=True, default=str)
+
+    def _connect(self):
+        if self._db is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._db = sqlite3.connect(self.path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, source TEXT, value TEXT, size INTEGER, created REAL, last_used REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        return self._db
+
+    def disable(self):
+        self.enabled = False
+
+    def get(self, source, endpoint, params):
+        """Cached response, or None when there is no fresh entry."""
+        if not self.enabled or self.ttls.get(source, 0) <= 0:
+            return None
+        key = self.key(source, endpoint, params)
+        try:
+            db = self._connect()
+            row = db.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or now - row[1] >= self.ttls[source]:
+                self.misses[source] += 1
+                return None
+            with db:
+                db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Metadata cache unavailable: {e}")
+            self.enabled = False
+            return None
+        self.hits[source] += 1
+        return json.loads(row[0])
+
+    def set(self, source, endpoint, params, value):
+        if not self.enabled or self.ttls.get(source, 0) <= 0:
+            return
+        data = json.dumps(value)
+        now = time.time()
+        try:
+            db = self._connect()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, source, value, size, created, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.key(source, endpoint, params), source, data, len(data), now, now)
+                )
+                self._evict(db)
+        except sqlite3.Error as e:
+            console.print(f"[yellow]Could not write the metadata cache: {e}")
+
+    def _evict(self, db):
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        dropped = []
+        for key, size in db.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            if total <= self.max_bytes:
+                break
+            dropped.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", dropped)
+
+    async def fetch(self, source, endpoint, params, request):
+        """
+        Cached response for endpoint and params, otherwise await request() and cache what it
+        returns. Failed requests (None or an exception) are never cached.
+        """
+        value = self.get(source, endpoint, params)
+        if value is not None:
+            return value
+        value = await request()
+        if value is not None:
+            self.set(source, endpoint, params, value)
+        return value
+
+    def stats(self):
+        if not self.enabled:
+            return "Metadata cache: disabled"
+        sources = sorted(set(self.hits) | set(self.misses))
+        if not sources:
+            return "Metadata cache: not used"
+        return "Metadata cache: " + ", ".join(f"{source} {self.hits[source]} hits/{self.misses[source]} misses" for source in sources)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+meta_cache = MetaCache(
+    os.path.join(BASE_DIR, 'tmp', 'meta_cache.db'),
+    {source: _config_number(f'meta_cache_ttl_{source}', ttl) for source, ttl in DEFAULT_TTLS.items()},
+    int(_config_number('meta_cache_max_size', 64) * 1024 * 1024),
+    enabled=str(config['DEFAULT'].get('meta_cache', True)).lower() == "true",
+)
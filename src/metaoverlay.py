@@ -0,0 +1,243 @@
+import copy
+
+
+class MetaOverlay(dict):
+    """
+    Per-tracker view of the shared meta that avoids deep copying all of it.
+
+    Reads fall through to the shared meta: lists and dicts come back as copy-on-write
+    views of the shared objects, so reading the MediaInfo JSON or the BDInfo of every
+    playlist costs a shallow view of the level being read, never a copy of the whole value.
+    Writes go to this view's own layer. Assigning or deleting a top level key only changes
+    this view, and the first in place edit of a nested value (meta['image_list'].append(...),
+    meta['discs'][0]['summary'] = ...) deep copies that top level key into the layer before
+    applying the edit, so the shared meta is never changed.
+
+    Values reached without a lookup on the view (the view's own items() and values(),
+    json.dump of the view) are the shared objects and must be treated as read only.
+    """
+    def __init__(self, shared):
+        super().__init__(shared)
+        self.copied = set()
+
+    def _read(self, key):
+        value = super().__getitem__(key)
+        if key in self.copied:
+            return value
+        return _wrap(value, self, (key,))
+
+    def _materialize(self, path):
+        """The object at path in this view's own layer, deep copying its top level key on first use."""
+        key = path[0]
+        if key not in self.copied:
+            super().__setitem__(key, copy.deepcopy(super().__getitem__(key)))
+            self.copied.add(key)
+        value = super().__getitem__(key)
+        for step in path[1:]:
+            value = value[step]
+        return value
+
+    def _owned(self, path):
+        """The object at path if its top level key has been copied into the layer, otherwise None."""
+        if path[0] not in self.copied:
+            return None
+        return self._materialize(path)
+
+    def __getitem__(self, key):
+        return self._read(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.copied.add(key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self._read(key)
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self._read(key)
+        self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        if key in self:
+            # The caller owns what it pops, so it gets a copy rather than a view
+            value = self._materialize((key,))
+            super().pop(key)
+            self.copied.discard(key)
+            return value
+        return super().pop(key, *default)
+
+    def __deepcopy__(self, memo):
+        return MetaOverlay(copy.deepcopy(dict(self), memo))
+
+    def __copy__(self):
+        return MetaOverlay(self)
+
+
+def _wrap(value, overlay, path):
+    if type(value) is dict:
+        return _CowDict(value, overlay, path)
+    if type(value) is list:
+        return _CowList(value, overlay, path)
+    return value
+
+
+class _CowView:
+    """Shared parts of the copy-on-write views, value is the shared object at path."""
+    __slots__ = ()
+
+    def _child(self, key, value):
+        owned = self._overlay._owned(self._path)
+        if owned is not None:
+            return owned[key]
+        return _wrap(value, self._overlay, self._path + (key,))
+
+    def _write(self, method, *args):
+        # Edit the layer's copy, then mirror it here so this view stays consistent
+        result = getattr(self._overlay._materialize(self._path), method)(*args)
+        getattr(super(), method)(*args)
+        return result
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(self._plain(), memo)
+
+    def __reduce_ex__(self, protocol):
+        # Pickled as the plain shared value
+        return type(self._plain()), (self._plain(),)
+
+
+class _CowDict(_CowView, dict):
+    __slots__ = ('_overlay', '_path')
+
+    def __init__(self, shared, overlay, path):
+        dict.__init__(self, shared)
+        self._overlay = overlay
+        self._path = path
+
+    def _plain(self):
+        return dict(dict.items(self))
+
+    def __getitem__(self, key):
+        return self._child(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def copy(self):
+        return dict(self.items())
+
+    __copy__ = copy
+
+    def __setitem__(self, key, value):
+        self._write('__setitem__', key, value)
+
+    def __delitem__(self, key):
+        self._write('__delitem__', key)
+
+    def __ior__(self, other):
+        self._write('update', other)
+        return self
+
+    def update(self, *args, **kwargs):
+        self._overlay._materialize(self._path).update(*args, **kwargs)
+        dict.update(self, *args, **kwargs)
+
+    def pop(self, key, *default):
+        if key not in self:
+            return dict.pop(self, key, *default)
+        value = self[key]
+        self._write('pop', key)
+        return value
+
+    def popitem(self):
+        key = next(reversed(self))
+        return key, self.pop(key)
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def clear(self):
+        self._write('clear')
+
+
+class _CowList(_CowView, list):
+    __slots__ = ('_overlay', '_path')
+
+    def __init__(self, shared, overlay, path):
+        list.__init__(self, shared)
+        self._overlay = overlay
+        self._path = path
+
+    def _plain(self):
+        return list(list.__iter__(self))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        return self._child(index, list.__getitem__(self, index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def copy(self):
+        return list(self)
+
+    __copy__ = copy
+
+    def __setitem__(self, index, value):
+        self._write('__setitem__', index, value)
+
+    def __delitem__(self, index):
+        self._write('__delitem__', index)
+
+    def __iadd__(self, other):
+        self._write('extend', list(other))
+        return self
+
+    def __imul__(self, count):
+        self._write('__imul__', count)
+        return self
+
+    def append(self, value):
+        self._write('append', value)
+
+    def extend(self, values):
+        self._write('extend', list(values))
+
+    def insert(self, index, value):
+        self._write('insert', index, value)
+
+    def pop(self, index=-1):
+        value = self[index]
+        self._write('pop', index)
+        return value
+
+    def remove(self, value):
+        self._write('remove', value)
+
+    def clear(self):
+        self._write('clear')
+
+    def sort(self, *, key=None, reverse=False):
+        self._overlay._materialize(self._path).sort(key=key, reverse=reverse)
+        list.sort(self, key=key, reverse=reverse)
+
+    def reverse(self):
+        self._write('reverse')
@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from data.config import config
+from src.console import console
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Large values that get a file of their own, so saving meta after a small change
+# doesn't rewrite them. Everything else lives in core.json.
+SECTIONS = ('mediainfo', 'bdinfo', 'discs', 'imdb_info', 'ptgen')
+# gather_prep exports mediainfo again on every run. discs and bdinfo are needed, get_bdinfo
+# only skips the BDInfo scan and playlist prompt when the saved discs are there
+STARTUP_SECTIONS = ('bdinfo', 'discs', 'imdb_info', 'ptgen')
+
+
+def _dumps(value):
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers over 64 bit and the like, the json module copes with them
+            pass
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(data):
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class MetaStore:
+    """
+    Checkpoints of meta in tmp/<uuid>/meta/: core.json for the small values and one
+    compact file per entry of SECTIONS. Every write goes to a temp file that replaces the
+    old one, and a section is only rewritten when it changed since it was last saved by
+    this process. tmp/<uuid>/meta.json, the indented dump older versions wrote, is still
+    read when there is no checkpoint, and written next to it with --debug or meta_json_export.
+    """
+    def __init__(self, export=False):
+        self.export = export
+        self._saved = {}
+
+    @staticmethod
+    def directory(meta_dir):
+        return os.path.join(meta_dir, 'meta')
+
+    def exists(self, meta_dir):
+        return os.path.exists(os.path.join(self.directory(meta_dir), 'core.json')) or os.path.exists(os.path.join(meta_dir, 'meta.json'))
+
+    def save(self, meta):
+        meta_dir = os.path.join(meta['base_dir'], 'tmp', meta['uuid'])
+        directory = self.directory(meta_dir)
+        os.makedirs(directory, exist_ok=True)
+        parts = {'core': {key: value for key, value in meta.items() if key not in SECTIONS}}
+        for section in SECTIONS:
+            if section in meta:
+                parts[section] = meta[section]
+            elif os.path.exists(os.path.join(directory, f"{section}.json")):
+                os.remove(os.path.join(directory, f"{section}.json"))
+        for name, value in parts.items():
+            path = os.path.join(directory, f"{name}.json")
+            data = _dumps(value)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if self._saved.get(path) == digest and os.path.exists(path):
+                continue
+            _write_atomic(path, data)
+            self._saved[path] = digest
+        if self.export or meta.get('debug'):
+            _write_atomic(os.path.join(meta_dir, 'meta.json'), json.dumps(meta, indent=4).encode('utf-8'))
+
+    def load(self, meta_dir, sections=STARTUP_SECTIONS):
+        """
+        Saved meta of tmp/<uuid>, with only the given SECTIONS (all of them for None),
+        or None when nothing was saved yet.
+        """
+        directory = self.directory(meta_dir)
+        core_path = os.path.join(directory, 'core.json')
+        if not os.path.exists(core_path):
+            legacy_path = os.path.join(meta_dir, 'meta.json')
+            if not os.path.exists(legacy_path):
+                return None
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        with open(core_path, 'rb') as f:
+            meta = _loads(f.read())
+        for section in SECTIONS if sections is None else sections:
+            path = os.path.join(directory, f"{section}.json")
+            try:
+                with open(path, 'rb') as f:
+                    meta[section] = _loads(f.read())
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                console.print(f"[yellow]Ignoring unreadable saved {section}: {e}")
+        return meta
+
+    def delete(self, meta_dir):
+        directory = self.directory(meta_dir)
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        legacy_path = os.path.join(meta_dir, 'meta.json')
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+        self._saved = {path: digest for path, digest in self._saved.items() if not path.startswith(directory + os.sep)}
+
+
+meta_store = MetaStore(export=str(config['DEFAULT'].get('meta_json_export', False)).lower() == "true")
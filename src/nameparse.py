@@ -0,0 +1,46 @@
+import json
+from functools import lru_cache
+
+import anitopy
+from guessit import guessit as _guessit
+
+
+@lru_cache(maxsize=1024)
+def _guess(name, options):
+    return _guessit(name, json.loads(options) if options else None)
+
+
+@lru_cache(maxsize=256)
+def _anitopy(name, options):
+    if options:
+        return anitopy.parse(name, json.loads(options))
+    return anitopy.parse(name)
+
+
+def _options_key(options):
+    return json.dumps(options, sort_keys=True) if options else None
+
+
+def _copy(result):
+    # A deepcopy of guessit's MatchesDict drags the whole rebulk match tree along, the values
+    # are plain strings, numbers and lists of them, so copying the lists is enough
+    return {key: list(value) if isinstance(value, list) else value for key, value in result.items()}
+
+
+def guessit(name, options=None):
+    """
+    guessit.guessit() parsed once per process for every name and options pair, the same
+    file name is looked at from a dozen places while preparing one upload.
+    Returns a copy, callers are free to change it.
+    """
+    return _copy(_guess(str(name), _options_key(options)))
+
+
+def anitopy_parse(name, options=None):
+    """anitopy.parse() memoized the same way as guessit()."""
+    result = _anitopy(str(name), _options_key(options))
+    return _copy(result) if result is not None else None
+
+
+def cache_info():
+    return _guess.cache_info(), _anitopy.cache_info()
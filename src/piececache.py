@@ -0,0 +1,111 @@
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from src.console import console
+from src.piecehash import read_piece
+
+
+class PieceCache:
+    """
+    On-disk cache of torrent piece hashes, keyed by the identity of every file
+    (path, size, mtime, inode) in torrent order and the piece size.
+    A hit means the same content can be re-created without reading it again.
+    """
+    def __init__(self, base_dir, max_size_mib=50, max_age_days=90, verify_samples=0, debug=False):
+        self.db_path = os.path.join(base_dir, "tmp", "piece_cache.db")
+        self.max_size = int(max_size_mib) * 1024 * 1024
+        self.max_age = int(max_age_days) * 86400
+        self.verify_samples = int(verify_samples)
+        self.debug = debug
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS pieces ("
+                "key TEXT PRIMARY KEY, piece_size INTEGER, pieces BLOB, created REAL, last_used REAL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def make_key(self, filepaths, piece_size):
+        identity = []
+        for filepath in filepaths:
+            stat = os.stat(filepath)
+            identity.append([os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns, stat.st_ino])
+        return hashlib.sha1(json.dumps([piece_size, identity]).encode('utf-8')).hexdigest()
+
+    def get(self, filepaths, piece_size):
+        try:
+            key = self.make_key(filepaths, piece_size)
+            with self._connect() as db:
+                row = db.execute("SELECT pieces FROM pieces WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                pieces = bytes(row[0])
+                if self.verify_samples and not self.verify(filepaths, piece_size, pieces):
+                    console.print("[yellow]Cached piece hashes failed verification, rehashing")
+                    db.execute("DELETE FROM pieces WHERE key = ?", (key,))
+                    return None
+                db.execute("UPDATE pieces SET last_used = ? WHERE key = ?", (time.time(), key))
+            return pieces
+        except (OSError, sqlite3.Error) as e:
+            console.print(f"[yellow]Piece cache lookup failed: {e}")
+            return None
+
+    def put(self, filepaths, piece_size, pieces):
+        try:
+            key = self.make_key(filepaths, piece_size)
+            now = time.time()
+            with self._connect() as db:
+                db.execute(
+                    "INSERT OR REPLACE INTO pieces (key, piece_size, pieces, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                    (key, piece_size, pieces, now, now)
+                )
+            self.evict()
+        except (OSError, sqlite3.Error) as e:
+            console.print(f"[yellow]Unable to store piece hashes in cache: {e}")
+
+    def evict(self):
+        """Drop entries older than max_age, then least recently used ones until under max_size."""
+        with self._connect() as db:
+            db.execute("DELETE FROM pieces WHERE last_used < ?", (time.time() - self.max_age,))
+            total = db.execute("SELECT COALESCE(SUM(LENGTH(pieces)), 0) FROM pieces").fetchone()[0]
+            if total <= self.max_size:
+                return
+            removed = 0
+            for key, size in db.execute("SELECT key, LENGTH(pieces) FROM pieces ORDER BY last_used ASC").fetchall():
+                if total <= self.max_size:
+                    break
+                db.execute("DELETE FROM pieces WHERE key = ?", (key,))
+                total -= size
+                removed += 1
+            if self.debug:
+                console.print(f"Evicted {removed} entries from the piece cache")
+
+    def verify(self, filepaths, piece_size, pieces):
+        """Rehash the first, last and some random pieces and compare against the cached hashes."""
+        sizes = [os.path.getsize(filepath) for filepath in filepaths]
+        pieces_total = len(pieces) // 20
+        if pieces_total != -(-sum(sizes) // piece_size):
+            return False
+        indexes = {0, pieces_total - 1}
+        indexes.update(random.sample(range(pieces_total), min(self.verify_samples, pieces_total)))
+        for index in sorted(indexes):
+            data = read_piece(filepaths, sizes, index, piece_size)
+            if hashlib.sha1(data).digest() != pieces[index * 20:(index + 1) * 20]:
+                if self.debug:
+                    console.print(f"Piece {index} does not match the cached hash")
+                return False
+        if self.debug:
+            console.print(f"Verified {len(indexes)} cached pieces")
+        return True
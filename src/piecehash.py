@@ -0,0 +1,114 @@
+import os
+import time
+import hashlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Size of each sequential read. Rounded up to a whole number of pieces.
+READ_CHUNK_SIZE = 64 * 1024 * 1024
+# Bytes of chunks read ahead and waiting to be hashed. Always at least two chunks.
+MEMORY_BUDGET = 512 * 1024 * 1024
+
+
+def default_workers():
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def _sha1_digest(view):
+    # hashlib releases the GIL for buffers over 2 KiB, so this scales across threads
+    return hashlib.sha1(view).digest()
+
+
+def _read_chunks(filepaths, chunk_size, get_buffer):
+    """
+    Read the concatenation of all files in torrent order, yielding
+    (buffer, memoryview) pairs of exactly chunk_size bytes (except the last one).
+    """
+    buf = get_buffer()
+    view = memoryview(buf)
+    filled = 0
+    for filepath in filepaths:
+        with open(filepath, 'rb', buffering=0) as f:
+            while True:
+                read = f.readinto(view[filled:])
+                if not read:
+                    break
+                filled += read
+                if filled == chunk_size:
+                    yield buf, view
+                    buf = get_buffer()
+                    view = memoryview(buf)
+                    filled = 0
+    if filled:
+        yield buf, view[:filled]
+
+
+def hash_pieces(filepaths, piece_size, workers=None, callback=None, interval=5):
+    """
+    Compute the concatenated SHA-1 piece hashes for filepaths, in order.
+
+    Files are read sequentially in large chunks on the calling thread while the
+    pieces of each chunk are hashed on a thread pool. Chunks held in memory at once
+    are limited to MEMORY_BUDGET bytes, or two chunks when those are bigger.
+
+    callback(pieces_done, pieces_total) is called at most once every interval seconds
+    and once at the end.
+    """
+    workers = workers or default_workers()
+    total_size = sum(os.path.getsize(p) for p in filepaths)
+    pieces_total = -(-total_size // piece_size)
+    chunk_size = max(1, READ_CHUNK_SIZE // piece_size) * piece_size
+    max_chunks = max(2, MEMORY_BUDGET // chunk_size)
+
+    digests = []
+    pending = deque()
+    free_buffers = []
+    last_report = time.monotonic()
+
+    def get_buffer():
+        # Buffers are recycled once every piece in them has been hashed
+        return free_buffers.pop() if free_buffers else bytearray(chunk_size)
+
+    def collect_oldest():
+        buf, futures = pending.popleft()
+        for future in futures:
+            digests.append(future.result())
+        free_buffers.append(buf)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="piecehash") as executor:
+        for buf, chunk in _read_chunks(filepaths, chunk_size, get_buffer):
+            futures = [
+                executor.submit(_sha1_digest, chunk[start:start + piece_size])
+                for start in range(0, len(chunk), piece_size)
+            ]
+            pending.append((buf, futures))
+            if len(pending) >= max_chunks:
+                collect_oldest()
+            if callback and time.monotonic() - last_report >= interval:
+                callback(len(digests), pieces_total)
+                last_report = time.monotonic()
+        while pending:
+            collect_oldest()
+
+    if len(digests) != pieces_total:
+        raise RuntimeError(f"Hashed {len(digests)} pieces, expected {pieces_total}")
+    if callback:
+        callback(pieces_total, pieces_total)
+    return b''.join(digests)
+
+
+def read_piece(filepaths, sizes, index, piece_size):
+    """Read piece number index from the concatenation of filepaths."""
+    offset = index * piece_size
+    data = bytearray()
+    position = 0
+    for filepath, size in zip(filepaths, sizes):
+        if offset < position + size:
+            with open(filepath, 'rb') as f:
+                f.seek(max(0, offset - position))
+                data += f.read(piece_size - len(data))
+            if len(data) >= piece_size:
+                break
+        position += size
+    return bytes(data)
@@ -12,13 +12,15 @@ from src.region import get_region, get_distributor, get_service
 from src.exportmi import exportInfo, mi_resolution
 from src.getseasonep import get_season_episode
 from src.btnid import get_btn_torrents, get_bhd_torrents
+from src.httpclients import http_clients
+from src.metacache import meta_cache
 
 try:
     import traceback
     from src.discparse import DiscParse
     import os
     import re
-    from guessit import guessit
+    from src.nameparse import guessit
     import ntpath
     from pathlib import Path
     import urllib
@@ -26,10 +28,12 @@ try:
     import json
     import glob
     import requests
+    import httpx
     from pymediainfo import MediaInfo
     import tmdbsimple as tmdb
     import time
     import itertools
+    import asyncio
     import aiohttp
 except ModuleNotFoundError:
     console.print(traceback.print_exc())
@@ -40,6 +44,15 @@ except KeyboardInterrupt:
     exit()
 
 
+async def timed(step_times, step, coro):
+    """Await coro and add its wall time to step_times[step], for the --debug breakdown."""
+    start = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        step_times[step] = step_times.get(step, 0) + time.perf_counter() - start
+
+
 class Prep():
     """
     Prepare for upload:
@@ -119,7 +132,7 @@ class Prep():
             except Exception:
                 meta['search_year'] = ""
             if not meta.get('edit', False):
-                mi = await exportInfo(f"{meta['discs'][0]['path']}/VTS_{meta['discs'][0]['main_set'][0][:2]}_1.VOB", False, meta['uuid'], meta['base_dir'], export_text=False)
+                mi = await exportInfo(f"{meta['discs'][0]['path']}/VTS_{meta['discs'][0]['main_set'][0][:2]}_1.VOB", False, meta['uuid'], meta['base_dir'], export_text=False, debug=meta['debug'])
                 meta['mediainfo'] = mi
             else:
                 mi = meta['mediainfo']
@@ -142,7 +155,7 @@ class Prep():
             except Exception:
                 meta['search_year'] = ""
             if not meta.get('edit', False):
-                mi = await exportInfo(meta['discs'][0]['largest_evo'], False, meta['uuid'], meta['base_dir'], export_text=False)
+                mi = await exportInfo(meta['discs'][0]['largest_evo'], False, meta['uuid'], meta['base_dir'], export_text=False, debug=meta['debug'])
                 meta['mediainfo'] = mi
             else:
                 mi = meta['mediainfo']
@@ -163,7 +176,7 @@ class Prep():
                 meta['search_year'] = ""
 
             if not meta.get('edit', False):
-                mi = await exportInfo(videopath, meta['isdir'], meta['uuid'], base_dir, export_text=True)
+                mi = await exportInfo(videopath, meta['isdir'], meta['uuid'], base_dir, export_text=True, debug=meta['debug'])
                 meta['mediainfo'] = mi
             else:
                 mi = meta['mediainfo']
@@ -251,7 +264,7 @@ class Prep():
                         return updated_meta
                     except aiohttp.ClientSSLError:
                         print(f"{tracker_name} tracker request failed due to SSL error.")
-                    except requests.exceptions.ConnectionError as conn_err:
+                    except (httpx.RequestError, requests.exceptions.ConnectionError) as conn_err:
                         print(f"{tracker_name} tracker request failed due to connection error: {conn_err}")
                     return meta
 
@@ -298,8 +311,8 @@ class Prep():
             console.print("mal_id:", meta.get("mal_id"))
             console.print("category:", meta.get("category"))
         console.print("[yellow]Building meta data.....")
-        if meta['debug']:
-            meta_start_time = time.time()
+        meta_start_time = time.time()
+        step_times = {}
         if meta.get('manual_language'):
             meta['original_langauge'] = meta.get('manual_language').lower()
         meta['type'] = await self.get_type(video, meta['scene'], meta['is_disc'], meta)
@@ -307,35 +320,14 @@ class Prep():
             meta['category'] = await self.get_cat(video)
         else:
             meta['category'] = meta['category'].upper()
-        if meta.get('tmdb_id') == 0 and meta.get('imdb_id') == 0:
-            meta['category'], meta['tmdb_id'], meta['imdb_id'] = await get_tmdb_imdb_from_mediainfo(mi, meta['category'], meta['is_disc'], meta['tmdb_id'], meta['imdb_id'])
-        if meta.get('tmdb_id') == 0 and meta.get('imdb_id') == 0:
-            meta = await get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename)
-        elif meta.get('imdb_id') != 0 and meta.get('tmdb_id') == 0:
-            meta = await get_tmdb_from_imdb(meta, filename)
-        # Get tmdb data
-        if int(meta['tmdb_id']) != 0:
-            meta = await tmdb_other_meta(meta)
-        # Search tvmaze
-        if meta['category'] == "TV":
-            meta['tvmaze_id'], meta['imdb_id'], meta['tvdb_id'] = await search_tvmaze(filename, meta['search_year'], meta.get('imdb_id', 0), meta.get('tvdb_id', 0), meta)
-        else:
-            meta.setdefault('tvmaze_id', 0)
-        meta['tvmaze'] = meta.get('tvmaze_id', 0)
-        # If no imdb, search for it
-        if meta.get('imdb_id') == 0:
-            meta['imdb_id'] = await search_imdb(filename, meta['search_year'])
-        # Get imdb data
-        if meta.get('imdb_info', None) is None and int(meta['imdb_id']) != 0:
-            meta['imdb_id'] = str(meta.get('imdb_id')).zfill(7)
-            meta['imdb_info'] = await get_imdb_info_api(meta['imdb_id'], meta)
+        meta = await self.resolve_ids(meta, filename, untouched_filename, mi, step_times)
         if meta.get('tag', None) is None:
             meta['tag'] = await self.get_tag(video, meta)
         else:
             if not meta['tag'].startswith('-') and meta['tag'] != "":
                 meta['tag'] = f"-{meta['tag']}"
         if meta['category'] == "TV":
-            meta = await get_season_episode(video, meta)
+            meta = await timed(step_times, "season/episode", get_season_episode(video, meta))
         meta = await self.tag_override(meta)
         if meta.get('tag') == "-SubsPlease":  # SubsPlease-specific
             tracks = meta.get('mediainfo', {}).get('media', {}).get('track', [])  # Get all tracks
@@ -351,7 +343,7 @@ class Prep():
             elif (bitrate.isdigit() or bitrate_oldMediaInfo.isdigit()) and meta.get('resolution') == "720p":
                 meta['service'] = "HIDI"
         meta['video'] = video
-        meta['audio'], meta['channels'], meta['has_commentary'] = await self.get_audio_v2(mi, meta, bdinfo)
+        meta['audio'], meta['channels'], meta['has_commentary'] = await timed(step_times, "audio", self.get_audio_v2(mi, meta, bdinfo))
         if meta['tag'][1:].startswith(meta['channels']):
             meta['tag'] = meta['tag'].replace(f"-{meta['channels']}", '')
         if meta.get('no_tag', False):
@@ -397,6 +389,10 @@ class Prep():
         if meta['debug']:
             meta_finish_time = time.time()
             console.print(f"Metadata processed in {meta_finish_time - meta_start_time:.2f} seconds")
+            # Steps that ran side by side overlap, so they can add up to more than the total
+            for step, seconds in step_times.items():
+                console.print(f"  {step:<16} {seconds:6.2f} seconds")
+            console.print(meta_cache.stats())
 
         return meta
 
@@ -551,6 +547,53 @@ class Prep():
             sd = 0
         return sd
 
+    async def resolve_ids(self, meta, filename, untouched_filename, mi, step_times):
+        """
+        Fill in the TMDb, TVmaze and IMDb ids and data left after reusing tracker info.
+        TMDb goes first as its external ids feed the rest. Once the IMDb id is known the
+        TVmaze lookup and the IMDb info request only depend on it and run side by side.
+        """
+        if meta.get('tmdb_id') == 0 and meta.get('imdb_id') == 0:
+            meta['category'], meta['tmdb_id'], meta['imdb_id'] = await get_tmdb_imdb_from_mediainfo(mi, meta['category'], meta['is_disc'], meta['tmdb_id'], meta['imdb_id'])
+        if meta.get('tmdb_id') == 0 and meta.get('imdb_id') == 0:
+            meta = await timed(step_times, "tmdb search", get_tmdb_id(filename, meta['search_year'], meta, meta['category'], untouched_filename))
+        elif meta.get('imdb_id') != 0 and meta.get('tmdb_id') == 0:
+            meta = await timed(step_times, "tmdb from imdb", get_tmdb_from_imdb(meta, filename))
+        # Get tmdb data
+        if int(meta['tmdb_id']) != 0:
+            meta = await timed(step_times, "tmdb details", tmdb_other_meta(meta))
+
+        async def tvmaze():
+            if meta['category'] != "TV":
+                return None
+            return await timed(step_times, "tvmaze", search_tvmaze(filename, meta['search_year'], meta.get('imdb_id', 0), meta.get('tvdb_id', 0), meta))
+
+        imdb_info = None
+        if meta.get('imdb_info', None) is None and int(meta['imdb_id']) != 0:
+            # TVmaze hands the IMDb id back unchanged, it can't invalidate the info request
+            tvmaze_ids, imdb_info = await asyncio.gather(
+                tvmaze(),
+                timed(step_times, "imdb info", get_imdb_info_api(str(meta.get('imdb_id')).zfill(7), meta))
+            )
+        else:
+            tvmaze_ids = await tvmaze()
+        if tvmaze_ids:
+            meta['tvmaze_id'], meta['imdb_id'], meta['tvdb_id'] = tvmaze_ids
+        else:
+            meta.setdefault('tvmaze_id', 0)
+        meta['tvmaze'] = meta.get('tvmaze_id', 0)
+        # If no imdb, search for it
+        if meta.get('imdb_id') == 0:
+            meta['imdb_id'] = await timed(step_times, "imdb search", search_imdb(filename, meta['search_year']))
+        # Get imdb data
+        if imdb_info is not None:
+            meta['imdb_id'] = str(meta.get('imdb_id')).zfill(7)
+            meta['imdb_info'] = imdb_info
+        elif meta.get('imdb_info', None) is None and int(meta['imdb_id']) != 0:
+            meta['imdb_id'] = str(meta.get('imdb_id')).zfill(7)
+            meta['imdb_info'] = await timed(step_times, "imdb info", get_imdb_info_api(meta['imdb_id'], meta))
+        return meta
+
     """
     Is a scene release?
     """
@@ -567,7 +610,7 @@ class Prep():
             console.print("Using SRRDB url", url)
         if 'scene' not in meta:
             try:
-                response = requests.get(url, timeout=30)
+                response = await http_clients.get(url, timeout=30)
                 response_json = response.json()
                 if meta['debug']:
                     console.print(response_json)
@@ -594,7 +637,7 @@ class Prep():
                                 nfo_file_path = os.path.join(save_path, f"{release_lower}.nfo")
 
                                 # Download the NFO file
-                                nfo_response = requests.get(nfo_url, timeout=30)
+                                nfo_response = await http_clients.get(nfo_url, timeout=30)
                                 if nfo_response.status_code == 200:
                                     with open(nfo_file_path, 'wb') as f:
                                         f.write(nfo_response.content)
@@ -608,7 +651,7 @@ class Prep():
 
                     # IMDb Handling
                     try:
-                        response = requests.get(f"https://api.srrdb.com/v1/imdb/{base}")
+                        response = await http_clients.get(f"https://api.srrdb.com/v1/imdb/{base}")
 
                         if response.status_code == 200:
                             r = response.json()
@@ -626,7 +669,7 @@ class Prep():
                         else:
                             console.print(f"[yellow]SRRDB API request failed with status: {response.status_code}")
 
-                    except requests.RequestException as e:
+                    except httpx.HTTPError as e:
                         console.print("[yellow]Failed to fetch IMDb information:", e)
 
                 else:
@@ -1434,7 +1477,7 @@ class Prep():
                     split = os.path.split(parsed.path)
                     raw = parsed._replace(path=f"{split[0]}/raw/{split[1]}" if split[0] != '/' else f"/raw{parsed.path}")
                     raw_url = urllib.parse.urlunparse(raw)
-                    desclink_content = requests.get(raw_url).text
+                    desclink_content = (await http_clients.get(raw_url)).text
                     if clean_text(desclink_content):
                         description.write(desclink_content + "\n")
                         meta['description'] = "CUSTOM"
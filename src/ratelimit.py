@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from data.config import config
+from src.console import console
+
+# Requests per second and burst size for sites with a known limit, override or add
+# hosts with "rate_limits" in the config. Hosts without a limit are never delayed.
+DEFAULT_LIMITS = {
+    'passthepopcorn.me': (1, 1),
+    'api.themoviedb.org': (40, 20),
+    'api.tvmaze.com': (2, 20),
+    'graphql.anilist.co': (0.5, 10),
+}
+
+
+class TokenBucket:
+    """
+    rate tokens per second, at most burst saved up. Every request takes one token and only
+    waits when there is none left. Tokens can go negative, each caller then sleeps until
+    its own token has been refilled, so callers are served in order without a lock.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """Take a token, returns the seconds to wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+def _configured_limits():
+    limits = dict(DEFAULT_LIMITS)
+    configured = config['DEFAULT'].get('rate_limits', {})
+    if not isinstance(configured, dict):
+        return limits
+    for host, limit in configured.items():
+        try:
+            rate = float(limit.get('rate'))
+            burst = max(1.0, float(limit.get('burst', 1)))
+        except (AttributeError, TypeError, ValueError):
+            console.print(f"[yellow]Ignoring invalid rate limit for {host}: {limit}")
+            continue
+        if rate > 0:
+            limits[host.lower()] = (rate, burst)
+        else:
+            # A rate of 0 removes the limit
+            limits.pop(host.lower(), None)
+    return limits
+
+
+class RateLimiter:
+    """One token bucket per remote host, shared by every request in this process."""
+    def __init__(self, limits):
+        self.limits = limits
+        self.buckets = {}
+        self.waited = defaultdict(float)
+        self.delayed = defaultdict(int)
+
+    @staticmethod
+    def host(url_or_host):
+        host = urlsplit(url_or_host).hostname if "//" in url_or_host else url_or_host
+        host = (host or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def bucket(self, host):
+        if host not in self.buckets:
+            limit = self.limits.get(host)
+            self.buckets[host] = TokenBucket(*limit) if limit else None
+        return self.buckets[host]
+
+    async def wait(self, url_or_host):
+        """Wait until a request to this host is within its limit."""
+        host = self.host(str(url_or_host))
+        bucket = self.bucket(host)
+        if bucket is None:
+            return
+        delay = bucket.reserve()
+        if delay > 0:
+            self.waited[host] += delay
+            self.delayed[host] += 1
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        if not self.delayed:
+            return "Rate limiter: no requests delayed"
+        return "Rate limiter: " + ", ".join(f"{host} {self.delayed[host]} delayed/{self.waited[host]:.1f}s" for host in sorted(self.delayed))
+
+
+rate_limiter = RateLimiter(_configured_limits())
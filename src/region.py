@@ -1,5 +1,5 @@
 import re
-from guessit import guessit
+from src.nameparse import guessit
 
 
 async def get_region(bdinfo, region=None):
@@ -17,6 +17,8 @@ import traceback
 import multiprocessing
 from pymediainfo import MediaInfo
 from src.console import console
+from src.capturescheduler import capture_scheduler, CaptureStats
+from src.keyframeindex import KeyframeIndex
 from data.config import config
 
 img_host = [
@@ -33,6 +35,27 @@ except ValueError:
     task_limit = 0
 tone_map = config['DEFAULT'].get('tone_map', False)
 optimize_images = config['DEFAULT'].get('optimize_images', True)
+single_pass = str(config['DEFAULT'].get('screenshot_single_pass', False)).lower() == "true"
+# Frames per ffmpeg process in single pass mode, each frame is its own input and decoder
+single_pass_batch = 8
+keyframe_snap = str(config['DEFAULT'].get('screenshot_keyframe_snap', False)).lower() == "true"
+precheck_frames = str(config['DEFAULT'].get('screenshot_precheck', False)).lower() == "true"
+# Pre-check thresholds on 8 bit luma. Darker frames, or frames with less spread between their
+# darkest and brightest 10%, are black or flat and end up as tiny images that get retaken
+min_frame_luma = 20
+min_frame_spread = 12
+
+
+async def snap_to_keyframes(path, ss_times, cache_dir, debug=False):
+    """Move screenshot times onto nearby keyframes when screenshot_keyframe_snap is enabled."""
+    if not keyframe_snap:
+        return ss_times
+    try:
+        index = KeyframeIndex(path, cache_dir, debug=debug)
+    except OSError as e:
+        console.print(f"[yellow]Unable to index keyframes of {path}: {e}")
+        return ss_times
+    return await index.snap(ss_times)
 
 
 async def sanitize_filename(filename):
@@ -117,21 +140,28 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
             loglevel = 'quiet'
 
         ss_times = await valid_ss_time([], num_screens + 1, length, frame_rate)
+        if keyframe == 'none':
+            ss_times = await snap_to_keyframes(file, ss_times, f"{base_dir}/tmp/{folder_id}", meta['debug'])
         existing_indices = {int(p.split('-')[-1].split('.')[0]) for p in existing_screens}
-        capture_tasks = [
-            capture_disc_task(
-                i,
-                file,
-                ss_times[i],
-                os.path.abspath(f"{base_dir}/tmp/{folder_id}/{sanitized_filename}-{len(existing_indices) + i}.png"),
-                keyframe,
-                loglevel,
-                hdr_tonemap
-            )
+        capture_stats = CaptureStats()
+        frames = [
+            (i, ss_times[i], os.path.abspath(f"{base_dir}/tmp/{folder_id}/{sanitized_filename}-{len(existing_indices) + i}.png"))
             for i in range(num_screens + 1)
         ]
+        results = []
+        if single_pass:
+            results = await capture_single_pass(
+                file, frames, lambda ss_time: disc_stream(file, ss_time, keyframe, hdr_tonemap), loglevel, capture_stats
+            )
+        captured = {r[0] for r in results}
+        capture_tasks = [
+            capture_disc_task(i, file, ss_time, image_path, keyframe, loglevel, hdr_tonemap, stats=capture_stats)
+            for i, ss_time, image_path in frames if i not in captured
+        ]
 
-        results = await asyncio.gather(*capture_tasks)
+        results += await asyncio.gather(*capture_tasks)
+        if meta['debug']:
+            console.print(f"Capture timing: {capture_stats.summary()}")
         filtered_results = [r for r in results if isinstance(r, tuple) and len(r) == 2]
 
         if len(filtered_results) != len(results):
@@ -161,8 +191,7 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
 
         # Dynamically determine the number of processes
         num_tasks = len(valid_images)
-        max_cores = task_limit if task_limit > 0 else os.cpu_count() // 2
-        num_workers = min(num_tasks, max_cores)  # Limit to number of tasks or available cores
+        num_workers = min(num_tasks, optimize_pool_size()[0])  # Limit to number of tasks or pool processes
         console.print("[yellow]Now optimizing images...[/yellow]")
         if meta['debug']:
             console.print(f"Using {num_workers} worker(s) for {num_tasks} image(s)")
@@ -171,7 +200,7 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
 
         def handle_sigint(sig, frame):
             console.print("\n[red]CTRL+C detected. Cancelling optimization...[/red]")
-            executor.shutdown(wait=False)
+            shutdown_optimize_pool(wait=False)
             stop_event.set()
             for task in asyncio.all_tasks(loop):
                 task.cancel()
@@ -179,23 +208,20 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
         signal.signal(signal.SIGINT, handle_sigint)
 
         try:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
-                # Start all tasks in parallel using worker_wrapper()
-                tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
+            # The pool lives for the whole run, it is shut down by upload.py cleanup()
+            executor = get_optimize_pool()
+            # Start all tasks in parallel using worker_wrapper()
+            tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
 
-                # Wait for all tasks to complete
-                optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Wait for all tasks to complete
+            optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
         except KeyboardInterrupt:
             console.print("\n[red]CTRL+C detected. Cancelling tasks...[/red]")
-            executor.shutdown(wait=False)
+            shutdown_optimize_pool(wait=False)
             await kill_all_child_processes()
             console.print("[red]All tasks cancelled. Exiting.[/red]")
             sys.exit(1)
         finally:
-            console.print("[yellow]Shutting down optimization workers...[/yellow]")
-            await asyncio.sleep(0.1)
-            await kill_all_child_processes()
-            executor.shutdown(wait=False)
             gc.collect()
 
         optimized_results = [res for res in optimized_results if not isinstance(res, str) or not res.startswith("Error")]
@@ -204,8 +230,6 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
             console.print("Optimized results:", optimized_results)
         console.print(f"[green]Successfully optimized {len(optimized_results)} images.")
 
-        executor.shutdown(wait=True)  # Ensure cleanup
-
         valid_results = []
         remaining_retakes = []
         for image_path in optimized_results:
@@ -245,7 +269,7 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
                             (index, file, random_time, image_path, keyframe, loglevel, hdr_tonemap)
                         )
 
-                        await optimize_image_task(screenshot_response)
+                        await worker_wrapper(screenshot_response, optimize_image_task, get_optimize_pool())
                         new_size = os.path.getsize(screenshot_response)
                         valid_image = False
 
@@ -282,25 +306,30 @@ async def disc_screenshots(meta, filename, bdinfo, folder_id, base_dir, use_vs,
         console.print(f"Screenshots processed in {finish_time - start_time:.4f} seconds")
 
 
-async def capture_disc_task(index, file, ss_time, image_path, keyframe, loglevel, hdr_tonemap):
+def disc_stream(file, ss_time, keyframe, hdr_tonemap):
+    ff = ffmpeg.input(file, ss=ss_time, skip_frame=keyframe)
+    if hdr_tonemap:
+        ff = (
+            ff
+            .filter('zscale', transfer='linear')
+            .filter('tonemap', tonemap='mobius', desat=8.0)
+            .filter('zscale', transfer='bt709')
+            .filter('format', 'rgb24')
+        )
+    return ff
+
+
+async def capture_disc_task(index, file, ss_time, image_path, keyframe, loglevel, hdr_tonemap, stats=None):
     try:
-        ff = ffmpeg.input(file, ss=ss_time, skip_frame=keyframe)
-        if hdr_tonemap:
-            ff = (
-                ff
-                .filter('zscale', transfer='linear')
-                .filter('tonemap', tonemap='mobius', desat=8.0)
-                .filter('zscale', transfer='bt709')
-                .filter('format', 'rgb24')
-            )
         command = (
-            ff
+            disc_stream(file, ss_time, keyframe, hdr_tonemap)
             .output(image_path, vframes=1, pix_fmt="rgb24")
             .overwrite_output()
             .global_args('-loglevel', loglevel)
         )
-        process = await asyncio.create_subprocess_exec(*command.compile(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-        stdout, stderr = await process.communicate()
+        async with capture_scheduler.slot(file, stats):
+            process = await asyncio.create_subprocess_exec(*command.compile(), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+            stdout, stderr = await process.communicate()
         if process.returncode == 0:
             return (index, image_path)
         else:
@@ -413,18 +442,21 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
         capture_results = existing_image_paths
         return
     else:
+        capture_stats = CaptureStats()
         for i in range(num_screens + 1):
             image = f"{meta['base_dir']}/tmp/{meta['uuid']}/{meta['discs'][disc_num]['name']}-{i}.png"
             input_file = f"{meta['discs'][disc_num]['path']}/VTS_{main_set[i % len(main_set)]}"
             if not os.path.exists(image) or meta.get('retake', False):
                 capture_tasks.append(
                     capture_dvd_screenshot(
-                        (i, input_file, image, ss_times[i], meta, width, height, w_sar, h_sar)
+                        (i, input_file, image, ss_times[i], meta, width, height, w_sar, h_sar), stats=capture_stats
                     )
                 )
 
         capture_results = []
         results = await asyncio.gather(*capture_tasks)
+        if meta['debug']:
+            console.print(f"Capture timing: {capture_stats.summary()}")
         filtered_results = [r for r in results if isinstance(r, tuple) and len(r) == 2]
 
         if len(filtered_results) != len(results):
@@ -459,8 +491,7 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
 
         # Dynamically determine the number of processes
         num_tasks = len(valid_images)
-        max_cores = task_limit if task_limit > 0 else os.cpu_count() // 2
-        num_workers = min(num_tasks, max_cores)  # Limit to number of tasks or available cores
+        num_workers = min(num_tasks, optimize_pool_size()[0])  # Limit to number of tasks or pool processes
 
         if num_workers == 0:
             console.print("[red]No valid images found for optimization.[/red]")
@@ -473,7 +504,7 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
 
         def handle_sigint(sig, frame):
             console.print("\n[red]CTRL+C detected. Cancelling optimization...[/red]")
-            executor.shutdown(wait=False)
+            shutdown_optimize_pool(wait=False)
             stop_event.set()
             for task in asyncio.all_tasks(loop):
                 task.cancel()
@@ -481,23 +512,20 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
         signal.signal(signal.SIGINT, handle_sigint)
 
         try:
-            with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
-                # Start all tasks in parallel using worker_wrapper()
-                tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
+            # The pool lives for the whole run, it is shut down by upload.py cleanup()
+            executor = get_optimize_pool()
+            # Start all tasks in parallel using worker_wrapper()
+            tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
 
-                # Wait for all tasks to complete
-                optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
+            # Wait for all tasks to complete
+            optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
         except KeyboardInterrupt:
             console.print("\n[red]CTRL+C detected. Cancelling tasks...[/red]")
-            executor.shutdown(wait=False)
+            shutdown_optimize_pool(wait=False)
             await kill_all_child_processes()
             console.print("[red]All tasks cancelled. Exiting.[/red]")
             sys.exit(1)
         finally:
-            console.print("[yellow]Shutting down optimization workers...[/yellow]")
-            await asyncio.sleep(0.1)
-            await kill_all_child_processes()
-            executor.shutdown(wait=False)
             gc.collect()
 
         optimized_results = [res for res in optimized_results if not isinstance(res, str) or not res.startswith("Error")]
@@ -506,8 +534,6 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
             console.print("Optimized results:", optimized_results)
         console.print(f"[green]Successfully optimized {len(optimized_results)} images.")
 
-        executor.shutdown(wait=True)  # Ensure cleanup
-
         valid_results = []
         remaining_retakes = []
 
@@ -555,7 +581,7 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
                             console.print(f"[red]Failed to capture screenshot for {image}. Retrying...[/red]")
                             continue
 
-                        await optimize_image_task(screenshot_result)
+                        await worker_wrapper(screenshot_result, optimize_image_task, get_optimize_pool())
 
                         retaken_size = os.path.getsize(screenshot_result)
                         if retaken_size > 75000:
@@ -578,7 +604,7 @@ async def dvd_screenshots(meta, disc_num, num_screens=None, retry_cap=None):
     console.print(f"[green]Successfully captured {len(valid_results)} screenshots.")
 
 
-async def capture_dvd_screenshot(task):
+async def capture_dvd_screenshot(task, stats=None):
     index, input_file, image, seek_time, meta, width, height, w_sar, h_sar = task
 
     try:
@@ -597,13 +623,14 @@ async def capture_dvd_screenshot(task):
         cmd = ff.output(image, vframes=1, pix_fmt="rgb24").overwrite_output().global_args('-loglevel', loglevel, '-accurate_seek').compile()
 
         # Run ffmpeg asynchronously
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        async with capture_scheduler.slot(input_file, stats):
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
 
-        stdout, stderr = await process.communicate()
+            stdout, stderr = await process.communicate()
 
         if process.returncode != 0:
             console.print(f"[red]Error capturing screenshot for {input_file} at {seek_time}s:[/red]\n{stderr.decode()}")
@@ -674,6 +701,7 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
         ss_times = [frame / frame_rate for frame in manual_frames]
     else:
         ss_times = await valid_ss_time([], num_screens + 1, length, frame_rate, exclusion_zone=500)
+        ss_times = await snap_to_keyframes(path, ss_times, f"{base_dir}/tmp/{folder_id}", meta['debug'])
 
     if meta['debug']:
         console.print(f"[green]Final list of frames for screenshots: {ss_times}")
@@ -700,8 +728,7 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
 
     num_capture = num_screens + 1 - existing_images_count
     num_tasks = num_capture
-    max_cores = task_limit if task_limit > 0 else os.cpu_count() // 2
-    num_workers = min(num_tasks, max_cores)  # Limit to number of tasks or available cores
+    num_workers = min(num_tasks, optimize_pool_size()[0])  # Limit to number of tasks or pool processes
 
     if meta['debug']:
         console.print(f"Using {num_workers} worker(s) for {num_capture} image(s)")
@@ -713,18 +740,38 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
 
     signal.signal(signal.SIGINT, handle_sigint)
 
-    capture_tasks = []
+    capture_stats = CaptureStats()
+    frames = []
     for i in range(num_screens + 1):
         image_path = os.path.abspath(f"{base_dir}/tmp/{folder_id}/{sanitized_filename}-{i}.png")
         if not os.path.exists(image_path) or meta.get('retake', False):
-            capture_tasks.append(
-                capture_screenshot(  # Direct async function call
-                    (i, path, ss_times[i], image_path, width, height, w_sar, h_sar, loglevel, meta.get('hdr_tonemap', False))
-                )
-            )
+            frames.append((i, ss_times[i], image_path))
+    if frames and not manual_frames:
+        checked_times = await asyncio.gather(*[
+            pick_detailed_time(path, ss_time, length, f"{base_dir}/tmp/{folder_id}", meta['debug'], capture_stats)
+            for _, ss_time, _ in frames
+        ])
+        frames = [(i, ss_time, image_path) for (i, _, image_path), ss_time in zip(frames, checked_times)]
 
     try:
-        results = await asyncio.gather(*capture_tasks, return_exceptions=True)
+        results = []
+        if single_pass and width > 0 and height > 0:
+            results = await capture_single_pass(
+                path, frames,
+                lambda ss_time: screenshot_stream(path, ss_time, width, height, w_sar, h_sar, meta.get('hdr_tonemap', False)),
+                loglevel, capture_stats
+            )
+        captured = {r[0] for r in results}
+        capture_tasks = [
+            capture_screenshot(  # Direct async function call
+                (i, path, ss_time, image_path, width, height, w_sar, h_sar, loglevel, meta.get('hdr_tonemap', False)),
+                stats=capture_stats
+            )
+            for i, ss_time, image_path in frames if i not in captured
+        ]
+        results += await asyncio.gather(*capture_tasks, return_exceptions=True)
+        if meta['debug']:
+            console.print(f"Capture timing: {capture_stats.summary()}")
         capture_results = [r for r in results if isinstance(r, tuple) and len(r) == 2]
         capture_results.sort(key=lambda x: x[0])
         capture_results = [r[1] for r in capture_results if r[1] is not None]
@@ -757,7 +804,7 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
 
     def handle_sigint(sig, frame):
         console.print("\n[red]CTRL+C detected. Cancelling optimization...[/red]")
-        executor.shutdown(wait=False)
+        shutdown_optimize_pool(wait=False)
         stop_event.set()
         for task in asyncio.all_tasks(loop):
             task.cancel()
@@ -765,23 +812,20 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
     signal.signal(signal.SIGINT, handle_sigint)
 
     try:
-        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
-            # Start all tasks in parallel using worker_wrapper()
-            tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
+        # The pool lives for the whole run, it is shut down by upload.py cleanup()
+        executor = get_optimize_pool()
+        # Start all tasks in parallel using worker_wrapper()
+        tasks = [asyncio.create_task(worker_wrapper(image, optimize_image_task, executor)) for image in valid_images]
 
-            # Wait for all tasks to complete
-            optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Wait for all tasks to complete
+        optimized_results = await asyncio.gather(*tasks, return_exceptions=True)
     except KeyboardInterrupt:
         console.print("\n[red]CTRL+C detected. Cancelling tasks...[/red]")
-        executor.shutdown(wait=False)
+        shutdown_optimize_pool(wait=False)
         await kill_all_child_processes()
         console.print("[red]All tasks cancelled. Exiting.[/red]")
         sys.exit(1)
     finally:
-        console.print("[yellow]Shutting down optimization workers...[/yellow]")
-        await asyncio.sleep(0.1)
-        await kill_all_child_processes()
-        executor.shutdown(wait=False)
         gc.collect()
 
     # Filter out failed results
@@ -789,7 +833,7 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
     console.print(f"[green]Successfully optimized {len(optimized_results)} images.[/green]")
 
     valid_results = []
-    remaining_retakes = []
+    retakes = []
     for image_path in optimized_results:
         if "Error" in image_path:
             console.print(f"[red]{image_path}")
@@ -815,69 +859,79 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
                 retake = True
 
         if retake:
-            retry_attempts = 3
-            for attempt in range(1, retry_attempts + 1):
-                console.print(f"[yellow]Retaking screenshot for: {image_path} (Attempt {attempt}/{retry_attempts})[/yellow]")
-                try:
-                    index = int(image_path.rsplit('-', 1)[-1].split('.')[0])
-
-                    if os.path.exists(image_path):
-                        os.remove(image_path)
+            retakes.append(image_path)
+        else:
+            valid_results.append(image_path)
 
-                    random_time = random.uniform(0, length)
-                    screenshot_response = await capture_screenshot(
-                        (index, path, random_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap)
-                    )
+    async def retake_screenshot(image_path):
+        retry_attempts = 3
+        for attempt in range(1, retry_attempts + 1):
+            console.print(f"[yellow]Retaking screenshot for: {image_path} (Attempt {attempt}/{retry_attempts})[/yellow]")
+            try:
+                index = int(image_path.rsplit('-', 1)[-1].split('.')[0])
 
-                    if not os.path.exists(screenshot_response):
-                        raise FileNotFoundError(f"Screenshot {screenshot_response} was not created successfully.")
-
-                    await optimize_image_task(screenshot_response)
-                    new_size = os.path.getsize(screenshot_response)
-                    valid_image = False
-
-                    if "imgbb" in img_host and 75000 < new_size <= 31000000:
-                        console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
-                        valid_image = True
-                    elif 75000 < new_size <= 10000000 and any(host in ["imgbox", "pixhost"] for host in img_host):
-                        console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
-                        valid_image = True
-                    elif new_size > 75000 and any(host in ["ptpimg", "lensdump", "ptscreens", "oeimg"] for host in img_host):
-                        console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
-                        valid_image = True
-
-                    if valid_image:
-                        valid_results.append(screenshot_response)
-                        break  # Exit retry loop on success
-                    else:
-                        console.print(f"[red]Retaken image {screenshot_response} does not meet the size requirements for {img_host}. Retrying...[/red]")
+                if os.path.exists(image_path):
+                    os.remove(image_path)
 
-                except asyncio.CancelledError:
-                    gc.collect()
-                    raise  # Ensure cancellation propagates
+                random_time = random.uniform(0, length)
+                random_time = (await snap_to_keyframes(path, [random_time], f"{base_dir}/tmp/{folder_id}", meta['debug']))[0]
+                random_time = await pick_detailed_time(path, random_time, length, f"{base_dir}/tmp/{folder_id}", meta['debug'], capture_stats)
+                screenshot_response = await capture_screenshot(
+                    (index, path, random_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap),
+                    stats=capture_stats
+                )
+                if not isinstance(screenshot_response, tuple) or screenshot_response[1] is None:
+                    raise FileNotFoundError(f"Screenshot {image_path} was not created successfully.")
+                screenshot_response = screenshot_response[1]
+
+                if not os.path.exists(screenshot_response):
+                    raise FileNotFoundError(f"Screenshot {screenshot_response} was not created successfully.")
+
+                await worker_wrapper(screenshot_response, optimize_image_task, get_optimize_pool())
+                new_size = os.path.getsize(screenshot_response)
+                valid_image = False
+
+                if "imgbb" in img_host and 75000 < new_size <= 31000000:
+                    console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
+                    valid_image = True
+                elif 75000 < new_size <= 10000000 and any(host in ["imgbox", "pixhost"] for host in img_host):
+                    console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
+                    valid_image = True
+                elif new_size > 75000 and any(host in ["ptpimg", "lensdump", "ptscreens", "oeimg"] for host in img_host):
+                    console.print(f"[green]Successfully retaken screenshot for: {screenshot_response} ({new_size} bytes)[/green]")
+                    valid_image = True
+
+                if valid_image:
+                    return screenshot_response
+                else:
+                    console.print(f"[red]Retaken image {screenshot_response} does not meet the size requirements for {img_host}. Retrying...[/red]")
 
-                except FileNotFoundError as e:
-                    console.print(f"[red]File error during screenshot retake: {e}[/red]")
+            except asyncio.CancelledError:
+                gc.collect()
+                raise  # Ensure cancellation propagates
 
-                except OSError as e:
-                    console.print(f"[red]OS error while processing {image_path}: {e}[/red]")
+            except FileNotFoundError as e:
+                console.print(f"[red]File error during screenshot retake: {e}[/red]")
 
-                except ValueError as e:
-                    console.print(f"[red]Value error in screenshot retake process: {e}[/red]")
+            except OSError as e:
+                console.print(f"[red]OS error while processing {image_path}: {e}[/red]")
 
-                except Exception as e:
-                    console.print(f"[red]Unexpected error retaking screenshot for {image_path}: {e}[/red]")
+            except ValueError as e:
+                console.print(f"[red]Value error in screenshot retake process: {e}[/red]")
 
-                finally:
-                    gc.collect()
+            except Exception as e:
+                console.print(f"[red]Unexpected error retaking screenshot for {image_path}: {e}[/red]")
 
-            else:
-                console.print(f"[red]All retry attempts failed for {image_path}. Skipping.[/red]")
-                remaining_retakes.append(image_path)
+            finally:
                 gc.collect()
 
-        else:
-            valid_results.append(image_path)
+        console.print(f"[red]All retry attempts failed for {image_path}. Skipping.[/red]")
+        return None
+
+    # Retakes run side by side, the capture scheduler still bounds the ffmpeg processes
+    retake_results = await asyncio.gather(*[retake_screenshot(image_path) for image_path in retakes])
+    valid_results.extend(result for result in retake_results if result)
+    remaining_retakes = [image_path for image_path, result in zip(retakes, retake_results) if not result]
 
     if remaining_retakes:
         console.print(f"[red]The following images could not be retaken successfully: {remaining_retakes}[/red]")
@@ -889,7 +943,134 @@ async def screenshots(path, filename, folder_id, base_dir, meta, num_screens=Non
         console.print(f"Screenshots processed in {finish_time - start_time:.4f} seconds")
 
 
-async def capture_screenshot(args):
+def screenshot_stream(path, ss_time, width, height, w_sar, h_sar, hdr_tonemap):
+    ff = ffmpeg.input(path, ss=ss_time)
+    if w_sar != 1 or h_sar != 1:
+        ff = ff.filter('scale', int(round(width * w_sar)), int(round(height * h_sar)))
+
+    if hdr_tonemap:
+        ff = (
+            ff
+            .filter('zscale', transfer='linear')
+            .filter('tonemap', tonemap='mobius', desat=10.0)
+            .filter('zscale', transfer='bt709')
+            .filter('format', 'rgb24')
+        )
+    return ff
+
+
+async def capture_single_pass(source, frames, build_stream, loglevel, stats=None):
+    """
+    Capture several frames of source per ffmpeg process, one fast seeked input per frame.
+    Every input is still opened, probed and decoded on its own, only the process start up and
+    its scheduling are shared by the batch. frames is a list of (index, ss_time, image_path).
+    Returns (index, image_path) for every image written, callers capture anything missing one
+    frame at a time. A failed batch returns nothing, its images may be incomplete.
+    """
+    def remove_outputs(batch):
+        for _, _, image_path in batch:
+            if os.path.exists(image_path):
+                os.remove(image_path)
+
+    async def run_batch(batch):
+        remove_outputs(batch)
+        outputs = []
+        for _, ss_time, image_path in batch:
+            stream = build_stream(ss_time)
+            if isinstance(stream.node, ffmpeg.nodes.InputNode):
+                # Without filters every input after the first would be mapped whole, audio included
+                stream = stream['v:0']
+            outputs.append(stream.output(image_path, vframes=1, pix_fmt="rgb24"))
+        command = ffmpeg.merge_outputs(*outputs).overwrite_output().global_args('-loglevel', loglevel)
+        try:
+            async with capture_scheduler.slot(source, stats):
+                process = await asyncio.create_subprocess_exec(
+                    *command.compile(),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                try:
+                    stdout, stderr = await process.communicate()
+                except asyncio.CancelledError:
+                    process.kill()
+                    raise
+            if process.returncode != 0:
+                console.print(f"[yellow]Single pass capture failed, capturing frames one at a time: {stderr.decode(errors='replace').strip()}")
+                remove_outputs(batch)
+                return []
+        except OSError as e:
+            console.print(f"[yellow]Single pass capture failed, capturing frames one at a time: {e}")
+            remove_outputs(batch)
+            return []
+        return [(index, image_path) for index, _, image_path in batch if os.path.exists(image_path)]
+
+    batches = [frames[i:i + single_pass_batch] for i in range(0, len(frames), single_pass_batch)]
+    results = await asyncio.gather(*[run_batch(batch) for batch in batches])
+    return [result for batch in results for result in batch]
+
+
+async def frame_detail(path, ss_time, stats=None):
+    """
+    Decode one frame into a small greyscale probe, without a full resolution capture, and score it
+    against the black and flat thresholds. Below 1 the frame is black or flat, None when ffmpeg can't tell.
+    """
+    command = (
+        ffmpeg.input(path, ss=ss_time)
+        .filter('scale', 160, -2)
+        .filter('format', 'yuv420p')
+        .filter('signalstats')
+        .filter('metadata', 'print', file='-')
+        .output('-', vframes=1, format='null')
+        .global_args('-loglevel', 'error')
+    )
+    async with capture_scheduler.slot(path, stats):
+        process = await asyncio.create_subprocess_exec(
+            *command.compile(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+    values = dict(re.findall(r"lavfi\.signalstats\.(YAVG|YLOW|YHIGH)=([\d.]+)", stdout.decode(errors='replace')))
+    if process.returncode != 0 or len(values) != 3:
+        return None
+    return min(float(values['YAVG']) / min_frame_luma, (float(values['YHIGH']) - float(values['YLOW'])) / min_frame_spread)
+
+
+async def pick_detailed_time(path, ss_time, length, cache_dir, debug=False, stats=None, attempts=3):
+    """
+    Replace ss_time with another random time while the frame there is black or flat, trying up to
+    attempts other times. When all of them are, the least flat time tried is returned.
+    """
+    if not precheck_frames:
+        return ss_time
+    best_time, best_score = ss_time, None
+    for attempt in range(attempts + 1):
+        try:
+            score = await frame_detail(path, ss_time, stats)
+        except OSError as e:
+            console.print(f"[yellow]Frame pre-check failed: {e}")
+            return ss_time
+        if score is None or score >= 1:
+            # Can't tell or detailed enough, let the capture and size check decide
+            return ss_time
+        if best_score is None or score > best_score:
+            best_time, best_score = ss_time, score
+        if attempt == attempts:
+            break
+        if debug:
+            console.print(f"[yellow]Frame at {ss_time:.2f}s is black or flat, picking another time")
+        ss_time = random.uniform(0, length)
+        ss_time = (await snap_to_keyframes(path, [ss_time], cache_dir, debug))[0]
+    if debug:
+        console.print(f"[yellow]No detailed frame found, using the least flat one at {best_time:.2f}s")
+    return best_time
+
+
+async def capture_screenshot(args, stats=None):
     index, path, ss_time, image_path, width, height, w_sar, h_sar, loglevel, hdr_tonemap = args
 
     try:
@@ -899,38 +1080,26 @@ async def capture_screenshot(args):
         if ss_time < 0:
             return f"Error: Invalid timestamp {ss_time}"
 
-        ff = ffmpeg.input(path, ss=ss_time)
-        if w_sar != 1 or h_sar != 1:
-            ff = ff.filter('scale', int(round(width * w_sar)), int(round(height * h_sar)))
-
-        if hdr_tonemap:
-            ff = (
-                ff
-                .filter('zscale', transfer='linear')
-                .filter('tonemap', tonemap='mobius', desat=10.0)
-                .filter('zscale', transfer='bt709')
-                .filter('format', 'rgb24')
-            )
-
         command = (
-            ff
+            screenshot_stream(path, ss_time, width, height, w_sar, h_sar, hdr_tonemap)
             .output(image_path, vframes=1, pix_fmt="rgb24")
             .overwrite_output()
             .global_args('-loglevel', loglevel)
         )
 
-        process = await asyncio.create_subprocess_exec(
-            *command.compile(),
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
+        async with capture_scheduler.slot(path, stats):
+            process = await asyncio.create_subprocess_exec(
+                *command.compile(),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
 
-        # Ensure process completes and doesn't leak
-        try:
-            stdout, stderr = await process.communicate()
-        except asyncio.CancelledError:
-            process.kill()
-            raise
+            # Ensure process completes and doesn't leak
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                raise
 
         if process.returncode == 0:
             return (index, image_path)
@@ -975,6 +1144,50 @@ async def valid_ss_time(ss_times, num_screens, length, frame_rate, exclusion_zon
     return result_times
 
 
+_optimize_pool = None
+
+
+def optimize_pool_size():
+    """
+    (processes, oxipng threads per process) for the optimization pool.
+    process_limit (or half the cores) sets the processes, and the cores are split between them
+    so processes * threads doesn't oversubscribe the machine.
+    """
+    cores = multiprocessing.cpu_count()
+    processes = task_limit if task_limit > 0 else max(1, cores // 2)
+    return processes, max(1, cores // processes)
+
+
+def init_optimize_worker(threads):
+    # Read by oxipng's thread pool when it first starts in this process
+    if sys.platform.startswith("linux") or sys.platform == "darwin":
+        os.environ['RAYON_NUM_THREADS'] = str(threads)
+
+
+def get_optimize_pool():
+    """Start the image optimization pool on first use and reuse it for every image, disc and queue item."""
+    global _optimize_pool
+    if _optimize_pool is None or getattr(_optimize_pool, '_broken', False):
+        if _optimize_pool is not None:
+            _optimize_pool.shutdown(wait=False, cancel_futures=True)
+        processes, threads = optimize_pool_size()
+        # The pool starts while the hashing and blocking call threads are running, forking then could
+        # copy a lock one of them holds (console, logging) into a worker and leave it stuck there
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _optimize_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes, initializer=init_optimize_worker, initargs=(threads,),
+            mp_context=multiprocessing.get_context(method)
+        )
+    return _optimize_pool
+
+
+def shutdown_optimize_pool(wait=True):
+    global _optimize_pool
+    if _optimize_pool is not None:
+        _optimize_pool.shutdown(wait=wait, cancel_futures=True)
+        _optimize_pool = None
+
+
 async def worker_wrapper(image, optimize_image_task, executor):
     """ Async wrapper to run optimize_image_task in a separate process """
     loop = asyncio.get_running_loop()
@@ -1009,10 +1222,6 @@ def optimize_image_task(image):
     """Optimizes an image using oxipng in a separate process."""
     try:
         if optimize_images:
-            if sys.platform.startswith("linux") or sys.platform == "darwin":
-                num_cores = multiprocessing.cpu_count()
-                max_threads = num_cores // 2
-                os.environ['RAYON_NUM_THREADS'] = str(max_threads)
             if not os.path.exists(image):
                 error_msg = f"ERROR: File not found - {image}"
                 console.print(f"[red]{error_msg}[/red]")
@@ -1,25 +1,36 @@
 from src.console import console
 from src.imdb import get_imdb_aka_api, get_imdb_info_api
 from src.args import Args
+from src.blocking import run_blocking
+from src.httpclients import http_clients
+from src.metacache import meta_cache
+from src.ratelimit import rate_limiter
 from data.config import config
 import tmdbsimple as tmdb
 import re
 import asyncio
-from guessit import guessit
 import cli_ui
-import anitopy
+from src.nameparse import anitopy_parse, guessit
 from datetime import datetime
 from difflib import SequenceMatcher
-import requests
 import json
 
 
+async def tmdb_request(endpoint, method, **kwargs):
+    """Bound tmdbsimple method run in the blocking pool, answered from the metadata cache when possible."""
+    async def request():
+        # tmdbsimple sends its own requests, outside the shared http clients
+        await rate_limiter.wait("api.themoviedb.org")
+        return await run_blocking(method, **kwargs)
+    return await meta_cache.fetch('tmdb', endpoint, kwargs, request)
+
+
 async def get_tmdb_from_imdb(meta, filename):
     imdb_id = meta['imdb_id']
     if str(imdb_id)[:2].lower() != "tt":
         imdb_id = f"tt{imdb_id}"
     find = tmdb.Find(id=imdb_id)
-    info = find.info(external_source="imdb_id")
+    info = await tmdb_request(f"find/{imdb_id}", find.info, external_source="imdb_id")
     if len(info['movie_results']) >= 1:
         meta['category'] = "MOVIE"
         meta['tmdb_id'] = info['movie_results'][0]['id']
@@ -37,7 +48,7 @@ async def get_tmdb_from_imdb(meta, filename):
         tvdb_id = meta.get('tvdb_id')
         if tvdb_id:
             find_tvdb = tmdb.Find(id=str(tvdb_id))
-            info_tvdb = find_tvdb.info(external_source="tvdb_id")
+            info_tvdb = await tmdb_request(f"find/{tvdb_id}", find_tvdb.info, external_source="tvdb_id")
             if meta['debug']:
                 console.print("TVDB INFO", info_tvdb)
 
@@ -66,7 +77,6 @@ async def get_tmdb_from_imdb(meta, filename):
                 parser = Args(config=config)
                 meta['category'], meta['tmdb_id'] = parser.parse_tmdb_id(id=tmdb_id, category=meta.get('category'))
 
-    await asyncio.sleep(2)
     return meta
 
 
@@ -75,13 +85,14 @@ async def get_tmdb_id(filename, search_year, meta, category, untouched_filename=
     search = tmdb.Search()
     try:
         # Primary search attempt
+        results = []
         if category == "MOVIE":
-            search.movie(query=filename, year=search_year)
+            results = (await tmdb_request("search/movie", search.movie, query=filename, year=search_year)).get('results')
         elif category == "TV":
-            search.tv(query=filename, first_air_date_year=search_year)
+            results = (await tmdb_request("search/tv", search.tv, query=filename, first_air_date_year=search_year)).get('results')
 
-        if search.results:
-            meta['tmdb_id'] = search.results[0]['id']
+        if results:
+            meta['tmdb_id'] = results[0]['id']
             return meta  # Successful match, return immediately
 
     except Exception as e:
@@ -90,13 +101,14 @@ async def get_tmdb_id(filename, search_year, meta, category, untouched_filename=
     # Secondary attempt: Try searching without the year
     console.print("[yellow]Retrying without year...[/yellow]")
     try:
+        results = []
         if category == "MOVIE":
-            search.movie(query=filename)
+            results = (await tmdb_request("search/movie", search.movie, query=filename)).get('results')
         elif category == "TV":
-            search.tv(query=filename)
+            results = (await tmdb_request("search/tv", search.tv, query=filename)).get('results')
 
-        if search.results:
-            meta['tmdb_id'] = search.results[0]['id']
+        if results:
+            meta['tmdb_id'] = results[0]['id']
             return meta  # Successful match, return immediately
 
     except Exception as e:
@@ -111,7 +123,7 @@ async def get_tmdb_id(filename, search_year, meta, category, untouched_filename=
     # Last attempt: Try parsing a better title
     if attempted == 1:
         try:
-            parsed_title = anitopy.parse(
+            parsed_title = anitopy_parse(
                 guessit(untouched_filename, {"excludes": ["country", "language"]})['title']
             )['anime_title']
             console.print(f"[bold yellow]Trying parsed title: {parsed_title}[/bold yellow]")
@@ -148,8 +160,15 @@ async def tmdb_other_meta(meta):
                 return meta
     if meta['category'] == "MOVIE":
         movie = tmdb.Movies(meta['tmdb_id'])
-        response = movie.info()
-        alternate = movie.alternative_titles()
+        # None of these depend on each other, only on the TMDb id
+        response, alternate, external, trailer, keywords, directors = await asyncio.gather(
+            tmdb_request(f"movie/{meta['tmdb_id']}", movie.info),
+            tmdb_request(f"movie/{meta['tmdb_id']}/alternative_titles", movie.alternative_titles),
+            tmdb_request(f"movie/{meta['tmdb_id']}/external_ids", movie.external_ids),
+            get_trailer(movie),
+            get_keywords(movie),
+            get_directors(movie),
+        )
         if meta['debug']:
             console.print("ALTERNATE", alternate)
         if meta['debug']:
@@ -160,7 +179,6 @@ async def tmdb_other_meta(meta):
         else:
             console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
             meta['year'] = meta['search_year']
-        external = movie.external_ids()
         if meta.get('imdb_id', 0) == 0:
             imdb_id = external.get('imdb_id', '0')
 
@@ -183,14 +201,8 @@ async def tmdb_other_meta(meta):
             meta['tvdb_id'] = external.get('tvdb_id', '0')
             if meta['tvdb_id'] in ["", " ", "None", None]:
                 meta['tvdb_id'] = 0
-        try:
-            videos = movie.videos()
-            for each in videos.get('results', []):
-                if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
-                    meta['youtube'] = f"https://www.youtube.com/watch?v={each.get('key')}"
-                    break
-        except Exception:
-            console.print('[yellow]Unable to grab videos from TMDb.')
+        if trailer:
+            meta['youtube'] = trailer
 
         meta['aka'], original_language = await get_imdb_aka_api(meta['imdb_id'], meta)
         if original_language is not None:
@@ -199,9 +211,9 @@ async def tmdb_other_meta(meta):
             meta['original_language'] = response['original_language']
 
         meta['original_title'] = response.get('original_title', meta['title'])
-        meta['keywords'] = await get_keywords(movie)
+        meta['keywords'] = keywords
         meta['genres'] = await get_genres(response)
-        meta['tmdb_directors'] = await get_directors(movie)
+        meta['tmdb_directors'] = directors
         if meta.get('anime', False) is False:
             meta['mal_id'], meta['aka'], meta['anime'], meta['demographic'] = await get_anime(response, meta)
         if meta.get('mal_manual') != 0:
@@ -213,8 +225,15 @@ async def tmdb_other_meta(meta):
         meta['runtime'] = response.get('episode_run_time', 60)
     elif meta['category'] == "TV":
         tv = tmdb.TV(meta['tmdb_id'])
-        response = tv.info()
-        alternate = tv.alternative_titles()
+        # None of these depend on each other, only on the TMDb id
+        response, alternate, external, trailer, keywords, directors = await asyncio.gather(
+            tmdb_request(f"tv/{meta['tmdb_id']}", tv.info),
+            tmdb_request(f"tv/{meta['tmdb_id']}/alternative_titles", tv.alternative_titles),
+            tmdb_request(f"tv/{meta['tmdb_id']}/external_ids", tv.external_ids),
+            get_trailer(tv),
+            get_keywords(tv),
+            get_directors(tv),
+        )
         if meta['debug']:
             console.print("ALTERNATE", alternate)
         if meta['debug']:
@@ -225,7 +244,6 @@ async def tmdb_other_meta(meta):
         else:
             console.print('[yellow]TMDB does not have a release date, using year from filename instead (if it exists)')
             meta['year'] = meta['search_year']
-        external = tv.external_ids()
         if meta.get('imdb_id', 0) == 0:
             imdb_id = external.get('imdb_id', '0')
 
@@ -248,14 +266,8 @@ async def tmdb_other_meta(meta):
             meta['tvdb_id'] = external.get('tvdb_id')
             if meta['tvdb_id'] in ["", " ", "None", None]:
                 meta['tvdb_id'] = 0
-        try:
-            videos = tv.videos()
-            for each in videos.get('results', []):
-                if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
-                    meta['youtube'] = f"https://www.youtube.com/watch?v={each.get('key')}"
-                    break
-        except Exception:
-            console.print('[yellow]Unable to grab videos from TMDb.')
+        if trailer:
+            meta['youtube'] = trailer
 
         # meta['aka'] = f" AKA {response['original_name']}"
         meta['aka'], original_language = await get_imdb_aka_api(meta['imdb_id'], meta)
@@ -264,9 +276,9 @@ async def tmdb_other_meta(meta):
         else:
             meta['original_language'] = response['original_language']
         meta['original_title'] = response.get('original_name', meta['title'])
-        meta['keywords'] = await get_keywords(tv)
+        meta['keywords'] = keywords
         meta['genres'] = await get_genres(response)
-        meta['tmdb_directors'] = await get_directors(tv)
+        meta['tmdb_directors'] = directors
         meta['mal_id'], meta['aka'], meta['anime'], meta['demographic'] = await get_anime(response, meta)
         if meta.get('mal_manual') != 0:
             meta['mal_id'] = meta['mal_manual']
@@ -290,9 +302,21 @@ async def tmdb_other_meta(meta):
     return meta
 
 
+async def get_trailer(tmdb_info):
+    try:
+        videos = await tmdb_request(f"{tmdb_info.BASE_PATH}/{tmdb_info.id}/videos", tmdb_info.videos)
+    except Exception:
+        console.print('[yellow]Unable to grab videos from TMDb.')
+        return None
+    for each in videos.get('results', []):
+        if each.get('site', "") == 'YouTube' and each.get('type', "") == "Trailer":
+            return f"https://www.youtube.com/watch?v={each.get('key')}"
+    return None
+
+
 async def get_keywords(tmdb_info):
     if tmdb_info is not None:
-        tmdb_keywords = tmdb_info.keywords()
+        tmdb_keywords = await tmdb_request(f"{tmdb_info.BASE_PATH}/{tmdb_info.id}/keywords", tmdb_info.keywords)
         if tmdb_keywords.get('keywords') is not None:
             keywords = [f"{keyword['name'].replace(',', ' ')}" for keyword in tmdb_keywords.get('keywords')]
         elif tmdb_keywords.get('results') is not None:
@@ -314,7 +338,7 @@ async def get_genres(tmdb_info):
 
 async def get_directors(tmdb_info):
     if tmdb_info is not None:
-        tmdb_credits = tmdb_info.credits()
+        tmdb_credits = await tmdb_request(f"{tmdb_info.BASE_PATH}/{tmdb_info.id}/credits", tmdb_info.credits)
         directors = []
         if tmdb_credits.get('cast', []) != []:
             for each in tmdb_credits['cast']:
@@ -351,6 +375,12 @@ async def get_anime(response, meta):
     return mal_id, alt_name, anime, demographic
 
 
+async def anilist_request(url, query, variables):
+    response = await http_clients.post(url, json={'query': query, 'variables': variables})
+    response.raise_for_status()
+    return response.json()
+
+
 async def get_romaji(tmdb_name, mal):
     if mal is None:
         mal = 0
@@ -416,20 +446,20 @@ async def get_romaji(tmdb_name, mal):
     url = 'https://graphql.anilist.co'
     demographic = 'Mina'  # Default to Mina if no tags are found
     try:
-        response = requests.post(url, json={'query': query, 'variables': variables})
-        json = response.json()
+        data = await meta_cache.fetch('anilist', url, variables, lambda: anilist_request(url, query, variables))
 
         # console.print('Checking for demographic tags...')
 
         demographics = ["Shounen", "Seinen", "Shoujo", "Josei", "Kodomo", "Mina"]
 
+        tags = json.dumps(data)
         for tag in demographics:
-            if tag in response.text:
+            if tag in tags:
                 demographic = tag
                 # print(f"Found {tag} tag")
                 break
 
-        media = json['data']['Page']['media']
+        media = data['data']['Page']['media']
     except Exception:
         console.print('[red]Failed to get anime specific info from anilist. Continuing without it...')
         media = []
@@ -479,7 +509,7 @@ async def get_tmdb_imdb_from_mediainfo(mediainfo, category, is_disc, tmdbid, imd
 
 async def daily_to_tmdb_season_episode(tmdbid, date):
     show = tmdb.TV(tmdbid)
-    seasons = show.info().get('seasons')
+    seasons = (await tmdb_request(f"tv/{tmdbid}", show.info)).get('seasons')
     season = 1
     episode = 1
     date = datetime.fromisoformat(str(date))
@@ -487,7 +517,7 @@ async def daily_to_tmdb_season_episode(tmdbid, date):
         air_date = datetime.fromisoformat(each['air_date'])
         if air_date <= date:
             season = int(each['season_number'])
-    season_info = tmdb.TV_Seasons(tmdbid, season).info().get('episodes')
+    season_info = (await tmdb_request(f"tv/{tmdbid}/season/{season}", tmdb.TV_Seasons(tmdbid, season).info)).get('episodes')
     for each in season_info:
         if str(each['air_date']) == str(date.date()):
             episode = int(each['episode_number'])
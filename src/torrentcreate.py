@@ -4,10 +4,18 @@ from torf import Torrent
 import random
 import math
 import os
+import time
 import re
 import cli_ui
 import glob
+import shutil
+import subprocess
+import threading
 from src.console import console
+from src.exceptions import HashingCancelled
+from src.piecehash import hash_pieces, default_workers
+from src.piececache import PieceCache
+from data.config import config
 
 
 def calculate_piece_size(total_size, min_size, max_size, files, meta):
@@ -118,14 +126,50 @@ class CustomTorrent(torf.Torrent):
         self.metainfo['info']['piece length'] = self.piece_size  # Ensure 'piece length' is set
 
 
-def create_torrent(meta, path, output_filename):
+class HashJob:
+    """
+    Progress reporting and cancellation for one torrent creation.
+    In the background a line is printed every 25% instead of redrawing a progress bar,
+    so the output doesn't fight with the screenshot and image upload progress.
+    """
+    def __init__(self, background=False):
+        self.background = background
+        self.cancel_event = threading.Event()
+        self._last_step = 0
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def check(self):
+        if self.cancel_event.is_set():
+            raise HashingCancelled("Torrent hashing was cancelled")
+
+    def progress(self, pieces_done, pieces_total):
+        self.check()
+        if not self.background:
+            cli_ui.info_progress("Hashing...", pieces_done, pieces_total)
+            return
+        step = pieces_done * 4 // pieces_total if pieces_total else 4
+        if step > self._last_step:
+            self._last_step = step
+            console.print(f"[cyan]Background hashing: {step * 25}% done")
+
+    def torf_cb(self, torrent, filepath, pieces_done, pieces_total):
+        # torf stops hashing when the callback returns anything but None
+        if self.cancel_event.is_set():
+            return True
+        self.progress(pieces_done, pieces_total)
+
+
+def create_torrent(meta, path, output_filename, job=None):
+    job = job or HashJob()
     # Handle directories and file inclusion logic
     if meta['isdir']:
         if meta['keep_folder']:
             cli_ui.info('--keep-folder was specified. Using complete folder for torrent creation.')
             path = path
         else:
-            os.chdir(path)
+            # No chdir here, this may run in a thread while screenshots rely on the working directory
             globs = glob.glob1(path, "*.mkv") + glob.glob1(path, "*.mp4") + glob.glob1(path, "*.ts")
             no_sample_globs = []
             for file in globs:
@@ -157,14 +201,162 @@ def create_torrent(meta, path, output_filename):
     torrent.validate_piece_size(meta)
 
     # Generate and write the new torrent
-    torrent.generate(callback=torf_cb, interval=5)
+    torrent = generate_torrent(torrent, meta, job)
     torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/{output_filename}.torrent", overwrite=True)
     torrent.verify_filesize(path)
 
-    console.print("[bold green].torrent created", end="\r")
+    console.print("[bold green].torrent created", end="\n" if job.background else "\r")
     return torrent
 
 
+def generate_torrent(torrent, meta, job):
+    """
+    Hash the torrent with the configured tool, reusing cached piece hashes when the files are unchanged.
+    Returns the torrent that should be written, which is a new object for mktorrent.
+    """
+    piece_cache = get_piece_cache(meta)
+    if piece_cache is not None:
+        filepaths = [str(filepath) for filepath in torrent.filepaths]
+        pieces = piece_cache.get(filepaths, torrent.piece_size)
+        if pieces is not None:
+            console.print("[bold green]Reusing cached piece hashes, files are unchanged")
+            torrent.metainfo['info']['pieces'] = pieces
+            return torrent
+
+    new_torrent = hash_torrent(torrent, meta, job)
+
+    if piece_cache is not None:
+        # mktorrent may order files differently, those hashes can't be reused for torf's order
+        if [str(f) for f in new_torrent.files] == [str(f) for f in torrent.files]:
+            piece_cache.put(filepaths, torrent.piece_size, new_torrent.metainfo['info']['pieces'])
+        elif meta['debug']:
+            console.print("File order differs from torf, not caching piece hashes")
+    return new_torrent
+
+
+def get_piece_cache(meta):
+    if str(config['DEFAULT'].get('piece_cache', False)).lower() != "true":
+        return None
+    try:
+        return PieceCache(
+            meta['base_dir'],
+            max_size_mib=config['DEFAULT'].get('piece_cache_max_size', 50),
+            max_age_days=config['DEFAULT'].get('piece_cache_max_age', 90),
+            verify_samples=config['DEFAULT'].get('piece_cache_verify', 0),
+            debug=meta['debug']
+        )
+    except Exception as e:
+        console.print(f"[yellow]Unable to open piece cache: {e}")
+        return None
+
+
+def hash_torrent(torrent, meta, job):
+    """Hash with the configured tool, falling back mktorrent -> parallel -> torf."""
+    torrent_creation = str(meta.get('torrent_creation') or config['DEFAULT'].get('torrent_creation', 'torf')).lower()
+    if torrent_creation == "mktorrent":
+        try:
+            return generate_mktorrent(torrent, meta, job)
+        except HashingCancelled:
+            raise
+        except Exception as e:
+            console.print(f"[yellow]mktorrent failed, falling back to the parallel hasher: {e}")
+            torrent_creation = "parallel"
+    if torrent_creation == "parallel":
+        try:
+            generate_parallel(torrent, meta, job)
+            return torrent
+        except HashingCancelled:
+            raise
+        except Exception as e:
+            console.print(f"[yellow]Parallel hashing failed, falling back to torf: {e}")
+    torrent.generate(callback=job.torf_cb, interval=5)
+    job.check()
+    return torrent
+
+
+def hash_threads():
+    try:
+        return int(config['DEFAULT'].get('torrent_hash_threads', 0)) or default_workers()
+    except ValueError:
+        return default_workers()
+
+
+def generate_mktorrent(torrent, meta, job):
+    mktorrent = shutil.which("mktorrent")
+    if mktorrent is None:
+        raise FileNotFoundError("mktorrent was not found in PATH")
+
+    workdir = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/mktorrent")
+    output = os.path.join(workdir, "mktorrent.torrent")
+    shutil.rmtree(workdir, ignore_errors=True)
+    os.makedirs(workdir)
+    try:
+        filepaths = [str(filepath) for filepath in torrent.filepaths]
+        if torrent.mode == 'singlefile':
+            source = filepaths[0]
+        else:
+            # mktorrent has no include globs, so hash a tree of links to only the files torf selected
+            source = os.path.join(workdir, torrent.name)
+            for filepath, file in zip(filepaths, torrent.files):
+                link = os.path.join(workdir, str(file))
+                os.makedirs(os.path.dirname(link), exist_ok=True)
+                os.symlink(filepath, link)
+
+        cmd = [
+            mktorrent,
+            "-a", "https://fake.tracker",
+            "-p",
+            "-l", str(int(math.log2(torrent.piece_size))),
+            "-t", str(hash_threads()),
+            "-o", output,
+            source
+        ]
+        if meta['debug']:
+            console.print(f"Running: {' '.join(cmd)}")
+            start_time = time.time()
+        console.print("[bold yellow]Hashing with mktorrent...")
+        proc = subprocess.Popen(cmd, stdout=None if meta['debug'] else subprocess.DEVNULL, stderr=subprocess.PIPE)
+        while True:
+            try:
+                _, stderr = proc.communicate(timeout=1)
+                break
+            except subprocess.TimeoutExpired:
+                if job.cancel_event.is_set():
+                    proc.kill()
+                    proc.communicate()
+                    job.check()
+        if proc.returncode != 0:
+            raise RuntimeError(stderr.decode(errors='replace').strip() or f"exit code {proc.returncode}")
+        if meta['debug']:
+            console.print(f"Hashing completed in {time.time() - start_time:.2f} seconds")
+
+        # Match the fields CustomTorrent sets
+        new_torrent = Torrent.read(output)
+        new_torrent.trackers = ["https://fake.tracker"]
+        new_torrent.source = "L4G"
+        new_torrent.private = True
+        new_torrent.creation_date = datetime.now()
+        new_torrent.comment = "Created by L4G's Upload Assistant"
+        new_torrent.created_by = "L4G's Upload Assistant"
+        return new_torrent
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def generate_parallel(torrent, meta, job):
+    workers = hash_threads()
+    filepaths = [str(filepath) for filepath in torrent.filepaths]
+    if meta['debug']:
+        console.print(f"Hashing {len(filepaths)} file(s) with {workers} thread(s), piece size {torrent.piece_size}")
+        start_time = time.time()
+    torrent.metainfo['info']['pieces'] = hash_pieces(
+        filepaths, torrent.piece_size, workers=workers,
+        callback=job.progress
+    )
+    if meta['debug']:
+        console.print(f"Hashing completed in {time.time() - start_time:.2f} seconds")
+
+
 def torf_cb(torrent, filepath, pieces_done, pieces_total):
     # print(f'{pieces_done/pieces_total*100:3.0f} % done')
     cli_ui.info_progress("Hashing...", pieces_done, pieces_total)
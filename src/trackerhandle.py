@@ -2,11 +2,36 @@ import asyncio
 import traceback
 import requests
 import cli_ui
-from src.trackers.THR import THR
-from src.trackers.PTP import PTP
 from src.trackersetup import TRACKER_SETUP
 from src.trackers.COMMON import COMMON
+from src.dupecache import dupe_cache
 from src.manualpackage import package
+from src.console import output_buffer
+from src.metaoverlay import MetaOverlay
+
+# Seconds a tracker waits after uploading before the torrent is added to the client.
+# Only that tracker's pipeline waits, other uploads keep going when running concurrently.
+post_upload_delay = {
+    'SN': 16,
+    'PTP': 5,
+}
+
+
+def takes_extra_disc_screens(meta):
+    """
+    Descriptions of a release with several discs, or a BDMV with several playlists, take and
+    upload screenshots of the extra ones and keep them in meta for the next tracker to reuse.
+    """
+    discs = meta.get('discs', [])
+    if len(discs) > 1:
+        return True
+    return bool(discs) and discs[0].get('type') == "BDMV" and len([key for key in discs[0] if key.startswith("bdinfo")]) > 1
+
+
+async def pace_after_upload(tracker):
+    delay = post_upload_delay.get(tracker, 0)
+    if delay:
+        await asyncio.sleep(delay)
 
 
 async def check_mod_q_and_draft(tracker_class, meta, debug, disctype):
@@ -39,7 +64,7 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
     tracker_setup = TRACKER_SETUP(config=config)
     enabled_trackers = tracker_setup.trackers_enabled(meta)
 
-    async def process_single_tracker(tracker):
+    async def process_single_tracker(tracker, meta=meta):
         if meta['name'].endswith('DUPE?'):
             meta['name'] = meta['name'].replace(' DUPE?', '')
 
@@ -63,6 +88,8 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                 if draft == "Yes":
                     console.print(f"(draft: {draft})")
                 await tracker_class.upload(meta, disctype)
+                dupe_cache.invalidate(meta, tracker)
+                await pace_after_upload(tracker)
                 await client.add_to_client(meta, tracker_class.tracker)
 
         elif tracker in other_api_trackers:
@@ -75,8 +102,8 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
                 if tracker == "RTF":
                     await tracker_class.api_test(meta)
                 await tracker_class.upload(meta, disctype)
-                if tracker == 'SN':
-                    await asyncio.sleep(16)
+                dupe_cache.invalidate(meta, tracker)
+                await pace_after_upload(tracker)
                 await client.add_to_client(meta, tracker_class.tracker)
 
         elif tracker in http_trackers:
@@ -88,6 +115,7 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
             if upload_status:
                 if await tracker_class.validate_credentials(meta) is True:
                     await tracker_class.upload(meta, disctype)
+                    await pace_after_upload(tracker)
                     await client.add_to_client(meta, tracker_class.tracker)
 
         elif tracker == "MANUAL":
@@ -117,12 +145,13 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
             color = "green" if upload_status else "red"
             console.print(f"[yellow]Tracker: {tracker}, Upload: [{color}]{'YES' if upload_status else 'No'}[/{color}]")
             if upload_status:
-                thr = THR(config=config)
+                thr = tracker_class_map["THR"](config=config)
                 try:
                     with requests.Session() as session:
                         console.print("[yellow]Logging in to THR")
                         session = thr.login(session)
                         await thr.upload(session, meta, disctype)
+                        await pace_after_upload(tracker)
                         await client.add_to_client(meta, "THR")
                 except Exception:
                     console.print(traceback.format_exc())
@@ -133,13 +162,47 @@ async def process_trackers(meta, config, client, console, api_trackers, tracker_
             color = "green" if upload_status else "red"
             console.print(f"[yellow]Tracker: {tracker}, Upload: [{color}]{'YES' if upload_status else 'No'}[/{color}]")
             if upload_status:
-                ptp = PTP(config=config)
+                ptp = tracker_class_map["PTP"](config=config)
                 groupID = meta.get('ptp_groupID', None)
                 ptpUrl, ptpData = await ptp.fill_upload_form(groupID, meta)
                 await ptp.upload(meta, ptpUrl, ptpData, disctype)
-                await asyncio.sleep(5)
+                await pace_after_upload(tracker)
                 await client.add_to_client(meta, "PTP")
 
-    # Process each tracker sequentially
-    for tracker in enabled_trackers:
-        await process_single_tracker(tracker)
+    concurrent = meta['unattended'] and str(config['DEFAULT'].get('concurrent_uploads', False)).lower() == "true"
+    if concurrent and takes_extra_disc_screens(meta):
+        # Concurrent trackers would each take and upload the same extra screenshots
+        concurrent = False
+        if meta['debug']:
+            console.print("[yellow]Uploading one tracker at a time, the descriptions need screenshots of the extra discs or playlists")
+    if not concurrent:
+        # Process each tracker sequentially
+        for tracker in enabled_trackers:
+            await process_single_tracker(tracker)
+        return
+
+    try:
+        upload_limit = asyncio.Semaphore(max(1, int(config['DEFAULT'].get('concurrent_upload_limit', 4))))
+    except (TypeError, ValueError):
+        upload_limit = asyncio.Semaphore(4)
+
+    async def process_buffered(tracker):
+        # Each tracker's output is held back and printed as one block when it finishes
+        buffer = []
+        output_buffer.set(buffer)
+        try:
+            async with upload_limit:
+                # Trackers change meta while uploading (piece size, type, descriptions), each gets its own view
+                await process_single_tracker(tracker, MetaOverlay(meta))
+        except Exception as e:
+            console.print(f"[red]Upload to {tracker} failed: {e}")
+            console.print(traceback.format_exc())
+        finally:
+            output_buffer.set(None)
+            console.print_buffer(buffer, title=tracker)
+
+    # MANUAL packages the descriptions of every tracker, so it runs once the uploads are done
+    uploads = [tracker for tracker in enabled_trackers if tracker.replace(" ", "").upper().strip() != "MANUAL"]
+    await asyncio.gather(*[process_buffered(tracker) for tracker in uploads])
+    if len(uploads) != len(enabled_trackers):
+        await process_single_tracker("MANUAL")
@@ -1,8 +1,7 @@
 # -*- coding: utf-8 -*-
 # import discord
-import os
 import asyncio
-import requests
+import os
 import platform
 import httpx
 import json
@@ -72,7 +71,7 @@ class ANT():
         if torrent_file_size_kib > 250:  # 250 KiB
             console.print("[yellow]Existing .torrent exceeds 250 KiB and will be regenerated to fit constraints.")
             meta['max_piece_size'] = '256'  # 256 MiB
-            create_torrent(meta, Path(meta['path']), "ANT")
+            await asyncio.to_thread(create_torrent, meta, Path(meta['path']), "ANT")
             torrent_filename = "ANT"
 
         await common.edit_torrent(meta, self.tracker, self.source_flag, torrent_filename=torrent_filename)
@@ -122,7 +121,7 @@ class ANT():
 
         try:
             if not meta['debug']:
-                response = requests.post(url=self.upload_url, files=files, data=data, headers=headers)
+                response = await COMMON.http.post(url=self.upload_url, files=files, data=data, headers=headers, timeout=COMMON.http.upload_timeout)
                 if response.status_code in [200, 201]:
                     response_data = response.json()
                 else:
@@ -158,25 +157,24 @@ class ANT():
             params['imdb'] = meta['imdb_id']
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url='https://anthelion.me/api', params=params)
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        for each in data.get('item', []):
-                            # Find the largest file
-                            largest = each['files'][0]
-                            for file in each['files']:
-                                if int(file['size']) > int(largest['size']):
-                                    largest = file
-                            result = largest['name']
-                            dupes.append(result)
-                    except json.JSONDecodeError:
-                        console.print("[bold yellow]Response content is not valid JSON. Skipping this API call.")
-                        meta['skipping'] = "ANT"
-                else:
-                    console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+            response = await COMMON.http.get(url='https://anthelion.me/api', params=params, timeout=5.0)
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                    for each in data.get('item', []):
+                        # Find the largest file
+                        largest = each['files'][0]
+                        for file in each['files']:
+                            if int(file['size']) > int(largest['size']):
+                                largest = file
+                        result = largest['name']
+                        dupes.append(result)
+                except json.JSONDecodeError:
+                    console.print("[bold yellow]Response content is not valid JSON. Skipping this API call.")
                     meta['skipping'] = "ANT"
+            else:
+                console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+                meta['skipping'] = "ANT"
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out after 5 seconds")
         except httpx.RequestError as e:
@@ -184,6 +182,5 @@ class ANT():
             meta['skipping'] = "ANT"
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
-            await asyncio.sleep(5)
 
         return dupes
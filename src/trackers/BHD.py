@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
-import requests
 from difflib import SequenceMatcher
 import os
 import platform
@@ -112,7 +110,7 @@ class BHD():
         url = self.upload_url + self.config['TRACKERS'][self.tracker]['api_key'].strip()
         details_link = {}
         if meta['debug'] is False:
-            response = requests.post(url=url, files=files, data=data, headers=headers)
+            response = await COMMON.http.post(url=url, files=files, data=data, headers=headers, timeout=COMMON.http.upload_timeout)
             try:
                 response = response.json()
                 if int(response['status_code']) == 0:
@@ -120,7 +118,7 @@ class BHD():
                     if response['status_message'].startswith('Invalid imdb_id'):
                         console.print('[yellow]RETRYING UPLOAD')
                         data['imdb_id'] = 1
-                        response = requests.post(url=url, files=files, data=data, headers=headers)
+                        response = await COMMON.http.post(url=url, files=files, data=data, headers=headers, timeout=COMMON.http.upload_timeout)
                         response = response.json()
                     elif response['status_message'].startswith('Invalid name value'):
                         console.print(f"[bold yellow]Submitted Name: {bhd_name}")
@@ -302,34 +300,32 @@ class BHD():
 
         url = f"https://beyond-hd.me/api/torrents/{self.config['TRACKERS']['BHD']['api_key'].strip()}"
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(url, params=data)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('status_code') == 1:
-                        for each in data['results']:
-                            result = {
-                                'name': each['name'],
-                                'size': each['size']
-                            }
-                            difference = SequenceMatcher(
-                                None,
-                                meta['clean_name'].replace('DD+', 'DDP'),
-                                result['name']
-                            ).ratio()
-                            if difference >= 0.05:
-                                dupes.append(result)
-                    else:
-                        console.print(f"[bold red]Failed to search torrents. API Error: {data.get('message', 'Unknown Error')}")
+            response = await COMMON.http.post(url, params=data, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                if data.get('status_code') == 1:
+                    for each in data['results']:
+                        result = {
+                            'name': each['name'],
+                            'size': each['size']
+                        }
+                        difference = SequenceMatcher(
+                            None,
+                            meta['clean_name'].replace('DD+', 'DDP'),
+                            result['name']
+                        ).ratio()
+                        if difference >= 0.05:
+                            dupes.append(result)
                 else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+                    console.print(f"[bold red]Failed to search torrents. API Error: {data.get('message', 'Unknown Error')}")
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out after 5 seconds")
         except httpx.RequestError as e:
             console.print(f"[bold red]Unable to search for existing torrents: {e}")
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
-            await asyncio.sleep(5)
 
         return dupes
 
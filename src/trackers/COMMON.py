@@ -1,8 +1,6 @@
 from torf import Torrent
 import os
-import requests
 import re
-import json
 import click
 import sys
 import glob
@@ -10,11 +8,17 @@ from pymediainfo import MediaInfo
 
 from src.bbcode import BBCODE
 from src.console import console
+from src.dupefilter import DupeFilter
+from src.httpclients import http_clients
+from src.metastore import meta_store
 from src.uploadscreens import upload_screens
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
 
 
 class COMMON():
+    # Shared keep-alive HTTP clients, use COMMON.http.get/post instead of opening a client per request
+    http = http_clients
+
     def __init__(self, config):
         self.config = config
         self.parser = self.MediaInfoParser()
@@ -155,9 +159,7 @@ class COMMON():
                                         descfile.write(image_str)
                                     descfile.write("[/center]\n\n")
 
-                                meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                                with open(meta_filename, 'w') as f:
-                                    json.dump(meta, f, indent=4)
+                                meta_store.save(meta)
 
             # Handle multiple discs case
             elif len(discs) > 1:
@@ -267,10 +269,8 @@ class COMMON():
                                         descfile.write(image_str)
                                     descfile.write("[/center]\n\n")
 
-                                # Save the updated meta to `meta.json` after upload
-                                meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                                with open(meta_filename, 'w') as f:
-                                    json.dump(meta, f, indent=4)
+                                # Save the updated meta after upload
+                                meta_store.save(meta)
 
             # Handle single file case
             if len(filelist) == 1:
@@ -333,9 +333,7 @@ class COMMON():
                                     })
 
             # Save updated meta
-            meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-            with open(meta_filename, 'w') as f:
-                json.dump(meta, f, indent=4)
+            meta_store.save(meta)
 
             # Second Pass: Process MediaInfo and Write Descriptions
             if len(filelist) > 1:
@@ -531,7 +529,7 @@ class COMMON():
             return None, None, None, None, None, None, None, None, None
 
         # Make the GET request with proper encoding handled by 'params'
-        response = requests.get(url=url, params=params)
+        response = await http_clients.get(url, params=params)
         # console.print(f"[blue]Raw API Response: {response}[/blue]")
 
         try:
@@ -662,14 +660,14 @@ class COMMON():
         # get douban url
         if int(meta.get('imdb_id')) != 0:
             data['search'] = f"tt{meta['imdb_id']}"
-            ptgen = requests.get(url, params=data)
+            ptgen = await http_clients.get(url, params=data)
             if ptgen.json()["error"] is not None:
                 for retry in range(ptgen_retry):
                     try:
-                        ptgen = requests.get(url, params=params)
+                        ptgen = await http_clients.get(url, params=params)
                         if ptgen.json()["error"] is None:
                             break
-                    except requests.exceptions.JSONDecodeError:
+                    except ValueError:
                         continue
             try:
                 params['url'] = ptgen.json()['data'][0]['link']
@@ -680,17 +678,15 @@ class COMMON():
             console.print("[red]No IMDb id was found.")
             params['url'] = console.input("[red]Please enter [yellow]Douban[/yellow] link: ")
         try:
-            ptgen = requests.get(url, params=params)
+            ptgen = await http_clients.get(url, params=params)
             if ptgen.json()["error"] is not None:
                 for retry in range(ptgen_retry):
-                    ptgen = requests.get(url, params=params)
+                    ptgen = await http_clients.get(url, params=params)
                     if ptgen.json()["error"] is None:
                         break
             ptgen = ptgen.json()
             meta['ptgen'] = ptgen
-            with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
-                json.dump(meta, f, indent=4)
-                f.close()
+            meta_store.save(meta)
             ptgen = ptgen['format']
             if "[/img]" in ptgen:
                 ptgen = ptgen.split("[/img]")[1]
@@ -711,248 +707,17 @@ class COMMON():
             console.log(f"[cyan]Pre-filtered dupes from {tracker_name}")
             console.log(dupes)
 
-        processed_dupes = [
-            {'name': d, 'size': None} if isinstance(d, str) else {'name': d['name'], 'size': d['size']}
-            for d in dupes
-        ]
-
-        new_dupes = []
-
-        has_repack_in_uuid = "repack" in meta.get('uuid', '').lower()
-        video_encode = meta.get("video_encode")
-        if video_encode is not None:
-            has_encoder_in_name = video_encode.lower()
-            normalized_encoder = await self.normalize_filename(has_encoder_in_name)
-        else:
-            normalized_encoder = False
-        if not meta['is_disc'] == "BDMV":
-            tracks = meta.get('mediainfo').get('media', {}).get('track', [])
-            fileSize = tracks[0].get('FileSize', '')
-        has_is_disc = bool(meta.get('is_disc', False))
-        target_hdr = await self.refine_hdr_terms(meta.get("hdr"))
-        target_season = meta.get("season")
-        target_episode = meta.get("episode")
-        target_resolution = meta.get("resolution")
-        tag = meta.get("tag").lower().replace("-", " ")
-        is_dvd = meta['is_disc'] == "DVD"
-        is_dvdrip = meta['type'] == "DVDRIP"
-        web_dl = meta.get('type') == "WEBDL"
-        is_hdtv = meta.get('type') == "HDTV"
-        target_source = meta.get("source")
-        is_sd = meta.get('sd')
-
-        attribute_checks = [
-            {
-                "key": "repack",
-                "uuid_flag": has_repack_in_uuid,
-                "condition": lambda each: meta['tag'].lower() in each and has_repack_in_uuid and "repack" not in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result because it lacks 'repack' and matches tag '{meta['tag']}': {each}"
-            },
-            {
-                "key": "remux",
-                "uuid_flag": "remux" in meta.get('name', '').lower(),
-                "condition": lambda each: "remux" in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result due to 'remux' mismatch: {each}"
-            },
-            {
-                "key": "uhd",
-                "uuid_flag": "uhd" in meta.get('name', '').lower(),
-                "condition": lambda each: "uhd" in each.lower(),
-                "exclude_msg": lambda each: f"Excluding result due to 'UHD' mismatch: {each}"
-            },
-        ]
-
-        async def log_exclusion(reason, item):
-            if meta['debug']:
-                console.log(f"[yellow]Excluding result due to {reason}: {item}")
-
-        async def process_exclusion(entry):
-            """
-            Determine if an entry should be excluded.
-            Returns True if the entry should be excluded, otherwise allowed as dupe.
-            """
-            each = entry['name']
-            sized = entry['size']
-            normalized = await self.normalize_filename(each)
-            file_hdr = await self.refine_hdr_terms(normalized)
-
-            if meta['debug']:
-                console.log(f"[debug] Evaluating dupe: {each}")
-                console.log(f"[debug] Normalized dupe: {normalized}")
-                console.log(f"[debug] Target resolution: {target_resolution}")
-                console.log(f"[debug] Target source: {target_source}")
-                console.log(f"[debug] File HDR terms: {file_hdr}")
-                console.log(f"[debug] Target HDR terms: {target_hdr}")
-                console.log(f"[debug] Target Season: {target_season}")
-                console.log(f"[debug] Target Episode: {target_episode}")
-                console.log(f"[debug] TAG: {tag}")
-                console.log("[debug] Evaluating repack condition:")
-                console.log(f"  has_repack_in_uuid: {has_repack_in_uuid}")
-                console.log(f"  'repack' in each.lower(): {'repack' in each.lower()}")
-                console.log(f"[debug] meta['uuid']: {meta.get('uuid', '')}")
-                console.log(f"[debug] meta['tag']: {meta.get('tag', '').lower()}")
-                console.log(f"[debug] normalized encoder: {normalized_encoder}")
-
-            if has_is_disc and each.lower().endswith(".m2ts"):
-                return False
-
-            if has_is_disc and re.search(r'\.\w{2,4}$', each):
-                await log_exclusion("file extension mismatch (is_disc=True)", each)
-                return True
-
-            if is_sd == 1 and tracker_name == "BHD":
-                if any(str(res) in each for res in [1080, 720, 2160]):
-                    return False
-
-            if is_dvd or "DVD" in target_source or is_dvdrip:
-                skip_resolution_check = True
-            else:
-                skip_resolution_check = False
-
-            if not skip_resolution_check:
-                if target_resolution and target_resolution not in each:
-                    await log_exclusion(f"resolution '{target_resolution}' mismatch", each)
-                    return True
-                if not await self.has_matching_hdr(file_hdr, target_hdr, meta):
-                    await log_exclusion(f"HDR mismatch: Expected {target_hdr}, got {file_hdr}", each)
-                    return True
-
-                if len(dupes) == 1 and meta.get('is_disc') != "BDMV" and tracker_name == "AITHER":
-                    if fileSize and "1080" in target_resolution:
-                        target_size = fileSize
-                        size = sized
-
-                        if size is not None and target_size is not None:
-                            target_size = int(target_size)
-                            size_difference = abs(size - target_size) / target_size
-                            if meta['debug']:
-                                console.print(f"Actual size: {size}, Target size: {target_size}, Size difference: {size_difference:.4f}")
-                            if size_difference < 0.20:
-                                await log_exclusion(f"size difference too small ({size_difference * 100:.2f}%)", each)
-                                return False
-
-            if is_dvd and not tracker_name == "BHD":
-                if any(str(res) in each for res in [1080, 720, 2160]):
-                    await log_exclusion(f"resolution '{target_resolution}' mismatch", each)
-                    return False
-
-            for check in attribute_checks:
-                if check["key"] == "repack":
-                    if has_repack_in_uuid and "repack" not in normalized:
-                        if tag and tag in normalized:
-                            await log_exclusion("missing 'repack'", each)
-                            return True
-                elif check["uuid_flag"] != check["condition"](each):
-                    await log_exclusion(f"{check['key']} mismatch", each)
-                    return True
-
-            if meta.get('category') == "TV":
-                season_episode_match = await self.is_season_episode_match(normalized, target_season, target_episode)
-                if meta['debug']:
-                    console.log(f"[debug] Season/Episode match result: {season_episode_match}")
-                if not season_episode_match:
-                    await log_exclusion("season/episode mismatch", each)
-                    return True
-
-            if (web_dl or is_hdtv) and ("web-dl" in normalized or "webdl" in normalized or "web dl" in normalized):
-                return False
-
-            if meta['debug']:
-                console.log(f"[debug] Passed all checks: {each}")
-            return False
+        new_dupes, excluded = DupeFilter(meta).filter(dupes, tracker_name)
 
-        for each in processed_dupes:
-            if not await process_exclusion(each):
-                new_dupes.append(each)
+        if meta['debug']:
+            for each, reason in excluded:
+                console.log(f"[yellow]Excluding result due to {reason}: {each}")
 
         if new_dupes:
             console.print(f"[cyan]Final dupes on {tracker_name}: {new_dupes}")
 
         return new_dupes
 
-    async def normalize_filename(self, filename):
-        if isinstance(filename, dict):
-            filename = filename.get('name', '')
-        if not isinstance(filename, str):
-            raise ValueError(f"Expected a string or a dictionary with a 'name' key, but got: {type(filename)}")
-        normalized = filename.lower().replace("-", " -").replace(" ", " ").replace(".", " ")
-
-        return normalized
-
-    async def is_season_episode_match(self, filename, target_season, target_episode):
-        """
-        Check if the filename matches the given season and episode.
-        """
-        season_match = re.search(r'[sS](\d+)', str(target_season))
-        target_season = int(season_match.group(1)) if season_match else None
-
-        if target_episode:
-            episode_matches = re.findall(r'\d+', str(target_episode))
-            target_episodes = [int(ep) for ep in episode_matches]
-        else:
-            target_episodes = []
-
-        season_pattern = rf"[sS]{target_season:02}" if target_season is not None else None
-        episode_patterns = [rf"[eE]{ep:02}" for ep in target_episodes] if target_episodes else []
-
-        # Determine if filename represents a season pack (no explicit episode pattern)
-        is_season_pack = not re.search(r"[eE]\d{2}", filename, re.IGNORECASE)
-
-        # If `target_episode` is empty, match only season packs
-        if not target_episodes:
-            return bool(season_pattern and re.search(season_pattern, filename, re.IGNORECASE)) and is_season_pack
-
-        # If `target_episode` is provided, match both season packs and episode files
-        if season_pattern:
-            if is_season_pack:
-                return bool(re.search(season_pattern, filename, re.IGNORECASE))  # Match season pack
-            if episode_patterns:
-                return bool(re.search(season_pattern, filename, re.IGNORECASE)) and any(
-                    re.search(ep, filename, re.IGNORECASE) for ep in episode_patterns
-                )  # Match episode file
-
-        return False  # No match
-
-    async def refine_hdr_terms(self, hdr):
-        """
-        Normalize HDR terms for consistent comparison.
-        Simplifies all HDR entries to 'HDR' and DV entries to 'DV'.
-        """
-        if hdr is None:
-            return set()
-        hdr = hdr.upper()
-        terms = set()
-        if "DV" in hdr or "DOVI" in hdr:
-            terms.add("DV")
-        if "HDR" in hdr:  # Any HDR-related term is normalized to 'HDR'
-            terms.add("HDR")
-        return terms
-
-    async def has_matching_hdr(self, file_hdr, target_hdr, meta):
-        """
-        Check if the HDR terms match or are compatible.
-        """
-        def simplify_hdr(hdr_set):
-            """Simplify HDR terms to just HDR and DV."""
-            simplified = set()
-            if any(h in hdr_set for h in {"HDR", "HDR10", "HDR10+"}):
-                simplified.add("HDR")
-            if "DV" in hdr_set or "DOVI" in hdr_set:
-                simplified.add("DV")
-                if "framestor" in meta['tag'].lower():
-                    simplified.add("HDR")
-            return simplified
-
-        file_hdr_simple = simplify_hdr(file_hdr)
-        target_hdr_simple = simplify_hdr(target_hdr)
-
-        if file_hdr_simple == {"DV", "HDR"} or file_hdr_simple == {"HDR", "DV"}:
-            file_hdr_simple = {"HDR"}
-            if target_hdr_simple == {"DV", "HDR"} or target_hdr_simple == {"HDR", "DV"}:
-                target_hdr_simple = {"HDR"}
-
-        return file_hdr_simple == target_hdr_simple
-
     class MediaInfoParser:
         # Language to ISO country code mapping
         LANGUAGE_CODE_MAP = {
@@ -1,5 +1,5 @@
-import requests
 import asyncio
+import requests
 import re
 import os
 from pathlib import Path
@@ -253,7 +253,7 @@ class HDB():
 
             # Validate and write the new torrent
             new_torrent.validate_piece_size()
-            new_torrent.generate(callback=torf_cb, interval=5)
+            await asyncio.to_thread(new_torrent.generate, callback=torf_cb, interval=5)
             new_torrent.write(torrent_path, overwrite=True)
 
         # Proceed with the upload process
@@ -339,16 +339,15 @@ class HDB():
 
         try:
             # Send POST request with JSON body
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(url, json=data)
-
-                if response.status_code == 200:
-                    response_data = response.json()
-                    for each in response_data.get('data', []):
-                        result = each['name']
-                        dupes.append(result)
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.post(url, json=data, timeout=5.0)
+
+            if response.status_code == 200:
+                response_data = response.json()
+                for each in response_data.get('data', []):
+                    result = each['name']
+                    dupes.append(result)
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while searching for existing torrents.")
@@ -357,7 +356,6 @@ class HDB():
         except Exception as e:
             console.print("[bold red]Unexpected error occurred while searching torrents.")
             console.print(str(e))
-            await asyncio.sleep(5)
 
         return dupes
 
@@ -379,7 +377,7 @@ class HDB():
             'passkey': self.passkey
         }
         try:
-            r = requests.post(url, data=json.dumps(data)).json()
+            r = (await COMMON.http.post(url, content=json.dumps(data))).json()
             if r.get('status', 5) == 0:
                 return True
             return False
@@ -415,7 +413,7 @@ class HDB():
             'passkey': self.passkey,
             'id': id
         }
-        r = requests.get(url=api_url, data=json.dumps(data))
+        r = await COMMON.http.request("GET", api_url, content=json.dumps(data))
         filename = r.json()['data'][0]['filename']
 
         # Download new .torrent
@@ -425,7 +423,7 @@ class HDB():
             'id': id
         }
 
-        r = requests.get(url=download_url, params=params)
+        r = await COMMON.http.get(download_url, params=params)
         with open(torrent_path, "wb") as tor:
             tor.write(r.content)
         return
@@ -511,9 +509,9 @@ class HDB():
                 return None
 
         try:
-            response = requests.post(url, data=data, files=files)
+            response = await COMMON.http.post(url, data=data, files=files, timeout=COMMON.http.upload_timeout)
             return response.text
-        except requests.RequestException as e:
+        except httpx.RequestError as e:
             print(f"[ERROR] HTTP Request failed: {e}")
             return None
         finally:
@@ -529,8 +527,8 @@ class HDB():
             "passkey": self.passkey,
             "id": hdb_id
         }
-        response = requests.get(url, json=data)
-        if response.ok:
+        response = await COMMON.http.request("GET", url, json=data)
+        if response.is_success:
             try:
                 response = response.json()
                 if response['data'] != []:
@@ -589,9 +587,9 @@ class HDB():
             console.print(f"[green]Searching HDB for file: [bold yellow]{os.path.basename(search_term)}[/bold yellow]")
             # console.print(f"[yellow]Using this data: {data}")
 
-        response = requests.get(url, json=data)
+        response = await COMMON.http.request("GET", url, json=data)
 
-        if response.ok:
+        if response.is_success:
             try:
                 response_json = response.json()
                 # console.print(f"[green]HDB API response: {response_json}[/green]")  # Log the entire response for debugging
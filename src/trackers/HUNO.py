@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
-import requests
 import os
 import re
 import platform
@@ -9,6 +7,7 @@ import cli_ui
 import httpx
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src.dupecache import dupe_cache
 from src.rehostimages import check_hosts
 
 
@@ -112,7 +111,7 @@ class HUNO():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await COMMON.http.post(url=self.upload_url, files=files, data=data, headers=headers, params=params, timeout=COMMON.http.upload_timeout)
             try:
                 console.print(response.json())
                 # adding torrent link to comment of torrent file
@@ -354,22 +353,24 @@ class HUNO():
             params['name'] = f"{meta.get('season', '')}"
         if meta.get('edition', "") != "":
             params['name'] + meta['edition']
+        cached = dupe_cache.get(meta, self.tracker, params)
+        if cached is not None:
+            return cached
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url=self.search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for each in data['data']:
-                        result = [each][0]['attributes']['name']
-                        dupes.append(result)
-                else:
-                    console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+            response = await COMMON.http.get(url=self.search_url, params=params, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                for each in data['data']:
+                    result = [each][0]['attributes']['name']
+                    dupes.append(result)
+                dupe_cache.set(meta, self.tracker, params, dupes)
+            else:
+                console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out after 5 seconds")
         except httpx.RequestError as e:
             console.print(f"[bold red]Unable to search for existing torrents: {e}")
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
-            await asyncio.sleep(5)
 
         return dupes
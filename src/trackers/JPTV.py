@@ -1,14 +1,9 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
-import requests
-import platform
-import httpx
-from src.trackers.COMMON import COMMON
-from src.console import console
+from src.trackers.UNIT3D import UNIT3D
 
 
-class JPTV():
+class JPTV(UNIT3D):
     """
     Edit for Tracker:
         Edit BASE.torrent with announce and source
@@ -17,176 +12,43 @@ class JPTV():
         Upload
     """
 
-    def __init__(self, config):
-        self.config = config
-        self.tracker = 'JPTV'
-        self.source_flag = 'jptv.club'
-        self.torrent_url = 'https://jptv.club/api/torrents/'
-        self.upload_url = 'https://jptv.club/api/torrents/upload'
-        self.search_url = 'https://jptv.club/api/torrents/filter'
-        self.signature = None
-        self.banned_groups = [""]
-        pass
+    tracker = 'JPTV'
+    source_flag = 'jptv.club'
+    base_url = 'https://jptv.club'
+    signature = None
+    banned_groups = [""]
 
-    async def get_cat_id(self, meta):
-        category_id = {
-            'MOVIE': '1',
-            'TV': '2',
-        }.get(meta['category'], '0')
+    type_ids = {
+        'DISC': '16',
+        'REMUX': '18',
+        'WEBDL': '4',
+        'WEBRIP': '5',
+        'HDTV': '6',
+        'ENCODE': '3'
+    }
+    upload_nfo = False
+
+    async def category_id(self, meta):
         if meta['anime']:
-            category_id = {
+            return {
                 'MOVIE': '7',
                 'TV': '9',
             }.get(meta['category'], '0')
-        return category_id
-
-    async def get_type_id(self, type):
-        type_id = {
-            'DISC': '16',
-            'REMUX': '18',
-            'WEBDL': '4',
-            'WEBRIP': '5',
-            'HDTV': '6',
-            'ENCODE': '3'
-        }.get(type, '0')
-        return type_id
-
-    async def get_res_id(self, resolution):
-        resolution_id = {
-            '8640p': '10',
-            '4320p': '1',
-            '2160p': '2',
-            '1440p': '3',
-            '1080p': '3',
-            '1080i': '4',
-            '720p': '5',
-            '576p': '6',
-            '576i': '7',
-            '480p': '8',
-            '480i': '9'
-        }.get(resolution, '10')
-        return resolution_id
-
-    async def upload(self, meta, disctype):
-        common = COMMON(config=self.config)
-        await common.edit_torrent(meta, self.tracker, self.source_flag)
-        cat_id = await self.get_cat_id(meta)
-        type_id = await self.get_type_id(meta['type'])
-        resolution_id = await self.get_res_id(meta['resolution'])
-        await common.unit3d_edit_desc(meta, self.tracker, self.signature)
-        region_id = await common.unit3d_region_ids(meta.get('region'))
-        distributor_id = await common.unit3d_distributor_ids(meta.get('distributor'))
-        jptv_name = await self.edit_name(meta)
-        if meta['anon'] == 0 and not self.config['TRACKERS'][self.tracker].get('anon', False):
-            anon = 0
-        else:
-            anon = 1
+        return await self.get_cat_id(meta['category'])
 
+    async def get_mediainfo(self, meta):
+        # JPTV takes the disc summaries in the mediainfo field
         if meta['bdinfo'] is not None:
             mi_dump = ""
             for each in meta['discs']:
                 mi_dump = mi_dump + each['summary'].strip() + "\n\n"
-        else:
-            mi_dump = open(f"{meta['base_dir']}/tmp/{meta['uuid']}/MEDIAINFO.txt", 'r', encoding='utf-8').read()
-            # bd_dump = None
-        desc = open(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{self.tracker}]DESCRIPTION.txt", 'r', encoding='utf-8').read()
-        open_torrent = open(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{self.tracker}]{meta['clean_name']}.torrent", 'rb')
-        files = {'torrent': open_torrent}
-        data = {
-            'name': jptv_name,
-            'description': desc,
-            'mediainfo': mi_dump,
-            # 'bdinfo' : bd_dump,
-            'category_id': cat_id,
-            'type_id': type_id,
-            'resolution_id': resolution_id,
-            'tmdb': meta['tmdb'],
-            'imdb': meta['imdb_id'],
-            'tvdb': meta['tvdb_id'],
-            'mal': meta['mal_id'],
-            'igdb': 0,
-            'anonymous': anon,
-            'stream': meta['stream'],
-            'sd': meta['sd'],
-            'keywords': meta['keywords'],
-            'personal_release': int(meta.get('personalrelease', False)),
-            'internal': 0,
-            'featured': 0,
-            'free': 0,
-            'doubleup': 0,
-            'sticky': 0,
-        }
-        # Internal
-        if self.config['TRACKERS'][self.tracker].get('internal', False) is True:
-            if meta['tag'] != "" and (meta['tag'][1:] in self.config['TRACKERS'][self.tracker].get('internal_groups', [])):
-                data['internal'] = 1
-
-        if region_id != 0:
-            data['region_id'] = region_id
-        if distributor_id != 0:
-            data['distributor_id'] = distributor_id
-        if meta.get('category') == "TV":
-            data['season_number'] = meta.get('season_int', '0')
-            data['episode_number'] = meta.get('episode_int', '0')
-        headers = {
-            'User-Agent': f'Upload Assistant/2.2 ({platform.system()} {platform.release()})'
-        }
-        params = {
-            'api_token': self.config['TRACKERS'][self.tracker]['api_key'].strip()
-        }
-
-        if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
-            try:
-                console.print(response.json())
-                # adding torrent link to comment of torrent file
-                t_id = response.json()['data'].split(".")[1].split("/")[3]
-                await common.add_tracker_torrent(meta, self.tracker, self.source_flag, self.config['TRACKERS'][self.tracker].get('announce_url'), "https://jptv.club/torrents/" + t_id)
-            except Exception:
-                console.print("It may have uploaded, go check")
-                return
-        else:
-            console.print("[cyan]Request Data:")
-            console.print(data)
-        open_torrent.close()
-
-    async def search_existing(self, meta, disctype):
-        dupes = []
-        console.print("[yellow]Searching for existing torrents on JPTV...")
-        params = {
-            'api_token': self.config['TRACKERS'][self.tracker]['api_key'].strip(),
-            'tmdb': meta['tmdb'],
-            'categories[]': await self.get_cat_id(meta),
-            'types[]': await self.get_type_id(meta['type']),
-            'resolutions[]': await self.get_res_id(meta['resolution']),
-            'name': ""
-        }
-        if meta['category'] == 'TV':
-            params['name'] = params['name'] + f" {meta.get('season', '')}"
-        if meta.get('edition', "") != "":
-            params['name'] = params['name'] + f" {meta['edition']}"
-        if meta['debug']:
-            console.log("[cyan]Dupe Search Parameters")
-            console.log(params)
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url=self.search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for each in data['data']:
-                        result = [each][0]['attributes']['name']
-                        dupes.append(result)
-                else:
-                    console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
-        except httpx.TimeoutException:
-            console.print("[bold red]Request timed out after 5 seconds")
-        except httpx.RequestError as e:
-            console.print(f"[bold red]Unable to search for existing torrents: {e}")
-        except Exception as e:
-            console.print(f"[bold red]Unexpected error: {e}")
-            await asyncio.sleep(5)
+            return mi_dump, None
+        return await super().get_mediainfo(meta)
 
-        return dupes
+    async def get_search_params(self, meta):
+        params = await super().get_search_params(meta)
+        params['tmdb'] = params.pop('tmdbId')
+        return params
 
     async def edit_name(self, meta):
         name = meta.get('name')
@@ -76,7 +76,7 @@ class MTV():
 
                     new_torrent.piece_size = 8 * 1024 * 1024
                     new_torrent.validate_piece_size()
-                    new_torrent.generate(callback=torf_cb, interval=5)
+                    await asyncio.to_thread(new_torrent.generate, callback=torf_cb, interval=5)
                     new_torrent.write(f"{meta['base_dir']}/tmp/{meta['uuid']}/MTV.torrent", overwrite=True)
 
                     torrent_filename = "MTV"
@@ -549,27 +549,25 @@ class MTV():
             params['q'] = meta['title'].replace(': ', ' ').replace('’', '').replace("'", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url=self.search_url, params=params)
-
-                if response.status_code == 200 and response.text:
-                    # Parse XML response
-                    try:
-                        response_xml = ET.fromstring(response.text)
-                        for each in response_xml.find('channel').findall('item'):
-                            result = each.find('title').text
-                            dupes.append(result)
-                    except ET.ParseError:
-                        console.print("[red]Failed to parse XML response from MTV API")
+            response = await COMMON.http.get(url=self.search_url, params=params, timeout=5.0)
+
+            if response.status_code == 200 and response.text:
+                # Parse XML response
+                try:
+                    response_xml = ET.fromstring(response.text)
+                    for each in response_xml.find('channel').findall('item'):
+                        result = each.find('title').text
+                        dupes.append(result)
+                except ET.ParseError:
+                    console.print("[red]Failed to parse XML response from MTV API")
+            else:
+                # Handle potential error messages
+                if response.status_code != 200:
+                    console.print(f"[red]HTTP request failed. Status: {response.status_code}")
+                elif 'status_message' in response.json():
+                    console.print(f"[yellow]{response.json().get('status_message')}")
                 else:
-                    # Handle potential error messages
-                    if response.status_code != 200:
-                        console.print(f"[red]HTTP request failed. Status: {response.status_code}")
-                    elif 'status_message' in response.json():
-                        console.print(f"[yellow]{response.json().get('status_message')}")
-                        await asyncio.sleep(5)
-                    else:
-                        console.print("[red]Site Seems to be down or not responding to API")
+                    console.print("[red]Site Seems to be down or not responding to API")
         except httpx.TimeoutException:
             console.print("[red]Request timed out after 5 seconds")
         except httpx.RequestError as e:
@@ -578,6 +576,5 @@ class MTV():
             console.print("[red]Unable to search for existing torrents on site. Most likely the site is down.")
             dupes.append("FAILED SEARCH")
             print(traceback.print_exc())
-            await asyncio.sleep(5)
 
         return dupes
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import json
-import requests
 import httpx
 
 from src.trackers.COMMON import COMMON
@@ -61,9 +60,9 @@ class NBL():
         }
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data)
+            response = await COMMON.http.post(url=self.upload_url, files=files, data=data, timeout=COMMON.http.upload_timeout)
             try:
-                if response.ok:
+                if response.is_success:
                     response = response.json()
                     console.print(response.get('message', response))
                 else:
@@ -109,20 +108,19 @@ class NBL():
         }
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(self.search_url, json=payload)
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        for each in data.get('result', {}).get('items', []):
-                            if meta['resolution'] in each.get('tags', []):
-                                dupes.append(each['rls_name'])
-                    except json.JSONDecodeError:
-                        console.print("[bold yellow]Response content is not valid JSON. Skipping this API call.")
-                        meta['skipping'] = "NBL"
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.post(self.search_url, json=payload, timeout=5.0)
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                    for each in data.get('result', {}).get('items', []):
+                        if meta['resolution'] in each.get('tags', []):
+                            dupes.append(each['rls_name'])
+                except json.JSONDecodeError:
+                    console.print("[bold yellow]Response content is not valid JSON. Skipping this API call.")
                     meta['skipping'] = "NBL"
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+                meta['skipping'] = "NBL"
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out after 5 seconds")
@@ -1,6 +1,6 @@
+import asyncio
 import cli_ui
 import requests
-import asyncio
 import re
 import os
 from pathlib import Path
@@ -15,6 +15,8 @@ from src.trackers.COMMON import COMMON
 from src.bbcode import BBCODE
 from src.exceptions import *  # noqa F403
 from src.console import console
+from src.metastore import meta_store
+from src.ratelimit import rate_limiter
 from torf import Torrent
 from datetime import datetime
 from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
@@ -98,8 +100,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await COMMON.http.get(url, params=params, headers=headers)
         console.print(f"[green]Searching PTP for: [bold yellow]{filename}[/bold yellow]")
 
         try:
@@ -168,8 +169,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await COMMON.http.get(url, params=params, headers=headers)
         try:
             if response.status_code == 200:
                 response = response.json()
@@ -202,8 +202,7 @@ class PTP():
         }
         url = 'https://passthepopcorn.me/torrents.php'
         console.print(f"[yellow]Requesting description from {url} with ID {ptp_torrent_id}")
-        response = requests.get(url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await COMMON.http.get(url, params=params, headers=headers)
 
         ptp_desc = response.text
         # console.print(f"[yellow]Raw description received:\n{ptp_desc[:6800]}...")  # Show first 500 characters for brevity
@@ -249,8 +248,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = 'https://passthepopcorn.me/torrents.php'
-        response = requests.get(url=url, headers=headers, params=params)
-        await asyncio.sleep(1)
+        response = await COMMON.http.get(url=url, headers=headers, params=params)
         try:
             response = response.json()
             if response.get("Page") == "Browse":  # No Releases on Site with ID
@@ -277,8 +275,7 @@ class PTP():
             'User-Agent': self.user_agent
         }
         url = "https://passthepopcorn.me/ajax.php"
-        response = requests.get(url=url, params=params, headers=headers)
-        await asyncio.sleep(1)
+        response = await COMMON.http.get(url=url, params=params, headers=headers)
         tinfo = {}
         try:
             response = response.json()
@@ -347,22 +344,20 @@ class PTP():
         url = 'https://passthepopcorn.me/torrents.php'
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url, headers=headers, params=params)
-                await asyncio.sleep(1)  # Mimic server-friendly delay
-                if response.status_code == 200:
-                    existing = []
-                    try:
-                        data = response.json()
-                        torrents = data.get('Torrents', [])
-                        for torrent in torrents:
-                            if torrent.get('Quality') == quality and quality is not None:
-                                existing.append(f"[{torrent.get('Resolution')}] {torrent.get('ReleaseName', 'RELEASE NAME NOT FOUND')}")
-                    except ValueError:
-                        console.print("[red]Failed to parse JSON response from API.")
-                    return existing
-                else:
-                    console.print(f"[bold red]HTTP request failed with status code {response.status_code}")
+            response = await COMMON.http.get(url, headers=headers, params=params, timeout=10.0)
+            if response.status_code == 200:
+                existing = []
+                try:
+                    data = response.json()
+                    torrents = data.get('Torrents', [])
+                    for torrent in torrents:
+                        if torrent.get('Quality') == quality and quality is not None:
+                            existing.append(f"[{torrent.get('Resolution')}] {torrent.get('ReleaseName', 'RELEASE NAME NOT FOUND')}")
+                except ValueError:
+                    console.print("[red]Failed to parse JSON response from API.")
+                return existing
+            else:
+                console.print(f"[bold red]HTTP request failed with status code {response.status_code}")
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while trying to find existing releases.")
         except httpx.RequestError as e:
@@ -382,8 +377,8 @@ class PTP():
         headers = {'referer': 'https://ptpimg.me/index.php'}
         url = "https://ptpimg.me/upload.php"
 
-        response = requests.post(url, headers=headers, data=payload)
         try:
+            response = await COMMON.http.post(url, headers=headers, data=payload)
             response = response.json()
             ptpimg_code = response[0]['code']
             ptpimg_ext = response[0]['ext']
@@ -734,9 +729,7 @@ class PTP():
                                     raw_url = img['raw_url']
                                     desc.write(f"[img]{raw_url}[/img]\n")
 
-                            meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                            with open(meta_filename, 'w') as f:
-                                json.dump(meta, f, indent=4)
+                            meta_store.save(meta)
 
             # Handle multiple discs case
             elif len(discs) > 1:
@@ -791,9 +784,7 @@ class PTP():
                                         desc.write(f"[img]{raw_url}[/img]\n")
                                     desc.write("\n")
 
-                                meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                                with open(meta_filename, 'w') as f:
-                                    json.dump(meta, f, indent=4)
+                                meta_store.save(meta)
 
                     elif each['type'] == "DVD":
                         if i == 0:
@@ -845,9 +836,7 @@ class PTP():
                                         desc.write(f"[img]{raw_url}[/img]\n")
                                     desc.write("\n")
 
-                            meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                            with open(meta_filename, 'w') as f:
-                                json.dump(meta, f, indent=4)
+                            meta_store.save(meta)
 
             # Handle single file case
             elif len(filelist) == 1:
@@ -912,9 +901,7 @@ class PTP():
                                     desc.write(f"[img]{raw_url}[/img]\n")
                                 desc.write("\n")
 
-                        meta_filename = f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json"
-                        with open(meta_filename, 'w') as f:
-                            json.dump(meta, f, indent=4)
+                        meta_store.save(meta)
 
     async def get_AntiCsrfToken(self, meta):
         if not os.path.exists(f"{meta['base_dir']}/data/cookies"):
@@ -925,6 +912,7 @@ class PTP():
             if os.path.exists(cookiefile):
                 with open(cookiefile, 'rb') as cf:
                     session.cookies.update(pickle.load(cf))
+                await rate_limiter.wait("passthepopcorn.me")
                 uploadresponse = session.get("https://passthepopcorn.me/upload.php")
                 loggedIn = await self.validate_login(uploadresponse)
             else:
@@ -940,15 +928,15 @@ class PTP():
                     "keeplogged": "1",
                 }
                 headers = {"User-Agent": self.user_agent}
+                await rate_limiter.wait("passthepopcorn.me")
                 loginresponse = session.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
-                await asyncio.sleep(2)
                 try:
                     resp = loginresponse.json()
                     if resp['Result'] == "TfaRequired":
                         data['TfaType'] = "normal"
                         data['TfaCode'] = cli_ui.ask_string("2FA Required: Please enter 2FA code")
+                        await rate_limiter.wait("passthepopcorn.me")
                         loginresponse = session.post("https://passthepopcorn.me/ajax.php?action=login", data=data, headers=headers)
-                        await asyncio.sleep(2)
                         resp = loginresponse.json()
                     try:
                         if resp["Result"] != "Ok":
@@ -1125,7 +1113,7 @@ class PTP():
 
             # Validate and write the new torrent
             new_torrent.validate_piece_size()
-            new_torrent.generate(callback=torf_cb, interval=5)
+            await asyncio.to_thread(new_torrent.generate, callback=torf_cb, interval=5)
             new_torrent.write(torrent_path, overwrite=True)
 
         # Proceed with the upload process
@@ -1146,6 +1134,7 @@ class PTP():
                     cookiefile = f"{meta['base_dir']}/data/cookies/PTP.pickle"
                     with open(cookiefile, 'rb') as cf:
                         session.cookies.update(pickle.load(cf))
+                    await rate_limiter.wait("passthepopcorn.me")
                     response = session.post(url=url, data=data, headers=headers, files=files)
                 console.print(f"[cyan]{response.url}")
                 responsetext = response.text
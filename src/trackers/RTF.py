@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
 import requests
 import base64
 import re
@@ -117,15 +116,14 @@ class RTF():
             params['search'] = meta['title'].replace(':', '').replace("'", '').replace(",", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(self.search_url, params=params, headers=headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    for each in data:
-                        result = each['name']
-                        dupes.append(result)
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.get(self.search_url, params=params, headers=headers, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                for each in data:
+                    result = each['name']
+                    dupes.append(result)
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while searching for existing torrents.")
@@ -134,7 +132,6 @@ class RTF():
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
             console.print_exception()
-            await asyncio.sleep(5)
 
         return dupes
 
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import requests
-import asyncio
 import httpx
 
 from src.trackers.COMMON import COMMON
@@ -165,16 +164,15 @@ class SN():
                 params['filter'] = meta['resolution']
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(self.search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for i in data.get('data', []):
-                        result = i.get('name')
-                        if result:
-                            dupes.append(result)
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.get(self.search_url, params=params, timeout=10.0)
+            if response.status_code == 200:
+                data = response.json()
+                for i in data.get('data', []):
+                    result = i.get('name')
+                    if result:
+                        dupes.append(result)
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while searching for existing torrents.")
@@ -183,6 +181,5 @@ class SN():
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
             console.print_exception()
-            await asyncio.sleep(5)
 
         return dupes
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
 from torf import Torrent
 import requests
 from src.console import console
@@ -147,15 +146,14 @@ class SPD():
             params['search'] = meta['title'].replace(':', '').replace("'", '').replace(",", '')
 
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url=self.search_url, params=params, headers=headers)
-                if response.status_code == 200:
-                    data = response.json()
-                    for each in data:
-                        result = [each][0]['name']
-                        dupes.append(result)
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.get(url=self.search_url, params=params, headers=headers, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                for each in data:
+                    result = [each][0]['name']
+                    dupes.append(result)
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while searching for existing torrents.")
@@ -164,6 +162,5 @@ class SPD():
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
             console.print_exception()
-            await asyncio.sleep(5)
 
         return dupes
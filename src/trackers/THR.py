@@ -9,6 +9,7 @@ import os
 import re
 import platform
 import httpx
+from src.trackers.COMMON import COMMON
 from bs4 import BeautifulSoup
 from unidecode import unidecode
 from src.console import console
@@ -264,18 +265,17 @@ class THR():
         console.print("[yellow]Searching for existing torrents on THR...")
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(search_url)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    for link in soup.find_all('a', href=True):
-                        if link['href'].startswith('details.php'):
-                            if link.get('onmousemove', False):
-                                dupe = link['onmousemove'].split("','/images")[0]
-                                dupe = dupe.replace("return overlibImage('", "")
-                                dupes.append(dupe)
-                else:
-                    console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
+            response = await COMMON.http.get(search_url, timeout=10.0)
+            if response.status_code == 200:
+                soup = BeautifulSoup(response.text, 'html.parser')
+                for link in soup.find_all('a', href=True):
+                    if link['href'].startswith('details.php'):
+                        if link.get('onmousemove', False):
+                            dupe = link['onmousemove'].split("','/images")[0]
+                            dupe = dupe.replace("return overlibImage('", "")
+                            dupes.append(dupe)
+            else:
+                console.print(f"[bold red]HTTP request failed. Status: {response.status_code}")
 
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out while searching for existing torrents.")
@@ -1,7 +1,5 @@
 # -*- coding: utf-8 -*-
 # import discord
-import asyncio
-import requests
 import traceback
 import cli_ui
 import os
@@ -10,6 +8,7 @@ import json
 import httpx
 from src.trackers.COMMON import COMMON
 from src.console import console
+from src.dupecache import dupe_cache
 
 
 class TVC():
@@ -207,7 +206,7 @@ class TVC():
             return
 
         if meta['debug'] is False:
-            response = requests.post(url=self.upload_url, files=files, data=data, headers=headers, params=params)
+            response = await COMMON.http.post(url=self.upload_url, files=files, data=data, headers=headers, params=params, timeout=COMMON.http.upload_timeout)
             try:
                 # some reason this does not return json instead it returns something like below.
                 # b'application/x-bittorrent\n{"success":true,"data":"https:\\/\\/tvchaosuk.com\\/torrent\\/download\\/164633.REDACTED","message":"Torrent uploaded successfully."}'
@@ -305,28 +304,30 @@ class TVC():
             'name': ""
         }
 
+        cached = dupe_cache.get(meta, self.tracker, params)
+        if cached is not None:
+            return cached
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(url=self.search_url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    # 404 catch when their api is down
-                    if data['data'] != '404':
-                        for each in data['data']:
-                            print(each[0]['attributes']['name'])
-                            result = each[0]['attributes']['name']
-                            dupes.append(result)
-                    else:
-                        console.print("Search API is down, please check manually")
+            response = await COMMON.http.get(url=self.search_url, params=params, timeout=5.0)
+            if response.status_code == 200:
+                data = response.json()
+                # 404 catch when their api is down
+                if data['data'] != '404':
+                    for each in data['data']:
+                        print(each[0]['attributes']['name'])
+                        result = each[0]['attributes']['name']
+                        dupes.append(result)
+                    dupe_cache.set(meta, self.tracker, params, dupes)
                 else:
-                    console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+                    console.print("Search API is down, please check manually")
+            else:
+                console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
         except httpx.TimeoutException:
             console.print("[bold red]Request timed out after 5 seconds")
         except httpx.RequestError as e:
             console.print(f"[bold red]Unable to search for existing torrents: {e}")
         except Exception as e:
             console.print(f"[bold red]Unexpected error: {e}")
-            await asyncio.sleep(5)
 
         return dupes
 
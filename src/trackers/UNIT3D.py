@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+import glob
+import os
+import platform
+import httpx
+from src.trackers.COMMON import COMMON
+from src.console import console
+from src.dupecache import dupe_cache
+
+
+class UNIT3D():
+    """
+    Upload and dupe search shared by all UNIT3D based trackers.
+
+    A site is a subclass that sets its data below (name, base_url, ID maps, banned groups)
+    and overrides a hook only where the site differs:
+        category_id / type_id / resolution_id    meta aware ID lookups
+        edit_name, edit_desc, get_description    what is sent as name and description
+        get_mediainfo                            mediainfo / bdinfo fields
+        get_additional_data                      extra upload fields
+        upload_allowed / search_allowed          site rules, checked before uploading / searching
+        get_search_params                        dupe search query
+    """
+    tracker = None
+    source_flag = None
+    base_url = None
+    signature = "\n[center][url=https://github.com/Audionut/Upload-Assistant]Created by Audionut's Upload Assistant[/url][/center]"
+    banned_groups = []
+
+    category_ids = {
+        'MOVIE': '1',
+        'TV': '2',
+    }
+    default_category_id = '0'
+    type_ids = {
+        'DISC': '1',
+        'REMUX': '2',
+        'WEBDL': '4',
+        'WEBRIP': '5',
+        'HDTV': '6',
+        'ENCODE': '3'
+    }
+    default_type_id = '0'
+    resolution_ids = {
+        '8640p': '10',
+        '4320p': '1',
+        '2160p': '2',
+        '1440p': '3',
+        '1080p': '3',
+        '1080i': '4',
+        '720p': '5',
+        '576p': '6',
+        '576i': '7',
+        '480p': '8',
+        '480i': '9'
+    }
+    default_resolution_id = '10'
+
+    # Passed on to COMMON.unit3d_edit_desc
+    comparison = False
+    # Attach the first .nfo found in the tmp folder
+    upload_nfo = True
+    search_timeout = 5.0
+
+    def __init__(self, config):
+        self.config = config
+        self.upload_url = f"{self.base_url}/api/torrents/upload"
+        self.search_url = f"{self.base_url}/api/torrents/filter"
+        # API endpoint for single torrents, used to look up ids from existing uploads
+        self.torrent_url = f"{self.base_url}/api/torrents/"
+
+    async def get_cat_id(self, category_name):
+        return self.category_ids.get(category_name, self.default_category_id)
+
+    async def get_type_id(self, type):
+        return self.type_ids.get(type, self.default_type_id)
+
+    async def get_res_id(self, resolution):
+        return self.resolution_ids.get(resolution, self.default_resolution_id)
+
+    async def category_id(self, meta):
+        return await self.get_cat_id(meta['category'])
+
+    async def type_id(self, meta):
+        return await self.get_type_id(meta['type'])
+
+    async def resolution_id(self, meta):
+        return await self.get_res_id(meta['resolution'])
+
+    async def edit_name(self, meta):
+        return meta['name']
+
+    async def edit_desc(self, meta, common):
+        await common.unit3d_edit_desc(meta, self.tracker, self.signature, comparison=self.comparison)
+
+    async def get_description(self, meta):
+        with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{self.tracker}]DESCRIPTION.txt", 'r', encoding='utf-8') as f:
+            return f.read()
+
+    async def get_mediainfo(self, meta):
+        if meta['bdinfo'] is not None:
+            with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/BD_SUMMARY_00.txt", 'r', encoding='utf-8') as f:
+                return None, f.read()
+        with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/MEDIAINFO.txt", 'r', encoding='utf-8') as f:
+            return f.read(), None
+
+    async def get_additional_data(self, meta):
+        return {}
+
+    async def get_flag(self, meta, flag_name):
+        config_flag = self.config['TRACKERS'][self.tracker].get(flag_name)
+        if config_flag is not None:
+            return 1 if config_flag else 0
+
+        return 1 if meta.get(flag_name, False) else 0
+
+    async def upload_allowed(self, meta):
+        return True
+
+    async def search_allowed(self, meta):
+        return True
+
+    async def get_data(self, meta, common):
+        region_id = await common.unit3d_region_ids(meta.get('region'))
+        distributor_id = await common.unit3d_distributor_ids(meta.get('distributor'))
+        if meta['anon'] == 0 and not self.config['TRACKERS'][self.tracker].get('anon', False):
+            anon = 0
+        else:
+            anon = 1
+        mi_dump, bd_dump = await self.get_mediainfo(meta)
+
+        data = {
+            'name': await self.edit_name(meta),
+            'description': await self.get_description(meta),
+            'mediainfo': mi_dump,
+            'bdinfo': bd_dump,
+            'category_id': await self.category_id(meta),
+            'type_id': await self.type_id(meta),
+            'resolution_id': await self.resolution_id(meta),
+            'tmdb': meta['tmdb'],
+            'imdb': meta['imdb_id'],
+            'tvdb': meta['tvdb_id'],
+            'mal': meta['mal_id'],
+            'igdb': 0,
+            'anonymous': anon,
+            'stream': meta['stream'],
+            'sd': meta['sd'],
+            'keywords': meta['keywords'],
+            'personal_release': int(meta.get('personalrelease', False)),
+            'internal': 0,
+            'featured': 0,
+            'free': 0,
+            'doubleup': 0,
+            'sticky': 0,
+        }
+        # Internal
+        if self.config['TRACKERS'][self.tracker].get('internal', False) is True:
+            if meta['tag'] != "" and (meta['tag'][1:] in self.config['TRACKERS'][self.tracker].get('internal_groups', [])):
+                data['internal'] = 1
+
+        if region_id != 0:
+            data['region_id'] = region_id
+        if distributor_id != 0:
+            data['distributor_id'] = distributor_id
+        if meta.get('category') == "TV":
+            data['season_number'] = meta.get('season_int', '0')
+            data['episode_number'] = meta.get('episode_int', '0')
+        data.update(await self.get_additional_data(meta))
+        return data
+
+    def open_files(self, meta):
+        files = {'torrent': open(f"{meta['base_dir']}/tmp/{meta['uuid']}/[{self.tracker}]{meta['clean_name']}.torrent", 'rb')}
+        if self.upload_nfo:
+            nfo_files = glob.glob(os.path.join(meta['base_dir'], "tmp", meta['uuid'], "*.nfo"))
+            if nfo_files:
+                files['nfo'] = ("nfo_file.nfo", open(nfo_files[0], 'rb'), "text/plain")
+        return files
+
+    async def upload(self, meta, disctype):
+        if not await self.upload_allowed(meta):
+            return
+        common = COMMON(config=self.config)
+        await common.edit_torrent(meta, self.tracker, self.source_flag)
+        await self.edit_desc(meta, common)
+        data = await self.get_data(meta, common)
+        headers = {
+            'User-Agent': f'Upload Assistant/2.2 ({platform.system()} {platform.release()})'
+        }
+        params = {
+            'api_token': self.config['TRACKERS'][self.tracker]['api_key'].strip()
+        }
+
+        if meta['debug'] is False:
+            files = self.open_files(meta)
+            try:
+                response = await COMMON.http.post(url=self.upload_url, files=files, data=data, headers=headers, params=params, timeout=COMMON.http.upload_timeout)
+                console.print(response.json())
+                # adding torrent link to comment of torrent file
+                t_id = response.json()['data'].split(".")[1].split("/")[3]
+                await common.add_tracker_torrent(meta, self.tracker, self.source_flag, self.config['TRACKERS'][self.tracker].get('announce_url'), f"{self.base_url}/torrents/{t_id}")
+            except Exception:
+                console.print("It may have uploaded, go check")
+            finally:
+                for file in files.values():
+                    (file[1] if isinstance(file, tuple) else file).close()
+        else:
+            console.print("[cyan]Request Data:")
+            console.print(data)
+
+    async def get_search_params(self, meta):
+        params = {
+            'api_token': self.config['TRACKERS'][self.tracker]['api_key'].strip(),
+            'tmdbId': meta['tmdb'],
+            'categories[]': await self.category_id(meta),
+            'types[]': await self.type_id(meta),
+            'resolutions[]': await self.resolution_id(meta),
+            'name': ""
+        }
+        if meta['category'] == 'TV':
+            params['name'] = params['name'] + f" {meta.get('season', '')}"
+        if meta.get('edition', "") != "":
+            params['name'] = params['name'] + f" {meta['edition']}"
+        return params
+
+    async def search_existing(self, meta, disctype):
+        dupes = []
+        if not await self.search_allowed(meta):
+            return dupes
+        console.print(f"[yellow]Searching for existing torrents on {self.tracker}...")
+        params = await self.get_search_params(meta)
+        if meta['debug']:
+            console.log("[cyan]Dupe Search Parameters")
+            console.log({key: value for key, value in params.items() if key != 'api_token'})
+        cached = dupe_cache.get(meta, self.tracker, params)
+        if cached is not None:
+            return cached
+        try:
+            response = await COMMON.http.get(url=self.search_url, params=params, timeout=self.search_timeout)
+            if response.status_code == 200:
+                data = response.json()
+                for each in data['data']:
+                    result = [each][0]['attributes']['name']
+                    dupes.append(result)
+                dupe_cache.set(meta, self.tracker, params, dupes)
+            else:
+                console.print(f"[bold red]Failed to search torrents. HTTP Status: {response.status_code}")
+        except httpx.TimeoutException:
+            console.print(f"[bold red]Request timed out after {self.search_timeout:g} seconds")
+        except httpx.RequestError as e:
+            console.print(f"[bold red]Unable to search for existing torrents: {e}")
+        except Exception as e:
+            console.print(f"[bold red]Unexpected error: {e}")
+
+        return dupes
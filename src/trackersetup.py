@@ -1,54 +1,46 @@
-from src.trackers.AR import AR
-from src.trackers.HUNO import HUNO
-from src.trackers.BLU import BLU
-from src.trackers.BHD import BHD
-from src.trackers.AITHER import AITHER
-from src.trackers.STC import STC
-from src.trackers.R4E import R4E
-from src.trackers.THR import THR
-from src.trackers.PTP import PTP
-from src.trackers.SN import SN
-from src.trackers.ACM import ACM
-from src.trackers.HDB import HDB
-from src.trackers.LCD import LCD
-from src.trackers.TTG import TTG
-from src.trackers.LST import LST
-from src.trackers.FRIKI import FRIKI
-from src.trackers.FL import FL
-from src.trackers.LT import LT
-from src.trackers.NBL import NBL
-from src.trackers.ANT import ANT
-from src.trackers.PTER import PTER
-from src.trackers.MTV import MTV
-from src.trackers.JPTV import JPTV
-from src.trackers.TL import TL
-from src.trackers.HDT import HDT
-from src.trackers.RF import RF
-from src.trackers.OE import OE
-from src.trackers.BHDTV import BHDTV
-from src.trackers.RTF import RTF
-from src.trackers.OTW import OTW
-from src.trackers.FNP import FNP
-from src.trackers.CBR import CBR
-from src.trackers.UTP import UTP
-from src.trackers.AL import AL
-from src.trackers.SHRI import SHRI
-from src.trackers.ITT import ITT
-from src.trackers.TIK import TIK
-from src.trackers.TVC import TVC
-from src.trackers.PSS import PSS
-from src.trackers.ULCX import ULCX
-from src.trackers.SPD import SPD
-from src.trackers.YOINK import YOINK
-from src.trackers.HHD import HHD
-from src.trackers.SP import SP
 from src.console import console
+from src.httpclients import http_clients
 import httpx
+import importlib
 import os
 import json
 import cli_ui
 from datetime import datetime, timedelta
 import asyncio
+from collections.abc import Mapping
+
+
+class ListIndex:
+    """
+    Banned group and claim files from data/banned, parsed once per process and shared by
+    every tracker and queue item. A file is parsed again only after it changed on disk.
+    """
+    def __init__(self):
+        self._entries = {}
+
+    def load(self, file_path):
+        """Blocking, the parsed file with its lookup tables or None if there is no file."""
+        try:
+            mtime = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        entry = self._entries.get(file_path)
+        if entry is None or entry['mtime'] != mtime:
+            with open(file_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            entry = {'mtime': mtime, 'data': data}
+            # Lowercased group name -> None, kept as a dict to match the note form of the tracker lists
+            banned_groups = data.get("banned_groups", "")
+            entry['banned'] = {name.lower(): None for name in banned_groups.split(", ")} if banned_groups else {}
+            claims = {}
+            for item in data.get('extracted_data', []):
+                claims.setdefault(item.get('tmdb_id'), []).append(item)
+            entry['claims'] = claims
+            self._entries[file_path] = entry
+        return entry
+
+
+list_index = ListIndex()
 
 
 class TRACKER_SETUP:
@@ -98,61 +90,76 @@ class TRACKER_SETUP:
 
         all_data = []
         next_cursor = None
+        try:
+            previous = await asyncio.to_thread(list_index.load, file_path)
+        except ValueError:
+            previous = None
+        validators = {}
 
-        async with httpx.AsyncClient() as client:
-            while True:
-                try:
-                    # Add query parameters for pagination
-                    params = {'cursor': next_cursor, 'per_page': 100} if next_cursor else {'per_page': 100}
-                    response = await client.get(url, headers=headers, params=params)
-
-                    if response.status_code == 200:
-                        response_json = response.json()
-
-                        if isinstance(response_json, list):
-                            # Directly add the list if it's the entire response
-                            all_data.extend(response_json)
-                            break  # No pagination in this case
-                        elif isinstance(response_json, dict):
-                            page_data = response_json.get('data', [])
-                            if not isinstance(page_data, list):
-                                console.print(f"[red]Unexpected 'data' format: {type(page_data)}[/red]")
-                                return None
-
-                            all_data.extend(page_data)
-                            meta_info = response_json.get('meta', {})
-                            if not isinstance(meta_info, dict):
-                                console.print(f"[red]Unexpected 'meta' format: {type(meta_info)}[/red]")
-                                return None
-
-                            # Check if there is a next page
-                            next_cursor = meta_info.get('next_cursor')
-                            if not next_cursor:
-                                break  # Exit loop if there are no more pages
-                        else:
-                            console.print(f"[red]Unexpected response format: {type(response_json)}[/red]")
+        client = http_clients.client(url)
+        while True:
+            try:
+                # Add query parameters for pagination
+                params = {'cursor': next_cursor, 'per_page': 100} if next_cursor else {'per_page': 100}
+                request_headers = headers if next_cursor else self.conditional_headers(headers, previous)
+                response = await client.get(url, headers=request_headers, params=params)
+
+                if response.status_code == 304:
+                    # Unchanged since the last download
+                    await self.mark_fresh(file_path, previous['data'])
+                    if meta['debug']:
+                        console.print(f"{os.path.basename(file_path)} is unchanged on {tracker}")
+                    return file_path
+                if not next_cursor:
+                    validators = self.response_validators(response)
+
+                if response.status_code == 200:
+                    response_json = response.json()
+
+                    if isinstance(response_json, list):
+                        # Directly add the list if it's the entire response
+                        all_data.extend(response_json)
+                        break  # No pagination in this case
+                    elif isinstance(response_json, dict):
+                        page_data = response_json.get('data', [])
+                        if not isinstance(page_data, list):
+                            console.print(f"[red]Unexpected 'data' format: {type(page_data)}[/red]")
                             return None
-                    elif response.status_code == 404:
-                        console.print(f"Error: Tracker '{tracker}' returned 404 for the banned groups API.")
-                        return None
+
+                        all_data.extend(page_data)
+                        meta_info = response_json.get('meta', {})
+                        if not isinstance(meta_info, dict):
+                            console.print(f"[red]Unexpected 'meta' format: {type(meta_info)}[/red]")
+                            return None
+
+                        # Check if there is a next page
+                        next_cursor = meta_info.get('next_cursor')
+                        if not next_cursor:
+                            break  # Exit loop if there are no more pages
                     else:
-                        console.print(f"Error: Received status code {response.status_code} for tracker '{tracker}'.")
+                        console.print(f"[red]Unexpected response format: {type(response_json)}[/red]")
                         return None
-
-                except httpx.RequestError as e:
-                    console.print(f"[red]HTTP Request failed for tracker '{tracker}': {e}[/red]")
+                elif response.status_code == 404:
+                    console.print(f"Error: Tracker '{tracker}' returned 404 for the banned groups API.")
                     return None
-                except Exception as e:
-                    console.print(f"[red]An unexpected error occurred: {e}[/red]")
+                else:
+                    console.print(f"Error: Received status code {response.status_code} for tracker '{tracker}'.")
                     return None
 
+            except httpx.RequestError as e:
+                console.print(f"[red]HTTP Request failed for tracker '{tracker}': {e}[/red]")
+                return None
+            except Exception as e:
+                console.print(f"[red]An unexpected error occurred: {e}[/red]")
+                return None
+
         if meta['debug']:
             console.print("Total banned groups retrieved:", len(all_data))
-        await self.write_banned_groups_to_file(file_path, all_data)
+        await self.write_banned_groups_to_file(file_path, all_data, validators)
 
         return file_path
 
-    async def write_banned_groups_to_file(self, file_path, json_data):
+    async def write_banned_groups_to_file(self, file_path, json_data, validators=None):
         try:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
@@ -166,7 +173,8 @@ class TRACKER_SETUP:
             file_content = {
                 "last_updated": datetime.now().strftime("%Y-%m-%d"),
                 "banned_groups": names_csv,
-                "raw_data": json_data
+                "raw_data": json_data,
+                **(validators or {})
             }
 
             await asyncio.to_thread(self._write_file, file_path, file_content)
@@ -180,28 +188,46 @@ class TRACKER_SETUP:
         with open(file_path, "w", encoding="utf-8") as file:
             json.dump(data, file, indent=4)
 
+    def conditional_headers(self, headers, previous):
+        """Ask for the list only if it changed, when the last download came with ETag/Last-Modified."""
+        if not previous:
+            return headers
+        headers = dict(headers)
+        if previous['data'].get('etag'):
+            headers['If-None-Match'] = previous['data']['etag']
+        if previous['data'].get('last_modified'):
+            headers['If-Modified-Since'] = previous['data']['last_modified']
+        return headers
+
+    def response_validators(self, response):
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['etag'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['last_modified'] = response.headers['Last-Modified']
+        return validators
+
+    async def mark_fresh(self, file_path, data):
+        data = dict(data, last_updated=datetime.now().strftime("%Y-%m-%d"))
+        await asyncio.to_thread(self._write_file, file_path, data)
+
     async def should_update(self, file_path):
         try:
-            content = await asyncio.to_thread(self._read_file, file_path)
-            data = json.loads(content)
-            last_updated = datetime.strptime(data['last_updated'], "%Y-%m-%d")
+            entry = await asyncio.to_thread(list_index.load, file_path)
+            if entry is None:
+                return True
+            last_updated = datetime.strptime(entry['data']['last_updated'], "%Y-%m-%d")
             return datetime.now() >= last_updated + timedelta(days=2)
-        except FileNotFoundError:
-            return True
         except Exception as e:
             console.print(f"Error reading file: {e}")
             return True
 
-    def _read_file(self, file_path):
-        """ Helper function to read the file in a blocking thread """
-        with open(file_path, "r", encoding="utf-8") as file:
-            return file.read()
-
     async def check_banned_group(self, tracker, banned_group_list, meta):
         result = False
         if not meta['tag']:
             return False
 
+        banned_groups = None
         if tracker.upper() in ("AITHER", "LST"):
             file_path = await self.get_banned_groups(meta, tracker)
             if not file_path:
@@ -210,31 +236,31 @@ class TRACKER_SETUP:
 
             # Load the banned groups from the file
             try:
-                content = await asyncio.to_thread(self._read_file, file_path)
-                data = json.loads(content)
-                banned_groups = data.get("banned_groups", "")
-                if banned_groups:
-                    banned_group_list = banned_groups.split(", ")
-
-            except FileNotFoundError:
-                console.print(f"[bold red]Banned group file for '{tracker}' not found.")
-                return False
+                entry = await asyncio.to_thread(list_index.load, file_path)
+                if entry is None:
+                    console.print(f"[bold red]Banned group file for '{tracker}' not found.")
+                    return False
+                if entry['banned']:
+                    banned_groups = entry['banned']
             except json.JSONDecodeError:
                 console.print(f"[bold red]Failed to parse banned group file for '{tracker}'.")
                 return False
 
-        for tag in banned_group_list:
-            if isinstance(tag, list):
-                if meta['tag'][1:].lower() == tag[0].lower():
-                    console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
-                    console.print(f"[bold red]NOTE: [bold yellow]{tag[1]}")
-                    await asyncio.sleep(5)
-                    result = True
-            else:
-                if meta['tag'][1:].lower() == tag.lower():
-                    console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
-                    await asyncio.sleep(5)
-                    result = True
+        if banned_groups is None:
+            # Lowercased name -> note, tracker lists hold names or [name, note] pairs
+            banned_groups = {}
+            for tag in banned_group_list:
+                if isinstance(tag, list):
+                    banned_groups[tag[0].lower()] = tag[1]
+                else:
+                    banned_groups.setdefault(tag.lower(), None)
+
+        group = meta['tag'][1:].lower()
+        if group in banned_groups:
+            console.print(f"[bold yellow]{meta['tag'][1:]}[/bold yellow][bold red] was found on [bold yellow]{tracker}'s[/bold yellow] list of banned groups.")
+            if banned_groups[group]:
+                console.print(f"[bold red]NOTE: [bold yellow]{banned_groups[group]}")
+            result = True
 
         if result:
             if not meta['unattended'] or meta.get('unattended-confirm', False):
@@ -246,7 +272,7 @@ class TRACKER_SETUP:
 
         return False
 
-    async def write_internal_claims_to_file(self, file_path, data):
+    async def write_internal_claims_to_file(self, file_path, data, validators=None):
         try:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
@@ -279,7 +305,8 @@ class TRACKER_SETUP:
                 "last_updated": datetime.now().strftime("%Y-%m-%d"),
                 "titles_csv": titles_csv,
                 "extracted_data": extracted_data,
-                "raw_data": data
+                "raw_data": data,
+                **(validators or {})
             }
 
             await asyncio.to_thread(self._write_file, file_path, file_content)
@@ -304,45 +331,60 @@ class TRACKER_SETUP:
 
         all_data = []
         next_cursor = None
+        try:
+            previous = await asyncio.to_thread(list_index.load, file_path)
+        except ValueError:
+            previous = None
+        validators = {}
 
-        async with httpx.AsyncClient() as client:
-            while True:
-                try:
-                    # Add query parameters for pagination
-                    params = {'cursor': next_cursor, 'per_page': 100} if next_cursor else {'per_page': 100}
-                    response = await client.get(url, headers=headers, params=params)
-
-                    if response.status_code == 200:
-                        response_json = response.json()
-                        page_data = response_json.get('data', [])
-                        if not isinstance(page_data, list):
-                            console.print(f"[red]Unexpected 'data' format: {type(page_data)}[/red]")
-                            return False
-
-                        all_data.extend(page_data)
-                        meta_info = response_json.get('meta', {})
-                        if not isinstance(meta_info, dict):
-                            console.print(f"[red]Unexpected 'meta' format: {type(meta_info)}[/red]")
-                            return False
+        client = http_clients.client(url)
+        while True:
+            try:
+                # Add query parameters for pagination
+                params = {'cursor': next_cursor, 'per_page': 100} if next_cursor else {'per_page': 100}
+                request_headers = headers if next_cursor else self.conditional_headers(headers, previous)
+                response = await client.get(url, headers=request_headers, params=params)
+
+                if response.status_code == 304:
+                    # Unchanged since the last download
+                    await self.mark_fresh(file_path, previous['data'])
+                    if meta['debug']:
+                        console.print(f"{os.path.basename(file_path)} is unchanged on {tracker}")
+                    return await self.check_tracker_claims(meta, tracker)
+                if not next_cursor:
+                    validators = self.response_validators(response)
+
+                if response.status_code == 200:
+                    response_json = response.json()
+                    page_data = response_json.get('data', [])
+                    if not isinstance(page_data, list):
+                        console.print(f"[red]Unexpected 'data' format: {type(page_data)}[/red]")
+                        return False
 
-                        # Check if there is a next page
-                        next_cursor = meta_info.get('next_cursor')
-                        if not next_cursor:
-                            break  # Exit loop if there are no more pages
-                    else:
-                        console.print(f"[red]Error: Received status code {response.status_code}[/red]")
+                    all_data.extend(page_data)
+                    meta_info = response_json.get('meta', {})
+                    if not isinstance(meta_info, dict):
+                        console.print(f"[red]Unexpected 'meta' format: {type(meta_info)}[/red]")
                         return False
 
-                except httpx.RequestError as e:
-                    console.print(f"[red]HTTP Request failed: {e}[/red]")
-                    return False
-                except Exception as e:
-                    console.print(f"[red]An unexpected error occurred: {e}[/red]")
+                    # Check if there is a next page
+                    next_cursor = meta_info.get('next_cursor')
+                    if not next_cursor:
+                        break  # Exit loop if there are no more pages
+                else:
+                    console.print(f"[red]Error: Received status code {response.status_code}[/red]")
                     return False
 
+            except httpx.RequestError as e:
+                console.print(f"[red]HTTP Request failed: {e}[/red]")
+                return False
+            except Exception as e:
+                console.print(f"[red]An unexpected error occurred: {e}[/red]")
+                return False
+
         if meta['debug']:
             console.print("Total claims retrieved:", len(all_data))
-        await self.write_internal_claims_to_file(file_path, all_data)
+        await self.write_internal_claims_to_file(file_path, all_data, validators)
 
         return await self.check_tracker_claims(meta, tracker)
 
@@ -396,14 +438,12 @@ class TRACKER_SETUP:
                 if metaseason:
                     seasonint = int(metaseason)
                 file_path = os.path.join(meta['base_dir'], 'data', 'banned', f'{tracker_name}_claimed_releases.json')
-                if not os.path.exists(file_path):
+                entry = await asyncio.to_thread(list_index.load, file_path)
+                if entry is None:
                     console.print(f"[red]No claim data file found for {tracker_name}[/red]")
                     return False
 
-                with open(file_path, 'r') as file:
-                    extracted_data = json.load(file).get('extracted_data', [])
-
-                for item in extracted_data:
+                for item in [claim for id in tmdb_id for claim in entry['claims'].get(id, [])]:
                     title = item.get('title')
                     season = item.get('season')
                     api_tmdb_id = item.get('tmdb_id')
@@ -433,13 +473,45 @@ class TRACKER_SETUP:
         return match_found
 
 
-tracker_class_map = {
-    'ACM': ACM, 'AITHER': AITHER, 'AL': AL, 'ANT': ANT, 'AR': AR, 'BHD': BHD, 'BHDTV': BHDTV, 'BLU': BLU, 'CBR': CBR,
-    'FNP': FNP, 'FL': FL, 'FRIKI': FRIKI, 'HDB': HDB, 'HDT': HDT, 'HHD': HHD, 'HUNO': HUNO, 'ITT': ITT, 'JPTV': JPTV, 'LCD': LCD,
-    'LST': LST, 'LT': LT, 'MTV': MTV, 'NBL': NBL, 'OE': OE, 'OTW': OTW, 'PSS': PSS, 'PTP': PTP, 'PTER': PTER,
-    'R4E': R4E, 'RF': RF, 'RTF': RTF, 'SHRI': SHRI, 'SN': SN, 'SP': SP, 'SPD': SPD, 'STC': STC, 'THR': THR,
-    'TIK': TIK, 'TL': TL, 'TVC': TVC, 'TTG': TTG, 'ULCX': ULCX, 'UTP': UTP, 'YOINK': YOINK,
-}
+class TrackerClassMap(Mapping):
+    """
+    Tracker name -> tracker class, importing src.trackers.<NAME> the first time
+    a tracker is looked up so a run only pays for the trackers it uses.
+    """
+    def __init__(self, names):
+        self._names = frozenset(names)
+        self._classes = {}
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        tracker_class = self._classes.get(name)
+        if tracker_class is None:
+            module = importlib.import_module(f"src.trackers.{name}")
+            tracker_class = self._classes[name] = getattr(module, name)
+        return tracker_class
+
+    def __contains__(self, name):
+        # Membership checks must not import the module
+        return name in self._names
+
+    def __iter__(self):
+        return iter(sorted(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    def loaded(self):
+        return sorted(self._classes)
+
+
+tracker_class_map = TrackerClassMap([
+    'ACM', 'AITHER', 'AL', 'ANT', 'AR', 'BHD', 'BHDTV', 'BLU', 'CBR',
+    'FNP', 'FL', 'FRIKI', 'HDB', 'HDT', 'HHD', 'HUNO', 'ITT', 'JPTV', 'LCD',
+    'LST', 'LT', 'MTV', 'NBL', 'OE', 'OTW', 'PSS', 'PTP', 'PTER',
+    'R4E', 'RF', 'RTF', 'SHRI', 'SN', 'SP', 'SPD', 'STC', 'THR',
+    'TIK', 'TL', 'TVC', 'TTG', 'ULCX', 'UTP', 'YOINK',
+])
 
 api_trackers = {
     'ACM', 'AITHER', 'AL', 'BHD', 'BLU', 'CBR', 'FNP', 'FRIKI', 'HHD', 'HUNO', 'ITT', 'JPTV', 'LCD', 'LST', 'LT',
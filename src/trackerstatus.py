@@ -2,17 +2,18 @@ import asyncio
 import os
 import sys
 from torf import Torrent
-from src.trackers.PTP import PTP
 from src.trackersetup import TRACKER_SETUP, tracker_class_map, http_trackers
-from src.console import console
+from src.console import console, output_buffer
+from src.dupecache import dupe_cache
+from src.ratelimit import rate_limiter
 from data.config import config
 from src.trackers.COMMON import COMMON
 from src.clients import Clients
 from src.uphelper import UploadHelper
 from src.imdb import get_imdb_info_api
 from src.torrentcreate import create_base_from_existing_torrent
+from src.metaoverlay import MetaOverlay
 import cli_ui
-import copy
 
 
 def reset_terminal():
@@ -34,13 +35,56 @@ async def process_all_trackers(meta):
     helper = UploadHelper()
     meta_lock = asyncio.Lock()  # noqa F841
 
-    async def process_single_tracker(tracker_name, shared_meta):
+    async def prefetch_tracker(tracker_name, shared_meta):
+        """
+        Run the network side of a tracker's checks (banned groups, claims, group lookup and
+        dupe search) without prompting, so attended runs can do it for all trackers at once.
+        Output is held back and shown when the tracker is processed.
+        """
+        prefetched = {'output': []}
+        output_buffer.set(prefetched['output'])
+        tracker_name = tracker_name.replace(" ", "").upper().strip()
+        if tracker_name not in tracker_class_map:
+            return tracker_name, prefetched
+        local_meta = MetaOverlay(shared_meta)
+        disctype = local_meta.get('disctype', None)
+        if local_meta['name'].endswith('DUPE?'):
+            local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
+        try:
+            tracker_class = tracker_class_map[tracker_name](config=config)
+            if tracker_name in {"AITHER", "LST"} and local_meta['tag']:
+                # Refreshes the stored list, check_banned_group then reads it from disk
+                await tracker_setup.get_banned_groups(local_meta, tracker_name)
+            if tracker_name == "AITHER":
+                prefetched['claimed'] = await tracker_setup.get_torrent_claims(local_meta, tracker_name)
+
+            if tracker_name == "PTP":
+                if local_meta.get('imdb_id', 0) != 0:
+                    ptp = tracker_class_map["PTP"](config=config)
+                    prefetched['imdb_id'] = local_meta['imdb_id']
+                    prefetched['groupID'] = await ptp.get_group_by_imdb(local_meta['imdb_id'])
+                    prefetched['dupes'] = await ptp.search_existing(prefetched['groupID'], local_meta, disctype)
+            elif tracker_name not in {"THR", "TL"} and tracker_name not in http_trackers:
+                # http trackers log in during validate_credentials, which may prompt
+                prefetched['dupes'] = await tracker_class.search_existing(local_meta, disctype)
+            if 'dupes' in prefetched:
+                prefetched['skipping'] = local_meta.get('skipping')
+        except Exception as e:
+            console.print(f"[yellow]Prefetching checks for {tracker_name} failed, retrying when it is processed: {e}")
+            for key in ('claimed', 'groupID', 'dupes'):
+                prefetched.pop(key, None)
+        return tracker_name, prefetched
+
+    async def process_single_tracker(tracker_name, shared_meta, prefetched=None):
         nonlocal successful_trackers
-        local_meta = copy.deepcopy(shared_meta)  # Ensure each task gets its own copy of meta
+        prefetched = prefetched or {}
+        local_meta = MetaOverlay(shared_meta)  # Each task gets its own view of meta, only what it touches is copied
         local_tracker_status = {'banned': False, 'skipped': False, 'dupe': False, 'upload': False}
         disctype = local_meta.get('disctype', None)
         tracker_name = tracker_name.replace(" ", "").upper().strip()
         console.print(f"\n[bold yellow]Processing Tracker: {tracker_name}[/bold yellow]")
+        if prefetched.get('output'):
+            console.print_buffer(prefetched['output'])
 
         if local_meta['name'].endswith('DUPE?'):
             local_meta['name'] = local_meta['name'].replace(' DUPE?', '')
@@ -70,9 +114,13 @@ async def process_all_trackers(meta):
                             meta['imdb_id'] = 0
 
             if tracker_name == "PTP":
-                console.print("[yellow]Searching for Group ID on PTP")
-                ptp = PTP(config=config)
-                groupID = await ptp.get_group_by_imdb(local_meta['imdb_id'])
+                ptp = tracker_class_map["PTP"](config=config)
+                if 'groupID' in prefetched and prefetched.get('imdb_id') == local_meta['imdb_id']:
+                    groupID = prefetched['groupID']
+                else:
+                    prefetched.pop('dupes', None)
+                    console.print("[yellow]Searching for Group ID on PTP")
+                    groupID = await ptp.get_group_by_imdb(local_meta['imdb_id'])
                 if groupID is None:
                     console.print("[yellow]No Existing Group found")
                     if local_meta.get('youtube', None) is None or "youtube" not in str(local_meta.get('youtube', '')):
@@ -88,12 +136,20 @@ async def process_all_trackers(meta):
 
             if not local_tracker_status['banned']:
                 if tracker_name == "AITHER":
-                    if await tracker_setup.get_torrent_claims(local_meta, tracker_name):
+                    if 'claimed' in prefetched:
+                        claimed = prefetched['claimed']
+                    else:
+                        claimed = await tracker_setup.get_torrent_claims(local_meta, tracker_name)
+                    if claimed:
                         local_tracker_status['skipped'] = True
                     else:
                         local_tracker_status['skipped'] = False
 
-                if tracker_name not in {"THR", "PTP", "TL"}:
+                if 'dupes' in prefetched:
+                    dupes = prefetched['dupes']
+                    if prefetched.get('skipping') is not None:
+                        local_meta['skipping'] = prefetched['skipping']
+                elif tracker_name not in {"THR", "PTP", "TL"}:
                     dupes = await tracker_class.search_existing(local_meta, disctype)
                 elif tracker_name == "PTP":
                     dupes = await ptp.search_existing(groupID, local_meta, disctype)
@@ -161,8 +217,11 @@ async def process_all_trackers(meta):
         for tracker_name, status in results:
             tracker_status[tracker_name] = status
     else:
-        for tracker_name in meta['trackers']:
-            tracker_name, status = await process_single_tracker(tracker_name, meta)
+        # Fetch everything up front in parallel, only the prompts below need to run one tracker at a time
+        prefetch_tasks = [prefetch_tracker(tracker_name, meta) for tracker_name in meta['trackers']]
+        prefetched = await asyncio.gather(*prefetch_tasks)
+        for tracker_name, tracker_prefetch in prefetched:
+            tracker_name, status = await process_single_tracker(tracker_name, meta, tracker_prefetch)
             tracker_status[tracker_name] = status
             if not sys.stdin.closed:
                 reset_terminal()
@@ -176,6 +235,8 @@ async def process_all_trackers(meta):
             upload_status = 'Yes' if status['upload'] else 'No'
             console.print(f"Tracker: {t_name} | Banned: {banned_status} | Skipped: {skipped_status} | Dupe: {dupe_status} | [yellow]Upload:[/yellow] {upload_status}")
         console.print(f"\n[bold]Trackers Passed all Checks:[/bold] {successful_trackers}")
+        console.print(dupe_cache.stats())
+        console.print(rate_limiter.stats())
 
     meta['tracker_status'] = tracker_status
     return successful_trackers
@@ -1,5 +1,6 @@
 from src.console import console
-import requests
+from src.httpclients import http_clients
+from src.metacache import meta_cache
 import json
 
 
@@ -102,11 +103,15 @@ async def search_tvmaze(filename, year, imdbID, tvdbID, meta):
 
 
 async def _make_tvmaze_request(url, params, meta):
+    return await meta_cache.fetch('tvmaze', url, params, lambda: _tvmaze_get(url, params, meta))
+
+
+async def _tvmaze_get(url, params, meta):
     if meta['debug']:
         print(f"Requesting TVmaze API: {url} with params: {params}")
     try:
-        resp = requests.get(url, params=params)
-        if resp.ok:
+        resp = await http_clients.get(url, params=params)
+        if resp.is_success:
             return resp.json()
         else:
             if meta['debug']:
@@ -21,14 +21,20 @@ from src.trackersetup import tracker_class_map, api_trackers, other_api_trackers
 from src.trackerhandle import process_trackers
 from src.queuemanage import handle_queue
 from src.console import console
-from src.torrentcreate import create_torrent, create_random_torrents, create_base_from_existing_torrent
+from src.torrentcreate import create_torrent, create_random_torrents, create_base_from_existing_torrent, HashJob
+from src.exceptions import HashingCancelled
 from src.uphelper import UploadHelper
 from src.trackerstatus import process_all_trackers
-from src.takescreens import disc_screenshots, dvd_screenshots, screenshots
+from src.takescreens import disc_screenshots, dvd_screenshots, screenshots, shutdown_optimize_pool
+from src.httpclients import http_clients
+from src.blocking import shutdown_blocking_pool, stall_detector
+from src.metacache import meta_cache
+from src.metastore import meta_store
 
 
 cli_ui.setup(color='always', title="Audionut's Upload Assistant")
 running_subprocesses = set()
+background_hash_jobs = set()
 base_dir = os.path.abspath(os.path.dirname(__file__))
 
 try:
@@ -49,28 +55,25 @@ parser = Args(config)
 
 async def merge_meta(meta, saved_meta, path):
     """Merges saved metadata with the current meta, respecting overwrite rules."""
-    with open(f"{base_dir}/tmp/{os.path.basename(path)}/meta.json") as f:
-        saved_meta = json.load(f)
-        overwrite_list = [
-            'trackers', 'dupe', 'debug', 'anon', 'category', 'type', 'screens', 'nohash', 'manual_edition', 'imdb', 'tmdb_manual', 'mal', 'manual',
-            'hdb', 'ptp', 'blu', 'no_season', 'no_aka', 'no_year', 'no_dub', 'no_tag', 'no_seed', 'client', 'desclink', 'descfile', 'desc', 'draft',
-            'modq', 'region', 'freeleech', 'personalrelease', 'unattended', 'manual_season', 'manual_episode', 'torrent_creation', 'qbit_tag', 'qbit_cat',
-            'skip_imghost_upload', 'imghost', 'manual_source', 'webdv', 'hardcoded-subs', 'dual_audio', 'manual_type', 'tvmaze_manual'
-        ]
-        sanitized_saved_meta = {}
-        for key, value in saved_meta.items():
-            clean_key = key.strip().strip("'").strip('"')
-            if clean_key in overwrite_list:
-                if clean_key in meta and meta.get(clean_key) is not None:
-                    sanitized_saved_meta[clean_key] = meta[clean_key]
-                    if meta['debug']:
-                        console.print(f"Overriding {clean_key} with meta value:", meta[clean_key])
-                else:
-                    sanitized_saved_meta[clean_key] = value
+    overwrite_list = [
+        'trackers', 'dupe', 'debug', 'anon', 'category', 'type', 'screens', 'nohash', 'manual_edition', 'imdb', 'tmdb_manual', 'mal', 'manual',
+        'hdb', 'ptp', 'blu', 'no_season', 'no_aka', 'no_year', 'no_dub', 'no_tag', 'no_seed', 'client', 'desclink', 'descfile', 'desc', 'draft',
+        'modq', 'region', 'freeleech', 'personalrelease', 'unattended', 'manual_season', 'manual_episode', 'torrent_creation', 'qbit_tag', 'qbit_cat',
+        'skip_imghost_upload', 'imghost', 'manual_source', 'webdv', 'hardcoded-subs', 'dual_audio', 'manual_type', 'tvmaze_manual'
+    ]
+    sanitized_saved_meta = {}
+    for key, value in saved_meta.items():
+        clean_key = key.strip().strip("'").strip('"')
+        if clean_key in overwrite_list:
+            if clean_key in meta and meta.get(clean_key) is not None:
+                sanitized_saved_meta[clean_key] = meta[clean_key]
+                if meta['debug']:
+                    console.print(f"Overriding {clean_key} with meta value:", meta[clean_key])
             else:
                 sanitized_saved_meta[clean_key] = value
-        meta.update(sanitized_saved_meta)
-    f.close()
+        else:
+            sanitized_saved_meta[clean_key] = value
+    meta.update(sanitized_saved_meta)
     return sanitized_saved_meta
 
 
@@ -103,9 +106,7 @@ async def process_meta(meta, base_dir):
     if "," in trackers:
         trackers = trackers.split(',')
     meta['trackers'] = trackers
-    with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
-        json.dump(meta, f, indent=4)
-        f.close()
+    meta_store.save(meta)
     confirm = await helper.get_confirmation(meta)
     while confirm is False:
         editargs = cli_ui.ask_string("Input args that need correction e.g. (--tag NTb --category tv --tmdb 12345)")
@@ -120,136 +121,186 @@ async def process_meta(meta, base_dir):
         meta['name_notag'], meta['name'], meta['clean_name'], meta['potential_missing'] = await prep.get_name(meta)
         confirm = await helper.get_confirmation(meta)
 
-    successful_trackers = await process_all_trackers(meta)
+    # Hashing is disk bound, run it while the tracker checks, screenshots and image uploads happen.
+    # Started once the release is confirmed, so the client search doesn't print over the prompts
+    torrent_task, hash_job = start_base_torrent(meta)
+    try:
+        successful_trackers = await process_all_trackers(meta)
 
-    if meta.get('trackers_pass') is not None:
-        meta['skip_uploading'] = meta.get('trackers_pass')
-    else:
-        meta['skip_uploading'] = int(config['DEFAULT'].get('tracker_pass_checks', 1))
-    if successful_trackers < meta['skip_uploading'] and not meta['debug']:
-        console.print(f"[red]Not enough successful trackers ({successful_trackers}/{meta['skip_uploading']}). EXITING........[/red]")
+        if meta.get('trackers_pass') is not None:
+            meta['skip_uploading'] = meta.get('trackers_pass')
+        else:
+            meta['skip_uploading'] = int(config['DEFAULT'].get('tracker_pass_checks', 1))
+        if successful_trackers < meta['skip_uploading'] and not meta['debug']:
+            console.print(f"[red]Not enough successful trackers ({successful_trackers}/{meta['skip_uploading']}). EXITING........[/red]")
 
-    else:
-        meta['we_are_uploading'] = True
-        filename = meta.get('title', None)
-        bdmv_filename = meta.get('filename', None)
-        bdinfo = meta.get('bdinfo', None)
-        videopath = meta.get('filelist', [None])
-        videopath = videopath[0] if videopath else None
-        console.print(f"Processing {filename} for upload")
-        if 'manual_frames' not in meta:
-            meta['manual_frames'] = {}
-        manual_frames = meta['manual_frames']
-        # Take Screenshots
-        try:
-            if meta['is_disc'] == "BDMV":
-                use_vs = meta.get('vapoursynth', False)
-                try:
-                    await disc_screenshots(
-                        meta, bdmv_filename, bdinfo, meta['uuid'], base_dir, use_vs,
-                        meta.get('image_list', []), meta.get('ffdebug', False), None
-                    )
-                except asyncio.CancelledError:
-                    console.print("[red]Screenshot capture was cancelled. Cleaning up...[/red]")
-                    await cleanup_screenshot_temp_files(meta)  # Cleanup only on cancellation
-                    raise  # Ensure cancellation propagates properly
-                except Exception as e:
-                    console.print(f"[red]Error during BDMV screenshot capture: {e}[/red]", highlight=False)
-                    await cleanup_screenshot_temp_files(meta)  # Cleanup only on error
+        else:
+            meta['we_are_uploading'] = True
+            filename = meta.get('title', None)
+            bdmv_filename = meta.get('filename', None)
+            bdinfo = meta.get('bdinfo', None)
+            videopath = meta.get('filelist', [None])
+            videopath = videopath[0] if videopath else None
+            console.print(f"Processing {filename} for upload")
+            if 'manual_frames' not in meta:
+                meta['manual_frames'] = {}
+            manual_frames = meta['manual_frames']
+            # Take Screenshots
+            try:
+                if meta['is_disc'] == "BDMV":
+                    use_vs = meta.get('vapoursynth', False)
+                    try:
+                        await disc_screenshots(
+                            meta, bdmv_filename, bdinfo, meta['uuid'], base_dir, use_vs,
+                            meta.get('image_list', []), meta.get('ffdebug', False), None
+                        )
+                    except asyncio.CancelledError:
+                        console.print("[red]Screenshot capture was cancelled. Cleaning up...[/red]")
+                        await cleanup_screenshot_temp_files(meta)  # Cleanup only on cancellation
+                        raise  # Ensure cancellation propagates properly
+                    except Exception as e:
+                        console.print(f"[red]Error during BDMV screenshot capture: {e}[/red]", highlight=False)
+                        await cleanup_screenshot_temp_files(meta)  # Cleanup only on error
+
+                elif meta['is_disc'] == "DVD":
+                    try:
+                        await dvd_screenshots(
+                            meta, 0, None, None
+                        )
+                    except asyncio.CancelledError:
+                        console.print("[red]DVD screenshot capture was cancelled. Cleaning up...[/red]")
+                        await cleanup_screenshot_temp_files(meta)
+                        raise
+                    except Exception as e:
+                        console.print(f"[red]Error during DVD screenshot capture: {e}[/red]", highlight=False)
+                        await cleanup_screenshot_temp_files(meta)
+
+                else:
+                    try:
+                        if meta['debug']:
+                            console.print(f"videopath: {videopath}, filename: {filename}, meta: {meta['uuid']}, base_dir: {base_dir}, manual_frames: {manual_frames}")
+
+                        await screenshots(
+                            videopath, filename, meta['uuid'], base_dir, meta,
+                            manual_frames=manual_frames  # Pass additional kwargs directly
+                        )
+                    except asyncio.CancelledError:
+                        console.print("[red]Generic screenshot capture was cancelled. Cleaning up...[/red]")
+                        await cleanup_screenshot_temp_files(meta)
+                        raise
+                    except Exception as e:
+                        console.print(f"[red]Error during generic screenshot capture: {e}[/red]", highlight=False)
+                        await cleanup_screenshot_temp_files(meta)
 
-            elif meta['is_disc'] == "DVD":
+            except asyncio.CancelledError:
+                console.print("[red]Process was cancelled. Performing cleanup...[/red]")
+                await cleanup_screenshot_temp_files(meta)
+                raise
+            except Exception as e:
+                console.print(f"[red]Unexpected error occurred: {e}[/red]")
+                await cleanup_screenshot_temp_files(meta)
+
+            meta['cutoff'] = int(config['DEFAULT'].get('cutoff_screens', 1))
+            if len(meta.get('image_list', [])) < meta.get('cutoff') and meta.get('skip_imghost_upload', False) is False:
+                if 'image_list' not in meta:
+                    meta['image_list'] = []
+                return_dict = {}
                 try:
-                    await dvd_screenshots(
-                        meta, 0, None, None
+                    new_images, dummy_var = await upload_screens(
+                        meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict
                     )
                 except asyncio.CancelledError:
-                    console.print("[red]DVD screenshot capture was cancelled. Cleaning up...[/red]")
-                    await cleanup_screenshot_temp_files(meta)
-                    raise
+                    console.print("\n[red]Upload process interrupted! Cancelling tasks...[/red]")
+                    return
                 except Exception as e:
-                    console.print(f"[red]Error during DVD screenshot capture: {e}[/red]", highlight=False)
-                    await cleanup_screenshot_temp_files(meta)
+                    console.print(f"\n[red]Unexpected error during upload: {e}[/red]")
+                finally:
+                    # Cleanup
+                    console.print("[yellow]Cleaning up resources...[/yellow]")
+                    gc.collect()
+                    console.print("[green]Upload process completed (with or without interruptions).[/green]")
+
+            elif meta.get('skip_imghost_upload', False) is True and meta.get('image_list', False) is False:
+                meta['image_list'] = []
 
+            meta_store.save(meta)
+
+            if not torrent_task.done():
+                console.print("[yellow]Waiting for torrent hashing to finish...")
+            base_was_missing = await torrent_task
+            torrent_task = None
+            pending_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.pending.torrent")
+            if os.path.exists(pending_path):
+                os.replace(pending_path, os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent"))
+            if base_was_missing and meta['nohash']:
+                meta['client'] = "none"
+
+            if int(meta.get('randomized', 0)) >= 1:
+                create_random_torrents(meta['base_dir'], meta['uuid'], meta['randomized'], meta['path'])
+
+            if 'saved_description' in meta and meta['saved_description'] is False:
+                meta = await prep.gen_desc(meta)
             else:
-                try:
-                    if meta['debug']:
-                        console.print(f"videopath: {videopath}, filename: {filename}, meta: {meta['uuid']}, base_dir: {base_dir}, manual_frames: {manual_frames}")
+                meta = await prep.gen_desc(meta)
 
-                    await screenshots(
-                        videopath, filename, meta['uuid'], base_dir, meta,
-                        manual_frames=manual_frames  # Pass additional kwargs directly
-                    )
-                except asyncio.CancelledError:
-                    console.print("[red]Generic screenshot capture was cancelled. Cleaning up...[/red]")
-                    await cleanup_screenshot_temp_files(meta)
-                    raise
-                except Exception as e:
-                    console.print(f"[red]Error during generic screenshot capture: {e}[/red]", highlight=False)
-                    await cleanup_screenshot_temp_files(meta)
+            if meta.get('description') in ('None', '', ' '):
+                meta['description'] = None
 
-        except asyncio.CancelledError:
-            console.print("[red]Process was cancelled. Performing cleanup...[/red]")
-            await cleanup_screenshot_temp_files(meta)
-            raise
-        except Exception as e:
-            console.print(f"[red]Unexpected error occurred: {e}[/red]")
-            await cleanup_screenshot_temp_files(meta)
+            meta_store.save(meta)
 
-        meta['cutoff'] = int(config['DEFAULT'].get('cutoff_screens', 1))
-        if len(meta.get('image_list', [])) < meta.get('cutoff') and meta.get('skip_imghost_upload', False) is False:
-            if 'image_list' not in meta:
-                meta['image_list'] = []
-            return_dict = {}
-            try:
-                new_images, dummy_var = await upload_screens(
-                    meta, meta['screens'], 1, 0, meta['screens'], [], return_dict=return_dict
-                )
-            except asyncio.CancelledError:
-                console.print("\n[red]Upload process interrupted! Cancelling tasks...[/red]")
-                return
-            except Exception as e:
-                console.print(f"\n[red]Unexpected error during upload: {e}[/red]")
-            finally:
-                # Cleanup
-                console.print("[yellow]Cleaning up resources...[/yellow]")
-                gc.collect()
-                console.print("[green]Upload process completed (with or without interruptions).[/green]")
-
-        elif meta.get('skip_imghost_upload', False) is True and meta.get('image_list', False) is False:
-            meta['image_list'] = []
-
-        with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
-            json.dump(meta, f, indent=4)
-
-        torrent_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
-        if not os.path.exists(torrent_path):
-            reuse_torrent = None
-            if meta.get('rehash', False) is False:
-                reuse_torrent = await client.find_existing_torrent(meta)
-                if reuse_torrent is not None:
-                    await create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
-
-            if meta['nohash'] is False and reuse_torrent is None:
-                create_torrent(meta, Path(meta['path']), "BASE")
-            if meta['nohash']:
-                meta['client'] = "none"
+    finally:
+        # Not awaited because the upload stopped early, don't leave the hashing thread or BASE.pending behind
+        if torrent_task is not None:
+            await stop_base_torrent(meta, torrent_task, hash_job)
 
-        elif os.path.exists(torrent_path) and meta.get('rehash', False) is True and meta['nohash'] is False:
-            create_torrent(meta, Path(meta['path']), "BASE")
 
-        if int(meta.get('randomized', 0)) >= 1:
-            create_random_torrents(meta['base_dir'], meta['uuid'], meta['randomized'], meta['path'])
+def start_base_torrent(meta):
+    """
+    Start preparing BASE.torrent in the background.
+    The task returns whether BASE.torrent was missing when it started, and must be awaited before BASE.torrent is used.
+    """
+    job = HashJob(background=True)
+    background_hash_jobs.add(job)
+    task = asyncio.create_task(prepare_base_torrent(meta, job))
+    task.add_done_callback(lambda t: background_hash_jobs.discard(job))
+    return task, job
 
-        if 'saved_description' in meta and meta['saved_description'] is False:
-            meta = await prep.gen_desc(meta)
-        else:
-            meta = await prep.gen_desc(meta)
 
-        if meta.get('description') in ('None', '', ' '):
-            meta['description'] = None
+async def prepare_base_torrent(meta, job):
+    torrent_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.torrent")
+    if not os.path.exists(torrent_path):
+        reuse_torrent = None
+        if meta.get('rehash', False) is False:
+            reuse_torrent = await client.find_existing_torrent(meta)
+            if reuse_torrent is not None:
+                await create_base_from_existing_torrent(reuse_torrent, meta['base_dir'], meta['uuid'])
 
-        with open(f"{meta['base_dir']}/tmp/{meta['uuid']}/meta.json", 'w') as f:
-            json.dump(meta, f, indent=4)
+        if meta['nohash'] is False and reuse_torrent is None:
+            await hash_base_torrent(meta, job)
+        return True
+
+    elif meta.get('rehash', False) is True and meta['nohash'] is False:
+        await hash_base_torrent(meta, job)
+    return False
+
+
+async def hash_base_torrent(meta, job):
+    # Written under another name until awaited, so the tracker checks only see BASE.torrent when it was reused
+    console.print("[yellow]Hashing torrent in the background")
+    await asyncio.to_thread(create_torrent, dict(meta), Path(meta['path']), "BASE.pending", job)
+
+
+async def stop_base_torrent(meta, task, job):
+    job.cancel()
+    try:
+        await task
+    except HashingCancelled:
+        pass
+    except Exception as e:
+        console.print(f"[yellow]Background torrent hashing failed: {e}")
+    pending_path = os.path.abspath(f"{meta['base_dir']}/tmp/{meta['uuid']}/BASE.pending.torrent")
+    if os.path.exists(pending_path):
+        os.remove(pending_path)
 
 
 async def cleanup_screenshot_temp_files(meta):
@@ -406,6 +457,11 @@ async def do_the_thing(base_dir):
         if not meta.get('path'):
             exit(0)
 
+        if meta.get('debug'):
+            stall_detector.start()
+        if meta.get('no_meta_cache'):
+            meta_cache.disable()
+
         path = meta['path']
         path = os.path.abspath(path)
         if path.endswith('"'):
@@ -425,20 +481,19 @@ async def do_the_thing(base_dir):
                 if not path:
                     raise ValueError("The 'path' variable is not defined or is empty.")
 
-                meta_file = os.path.join(base_dir, "tmp", os.path.basename(path), "meta.json")
+                meta_dir = os.path.join(base_dir, "tmp", os.path.basename(path))
 
-                if meta.get('delete_meta') and os.path.exists(meta_file):
-                    os.remove(meta_file)
-                    console.print("[bold red]Successfully deleted meta.json")
+                if meta.get('delete_meta') and meta_store.exists(meta_dir):
+                    meta_store.delete(meta_dir)
+                    console.print("[bold red]Successfully deleted saved meta")
 
-                if os.path.exists(meta_file):
-                    with open(meta_file, "r") as f:
-                        saved_meta = json.load(f)
-                        console.print("[yellow]Existing metadata file found, it holds cached values")
-                        meta.update(await merge_meta(meta, saved_meta, path))
+                saved_meta = meta_store.load(meta_dir)
+                if saved_meta is not None:
+                    console.print("[yellow]Existing metadata file found, it holds cached values")
+                    meta.update(await merge_meta(meta, saved_meta, path))
                 else:
                     if meta['debug']:
-                        console.print(f"[yellow]No metadata file found at {meta_file}")
+                        console.print(f"[yellow]No metadata file found in {meta_dir}")
 
             except Exception as e:
                 console.print(f"[red]Failed to load metadata for path '{path}': {e}")
@@ -526,6 +581,19 @@ async def cleanup():
             except Exception:
                 pass
 
+    # Stop the image optimization workers and the pool for blocking library calls
+    shutdown_optimize_pool(wait=False)
+    shutdown_blocking_pool(wait=False)
+    stall_detector.stop()
+
+    # Stop background hashing threads, the loop can't close while they run
+    for job in list(background_hash_jobs):
+        job.cancel()
+
+    # Close the shared keep-alive HTTP connections
+    await http_clients.close_all()
+    meta_cache.close()
+
     # Give some time for subprocess transport cleanup
     await asyncio.sleep(0.1)
 